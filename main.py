@@ -1,10 +1,31 @@
 import sys
-from PyQt5.QtWidgets import QApplication
-from src.ui import MainWindow
+from src.startup_profile import profiler, mark
 
 def main():
+    # --profile-startup prints import and init timings once the window is interactive;
+    # --quit-when-interactive exits right after (for src.bench_startup)
+    profile = "--profile-startup" in sys.argv
+    quit_when_interactive = "--quit-when-interactive" in sys.argv
+    if profile:
+        profiler.enable()
+
+    from PyQt5.QtWidgets import QApplication
+    from src.ui import MainWindow
+
     app = QApplication(sys.argv)
     window = MainWindow()
+
+    def on_interactive():
+        seconds = mark("interactive")
+        if profile:
+            profiler.disable()
+            print(profiler.report())
+        else:
+            print(f"[Startup] Interactive after {seconds * 1000:.0f} ms")
+        if quit_when_interactive:
+            app.quit()
+
+    window.startup_finished.connect(on_interactive)
     window.show()
     sys.exit(app.exec_())
 
@@ -0,0 +1,142 @@
+"""
+Per-instance AppCDS (class data sharing) archives.
+
+For profiles that opt in, the first launch after a change records the
+classes the game loads (-XX:DumpLoadedClassList). When that session ends
+cleanly the list is dumped into a shared archive, and later launches map
+it with -XX:SharedArchiveFile instead of parsing and verifying those
+classes again. The archive is keyed on the mods folder, the launched
+version (and so the loader build) and the Java executable — any change
+starts a new recording. Startup times with and without the archive are
+kept so the gain can be reported.
+"""
+import os
+import json
+import hashlib
+import subprocess
+from .mods_folder import mods_digest
+
+MIN_JAVA_MAJOR = 11  # application class sharing is in OpenJDK from 10, usable from 11
+HISTORY = 10
+
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+class AppCdsArchive:
+    """The class list, archive and startup history of one game directory."""
+
+    def __init__(self, game_dir):
+        self.game_dir = game_dir
+        self.cache_dir = os.path.join(game_dir, ".qlauncher", "appcds")
+        self.class_list = os.path.join(self.cache_dir, "classes.lst")
+        self.archive = os.path.join(self.cache_dir, "app.jsa")
+        self.state_file = os.path.join(self.cache_dir, "state.json")
+        self.state = {"key": None, "status": None, "last_mode": None, "startup": {"with": [], "without": []}}
+        self._load()
+
+    def _load(self):
+        """Load the archive state from disk."""
+        try:
+            if os.path.exists(self.state_file):
+                with open(self.state_file, "r") as f:
+                    self.state.update(json.load(f))
+        except Exception as e:
+            print(f"[AppCDS] Error loading state: {e}")
+
+    def _save(self):
+        """Save the archive state to disk."""
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(self.state_file, "w") as f:
+                json.dump(self.state, f, indent=4)
+        except Exception as e:
+            print(f"[AppCDS] Error saving state: {e}")
+
+    def key(self, launch_version_id, java):
+        """Fingerprint of everything the archive depends on."""
+        digest = hashlib.sha1()
+        mods_digest(digest, os.path.join(self.game_dir, "mods"))
+        digest.update(launch_version_id.encode())
+        try:
+            java_mtime = os.stat(java).st_mtime_ns
+        except OSError:
+            java_mtime = 0
+        digest.update(f"{java}\0{java_mtime}".encode())
+        return digest.hexdigest()
+
+    def jvm_arguments(self, key):
+        """Return the flags for this launch: use the archive if it matches key, else record."""
+        if self.state["status"] == "ready" and self.state["key"] == key and os.path.exists(self.archive):
+            self.state["last_mode"] = "with"
+            self._save()
+            return ["-Xshare:auto", f"-XX:SharedArchiveFile={self.archive}"]
+
+        if self.state["key"] != key:
+            if self.state["key"] is not None:
+                print("[AppCDS] Mods, loader or Java changed — recording a new class list")
+            for path in (self.archive, self.class_list):
+                if os.path.exists(path):
+                    os.remove(path)
+            # Times from another mod set don't compare
+            self.state["startup"] = {"with": [], "without": []}
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.state.update(key=key, status="recording", last_mode="without")
+        self._save()
+        return [f"-XX:DumpLoadedClassList={self.class_list}"]
+
+    def build(self, command):
+        """Dump the recorded class list into an archive for the classpath of command.
+        Returns True once the archive is ready."""
+        if self.state["status"] != "recording" or not os.path.exists(self.class_list):
+            return False
+        if "-cp" not in command:
+            return False
+        java = command[0]
+        classpath = command[command.index("-cp") + 1]
+        # Same collector as the game so archived heap objects stay usable
+        gc_flags = [arg for arg in command if arg.startswith("-XX:+Use") and arg.endswith("GC")]
+        dump = [
+            java, "-Xshare:dump", *gc_flags,
+            f"-XX:SharedClassListFile={self.class_list}",
+            f"-XX:SharedArchiveFile={self.archive}",
+            "-cp", classpath,
+        ]
+        print(f"[AppCDS] Building archive for {self.game_dir}...")
+        try:
+            result = subprocess.run(dump, capture_output=True, text=True, timeout=600,
+                                    creationflags=_CREATE_NO_WINDOW)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            print(f"[AppCDS] Archive dump failed: {e}")
+            return False
+        if result.returncode != 0 or not os.path.exists(self.archive):
+            print(f"[AppCDS] Archive dump failed ({result.returncode}): {result.stderr.strip()[-500:]}")
+            return False
+        self.state["status"] = "ready"
+        self._save()
+        print(f"[AppCDS] Archive ready: {os.path.getsize(self.archive) / 1048576:.1f} MB")
+        return True
+
+    def record_startup(self, seconds):
+        """Store the startup time of the last launch and return a one-line comparison."""
+        mode = self.state.get("last_mode")
+        if mode not in ("with", "without"):
+            return None
+        history = self.state["startup"][mode]
+        history.append(round(seconds, 3))
+        del history[:-HISTORY]
+        self._save()
+        return self.report()
+
+    def report(self):
+        """Average startup with and without the archive, e.g. "12.1 s with AppCDS vs 17.9 s without (-32%)"."""
+        startup = self.state["startup"]
+        average = {mode: sum(times) / len(times) for mode, times in startup.items() if times}
+        if "with" in average and "without" in average:
+            change = (average["with"] - average["without"]) * 100 / average["without"]
+            return (f"{average['with']:.1f} s with AppCDS vs {average['without']:.1f} s without "
+                    f"({change:+.0f}%)")
+        if "without" in average:
+            return f"{average['without']:.1f} s without AppCDS (archive not used yet)"
+        if "with" in average:
+            return f"{average['with']:.1f} s with AppCDS"
+        return None
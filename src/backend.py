@@ -3,43 +3,164 @@ import subprocess
 import sys
 import os
 import requests
-import uuid
 import json
+import time
+import shutil
+from .installer import InstallEngine
+from .object_store import ObjectStore
+from .version_registry import VersionRegistry, LOADER_NAMES
+from .manifest_cache import ManifestCache
+from .launch_cache import LaunchCache, USERNAME_TOKEN, UUID_TOKEN
+from .verifier import Verifier, HashMemo
+from .launch_pipeline import LaunchStages
+from .prefetch import Prefetcher
+from .jvm_tuning import JvmTuner
+from .settings import get_settings
+from .appcds import AppCdsArchive, MIN_JAVA_MAJOR
+from .launch_history import LaunchHistory, launch_context
+from .disk_usage import DiskUsage
+from .search_cache import SearchCache
+from .thumbnail_cache import ThumbnailCache
+from .provision import Provisioner
+from .java_runtimes import JavaRegistry, LEGACY_JAVA_MAJOR, is_compatible
+
+def _version_key(version_id):
+    """Sort key that orders 1.9 before 1.21 — non-numeric parts sort first."""
+    return [int(p) if p.isdigit() else -1 for p in version_id.replace("-", ".").split(".")]
 
 class LauncherBackend:
-    def __init__(self, minecraft_directory):
+    def __init__(self, minecraft_directory, store_dir=None, settings=None):
         self.minecraft_directory = minecraft_directory
+        self.settings = settings or get_settings()
         if not os.path.exists(self.minecraft_directory):
             os.makedirs(self.minecraft_directory)
+        # Shared object store lives next to the root so several roots can hardlink into it
+        if store_dir is None:
+            store_dir = os.path.join(os.path.dirname(os.path.abspath(self.minecraft_directory)), ".qlauncher-store")
+        self.store = ObjectStore(store_dir)
+        self.manifest = ManifestCache(os.path.join(self.minecraft_directory, "qlauncher_manifest.json"))
+        self.installer = InstallEngine(self.minecraft_directory, store=self.store, manifest=self.manifest)
+        self.registry = VersionRegistry(self.minecraft_directory)
+        self.launch_cache = LaunchCache(self.minecraft_directory)
+        self.verifier = Verifier(self.installer, HashMemo(os.path.join(self.minecraft_directory, "qlauncher_hashes.json")))
+        self.prefetcher = Prefetcher(self)
+        self.java_runtimes = JavaRegistry(os.path.join(self.minecraft_directory, "qlauncher_java.json"),
+                                          self.minecraft_directory)
+        self.jvm_tuner = JvmTuner(os.path.join(self.minecraft_directory, "qlauncher_jvm.json"), self.java_runtimes)
+        self.launch_history = LaunchHistory(os.path.join(self.minecraft_directory, "qlauncher_launch_history.json"))
+        self.disk_usage = DiskUsage(os.path.join(self.minecraft_directory, "qlauncher_disk_usage.json"),
+                                    self.minecraft_directory, store_dir)
+        self.search_cache = SearchCache(os.path.join(self.minecraft_directory, "qlauncher_search.sqlite"))
+        self.thumbnails = ThumbnailCache(os.path.join(self.minecraft_directory, "qlauncher_icons"))
+        self.last_launch_timing = None
+
+    def _release_ids(self, manifest):
+        return [v['id'] for v in manifest.get('versions', []) if v['type'] == 'release']
+
+    def get_cached_vanilla_versions(self):
+        """Returns the release list from the on-disk manifest cache without any network access."""
+        manifest = self.manifest.cached()
+        return self._release_ids(manifest) if manifest else []
+
+    def get_installed_vanilla_versions(self):
+        """Returns installed vanilla versions, newest first — the offline fallback list."""
+        return sorted(self.registry.ids_for_loader("vanilla"), key=_version_key, reverse=True)
 
     def get_vanilla_versions(self):
-        """Returns a list of installable vanilla versions."""
+        """Returns a list of installable vanilla versions, revalidating the cached manifest.
+        Falls back to the cache, then to installed versions, when the network is unavailable."""
         try:
-            versions = minecraft_launcher_lib.utils.get_version_list()
-            return [v['id'] for v in versions if v['type'] == 'release']
+            manifest, changed = self.manifest.revalidate()
+            if not changed:
+                print("[Backend] Version manifest not modified.")
+            return self._release_ids(manifest)
         except Exception as e:
             print(f"Error fetching vanilla versions: {e}")
-            return []
+            return self.get_cached_vanilla_versions() or self.get_installed_vanilla_versions()
 
     def get_installed_versions(self):
         """Returns a list of installed versions."""
-        return [v['id'] for v in minecraft_launcher_lib.utils.get_installed_versions(self.minecraft_directory)]
-
-    def install_version(self, version_id, callback=None):
-        """Installs the specified Minecraft version."""
-        callback_dict = {}
-        if callback:
-            callback_dict = {
-                "setStatus": lambda text: callback(text, 0),
-                "setProgress": lambda value: callback(f"Downloading...", value),
-                "setMax": lambda value: None # We handle progress as 0-100 usually, but lib uses raw counts
-            }
-            
-        minecraft_launcher_lib.install.install_minecraft_version(
-            version=version_id,
-            minecraft_directory=self.minecraft_directory,
-            callback=callback_dict
-        )
+        return self.registry.ids()
+
+    def find_loader_version(self, loader, version_id):
+        """Returns the newest installed build of the given loader built on version_id, or None."""
+        return self.registry.latest_build(loader, version_id)
+
+    def expected_launch_version(self, version_id, modloader):
+        """Returns the version id a launch of (version_id, modloader) would use right now,
+        or None when the loader still has to be installed."""
+        loader = LOADER_NAMES.get(modloader)
+        if loader is None:
+            return version_id
+        return self.find_loader_version(loader, version_id)
+
+    def resolve_loader(self, version_id, modloader, progress_callback=None):
+        """Returns the version id to launch for modloader on version_id, installing the
+        loader first if no build is installed. Returns None if the install failed."""
+        loader = LOADER_NAMES.get(modloader)
+        if loader is None:
+            return version_id
+
+        print(f"[Backend] Checking {modloader}...")
+        existing = self.find_loader_version(loader, version_id)
+        if existing:
+            print(f"[Backend] {modloader} version already installed: {existing}")
+            return existing
+
+        print(f"[Backend] Installing {modloader}...")
+        if progress_callback:
+            progress_callback(f"Installing {modloader} for {version_id}...", 0)
+        installers = {
+            "fabric": self.install_fabric,
+            "quilt": self.install_quilt,
+            "forge": self.install_forge,
+        }
+        if not installers[loader](version_id):
+            if progress_callback:
+                progress_callback(f"Error installing {modloader}", 0)
+            return None
+
+        launch_version_id = self.find_loader_version(loader, version_id)
+        if launch_version_id:
+            print(f"[Backend] {modloader} version resolved: {launch_version_id}")
+            return launch_version_id
+        print(f"[Backend] Could not find installed {modloader} version ID.")
+        return version_id
+
+    def install_version(self, version_id, callback=None, cancel_event=None):
+        """Installs the specified Minecraft version through the parallel install engine.
+        Returns the install stats from InstallEngine.install_version."""
+        try:
+            return self.installer.install_version(version_id, progress_callback=callback, cancel_event=cancel_event)
+        finally:
+            self.registry.invalidate(version_id)
+
+    def provision(self, targets, progress_callback=None, cancel_event=None):
+        """Installs many (version, modloader) targets at once, fetching shared files only once.
+        Returns the batch report from Provisioner.provision."""
+        with self.prefetcher.foreground():
+            return Provisioner(self).provision(targets, progress_callback, cancel_event)
+
+    def uninstall_version(self, version_id):
+        """Removes an installed version and any natives folder no remaining version uses.
+        Returns False if version_id is not an installed version."""
+        if not self.registry.is_installed(version_id):
+            return False
+        shutil.rmtree(os.path.join(self.minecraft_directory, "versions", version_id), ignore_errors=True)
+        self.registry.invalidate(version_id)
+        self.installer.natives.collect(self.registry.ids())
+        print(f"[Backend] Uninstalled {version_id}")
+        return True
+
+    def verify_installation(self, version_id, repair=True, progress_callback=None):
+        """Checks every file of an installed version against its SHA1 and re-downloads the
+        ones that fail. Returns the verification report."""
+        with self.prefetcher.foreground(version_id):
+            return self.verifier.verify(version_id, repair=repair, progress_callback=progress_callback)
+
+    def get_store_report(self):
+        """Returns how much the shared object store holds and how many bytes it deduplicated."""
+        return self.store.report()
 
     def install_fabric(self, version_id):
         """Installs Fabric for the specific vanilla version."""
@@ -48,6 +169,7 @@ class LauncherBackend:
                 version_id,
                 self.minecraft_directory
             )
+            self.registry.invalidate()
             return True
         except Exception as e:
             print(f"Error installing fabric: {e}")
@@ -63,6 +185,7 @@ class LauncherBackend:
                 version_id,
                 self.minecraft_directory
             )
+            self.registry.invalidate()
             return True
         except Exception as e:
              print(f"Error installing forge: {e}")
@@ -75,141 +198,212 @@ class LauncherBackend:
                 version_id,
                 self.minecraft_directory
             )
+            self.registry.invalidate()
             return True
         except Exception as e:
             print(f"Error installing quilt: {e}")
             return False
 
-    def launch_game(self, version_id, modloader, username, progress_callback=None, game_dir=None):
-        """Launches the game with the specified version and modloader."""
+    def _load_launch_settings(self):
+        """Returns the settings that shape the launch command."""
+        return self.settings.launch_settings()
+
+    def _launch_java(self, launch_version_id, java_path):
+        """Returns (java executable, major version or None) the launch command will run with.
+        The configured java_path is used if its major fits the version JSON's javaVersion; otherwise
+        the version's own Mojang runtime, else the best match among the discovered runtimes."""
+        java_version = None
+        current = launch_version_id
+        while current and java_version is None:
+            try:
+                with open(os.path.join(self.minecraft_directory, "versions", current, f"{current}.json"), "r") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                break
+            java_version = data.get("javaVersion")
+            current = data.get("inheritsFrom")
+        required = java_version.get("majorVersion") if java_version else LEGACY_JAVA_MAJOR
+
+        configured_major = None
+        if java_path and os.path.exists(java_path):
+            configured_major = self.java_runtimes.major(java_path)
+            if is_compatible(required, configured_major):
+                return java_path, configured_major
+            print(f"[Backend] Configured Java {java_path} is {configured_major or 'not runnable'}, "
+                  f"{launch_version_id} needs Java {required} — picking another runtime")
+        if java_version:
+            executable = minecraft_launcher_lib.runtime.get_executable_path(
+                java_version["component"], self.minecraft_directory
+            )
+            if executable and os.path.exists(executable):
+                return executable, required
+        picked = self.java_runtimes.pick(required)
+        if picked:
+            return picked, self.java_runtimes.major(picked)
+        if java_path and os.path.exists(java_path):
+            # Nothing better around — let the configured one try
+            return java_path, configured_major
+        print(f"[Backend] No Java {required} runtime found, falling back to java on PATH")
+        return "java", None
+
+    def launch_jvm_arguments(self, java, java_major, settings):
+        """Returns the JVM arguments of the selected tuning profile, validated against the
+        Java the launch will use."""
+        flags = self.jvm_tuner.flags_for(settings["jvm_profile"], settings["max_memory"], java, java_major)
+        print(f"[Backend] JVM profile {settings['jvm_profile']} on {java}: {' '.join(flags)}")
+        return flags
+
+    def _apply_appcds(self, command, launch_version_id, game_dir):
+        """Adds the AppCDS flags of game_dir's archive (use it, or record a class list) to command."""
+        java = command[0]
+        major = self.java_runtimes.major(java)
+        if major is None or major < MIN_JAVA_MAJOR:
+            print(f"[AppCDS] Skipped — needs Java {MIN_JAVA_MAJOR}+, {java} is {major or 'unknown'}")
+            return command
+        archive = AppCdsArchive(game_dir)
+        flags = archive.jvm_arguments(archive.key(launch_version_id, java))
+        return [java, *flags, *command[1:]]
+
+    def appcds_session_ended(self, game_dir, command, exit_code):
+        """Builds the AppCDS archive after a clean recording session. Slow — call off the UI thread."""
+        if exit_code == 0:
+            AppCdsArchive(game_dir).build(command)
+
+    def appcds_record_startup(self, game_dir, seconds):
+        """Stores a startup time for game_dir's archive and returns the with/without comparison."""
+        return AppCdsArchive(game_dir).record_startup(seconds)
+
+    def record_launch_timing(self, profile_key, timing, game_spans):
+        """Stores a launch in the profile's timing history: the stages of timing (a last_launch_timing)
+        plus the spawn / first output / game ready spans measured while the game started.
+        Returns the profile's regression report line, or None."""
+        spans = dict(timing["stages"], **game_spans)
+        self.launch_history.record(profile_key, timing["context"], spans, timing["fast_path"])
+        result = self.launch_history.regressions(profile_key)
+        if not result or not result[1]:
+            return None
+        change, slower = result
+        spans_text = ", ".join(f"{span} {old * 1000:.0f} → {new * 1000:.0f} ms" for span, old, new in slower)
+        return f"Slower since {change}: {spans_text}"
+
+    def launch_game(self, version_id, modloader, username, progress_callback=None, game_dir=None,
+                    stage_callback=None, cancel_event=None, appcds=False, timing_callback=None):
+        """Launches the game with the specified version and modloader.
+        Runs the resolve / install / build stages and returns the command to spawn;
+        stage_callback(stage, state, seconds) follows the stages and setting
+        cancel_event stops the pipeline with LaunchCancelled or DownloadCancelled.
+        timing_callback(timing) receives this launch's timing — last_launch_timing is only
+        reliable while launches are prepared one at a time.
+        With appcds (and a game_dir) the command records or uses a per-instance AppCDS archive."""
         print(f"[Backend] Launching {version_id} ({modloader}) for {username}")
-        
+        start = time.perf_counter()
+        stages = LaunchStages(stage_callback, cancel_event)
+        stages.begin("load_settings")
+        settings = self._load_launch_settings()
+        stages.begin("resolve")
+
+        # 0. Fast path — nothing changed since the last launch of this combination
+        cache_key = LaunchCache.key(version_id, modloader, game_dir)
+        expected = self.expected_launch_version(version_id, modloader)
+        cached = expected and self.launch_cache.match(cache_key, settings, game_dir, expected)
+        if cached and cached.get("natives_dir") and not self.installer.natives.verify(cached["natives_dir"]):
+            print("[Backend] Cached natives folder is gone or damaged — rebuilding the launch command")
+            cached = None
+        if cached and os.path.isabs(cached["command"][0]) and not os.path.exists(cached["command"][0]):
+            print("[Backend] Cached Java runtime is gone — picking a runtime again")
+            cached = None
+        if cached:
+            if game_dir:
+                os.makedirs(game_dir, exist_ok=True)
+            stages.finish()
+            elapsed = time.perf_counter() - start
+            saved = max(0.0, cached["prepare_seconds"] - elapsed)
+            self.last_launch_timing = {"fast_path": True, "seconds": elapsed, "saved_seconds": saved,
+                                       "stages": stages.timings,
+                                       "context": launch_context(cached["launch_version_id"], settings, game_dir)}
+            if timing_callback:
+                timing_callback(self.last_launch_timing)
+            print(f"[Backend] Launch fingerprint matched for {cached['launch_version_id']} — "
+                  f"prepared in {elapsed * 1000:.0f} ms (saved {saved * 1000:.0f} ms)")
+            command = LaunchCache.personalise(cached["command"], username)
+            if appcds and game_dir:
+                command = self._apply_appcds(command, cached["launch_version_id"], game_dir)
+            return command
+
+        # Background prefetches yield to the launch (and hand over a prefetch of this version)
+        with self.prefetcher.foreground(version_id):
+            prepared = self._prepare_launch(version_id, modloader, settings, game_dir, stages,
+                                            progress_callback, cancel_event)
+        if prepared is None:
+            return
+        launch_version_id, minecraft_command, natives_dir = prepared
+
+        stages.finish()
+        elapsed = time.perf_counter() - start
+        self.launch_cache.remember(cache_key, launch_version_id, settings, game_dir, minecraft_command, elapsed,
+                                   natives_dir)
+        self.last_launch_timing = {"fast_path": False, "seconds": elapsed, "saved_seconds": 0.0,
+                                   "stages": stages.timings,
+                                   "context": launch_context(launch_version_id, settings, game_dir)}
+        if timing_callback:
+            timing_callback(self.last_launch_timing)
+        print(f"[Backend] Launch prepared in {elapsed * 1000:.0f} ms")
+
+        # Return launch command for the UI to manage the process
+        command = LaunchCache.personalise(minecraft_command, username)
+        if appcds and game_dir:
+            command = self._apply_appcds(command, launch_version_id, game_dir)
+        return command
+
+    def _prepare_launch(self, version_id, modloader, settings, game_dir, stages, progress_callback, cancel_event):
+        """Install what is missing and build the command template.
+        Returns (launch_version_id, command, natives_dir), or None if the modloader could not be installed."""
         # 1. Install Vanilla Version if needed
-        if version_id not in self.get_installed_versions():
+        stages.begin("install_vanilla")
+        if not self.registry.is_installed(version_id):
              print(f"[Backend] Version {version_id} not found. Installing...")
              if progress_callback:
                  progress_callback(f"Installing Vanilla {version_id}...", 0)
-             self.install_version(version_id, lambda t, m: progress_callback(t, m) if progress_callback else None)
+             self.install_version(version_id, lambda t, m: progress_callback(t, m) if progress_callback else None,
+                                  cancel_event=cancel_event)
         else:
              print(f"[Backend] Version {version_id} found.")
 
-        launch_version_id = version_id
-
         # 2. Install/Resolve Modloader
-        if modloader == 'Fabric':
-            print("[Backend] Checking Fabric...")
-            installed = self.get_installed_versions()
-            existing_fabric = next((v for v in installed if "fabric" in v and version_id in v), None)
-            
-            if existing_fabric:
-                 print(f"[Backend] Fabric version already installed: {existing_fabric}")
-                 launch_version_id = existing_fabric
-            else:
-                print("[Backend] Installing Fabric loader...")
-                if progress_callback:
-                    progress_callback(f"Installing Fabric for {version_id}...", 0)
-                try:
-                    minecraft_launcher_lib.fabric.install_fabric(version_id, self.minecraft_directory)
-                    installed = self.get_installed_versions()
-                    fab_id = next((v for v in installed if "fabric" in v and version_id in v), None)
-                    if fab_id:
-                        launch_version_id = fab_id
-                        print(f"[Backend] Fabric version resolved: {launch_version_id}")
-                    else:
-                        print("[Backend] Could not find installed Fabric version ID.")
-                except Exception as e:
-                    print(f"Error installing Fabric: {e}")
-                    if progress_callback: progress_callback(f"Error installing Fabric: {e}", 0)
-                    return
-
-        elif modloader == 'Quilt':
-            print("[Backend] Checking Quilt...")
-            installed = self.get_installed_versions()
-            existing_quilt = next((v for v in installed if "quilt" in v and version_id in v), None)
-            
-            if existing_quilt:
-                print(f"[Backend] Quilt version already installed: {existing_quilt}")
-                launch_version_id = existing_quilt
-            else:
-                print("[Backend] Installing Quilt loader...")
-                if progress_callback:
-                    progress_callback(f"Installing Quilt for {version_id}...", 0)
-                try:
-                    minecraft_launcher_lib.quilt.install_quilt(version_id, self.minecraft_directory)
-                    installed = self.get_installed_versions()
-                    quilt_id = next((v for v in installed if "quilt" in v and version_id in v), None)
-                    if quilt_id:
-                        launch_version_id = quilt_id
-                        print(f"[Backend] Quilt version resolved: {launch_version_id}")
-                    else:
-                        print("[Backend] Could not find installed Quilt version ID.")
-                except Exception as e:
-                    print(f"Error installing Quilt: {e}")
-                    if progress_callback: progress_callback(f"Error installing Quilt: {e}", 0)
-                    return
-
-        elif modloader == 'Forge':
-            print("[Backend] Checking Forge...")
-            installed = self.get_installed_versions()
-            existing_forge = next((v for v in installed if "forge" in v and version_id in v), None)
-            
-            if existing_forge:
-                print(f"[Backend] Forge version already installed: {existing_forge}")
-                launch_version_id = existing_forge
-            else:
-                print("[Backend] Installing Forge...")
-                if progress_callback:
-                    progress_callback(f"Installing Forge for {version_id}...", 0)
-                try:
-                     print("[Backend] Running Forge Installer...")
-                     minecraft_launcher_lib.forge.install_forge_version(version_id, self.minecraft_directory)
-                     
-                     installed = self.get_installed_versions()
-                     forge_id = next((v for v in installed if "forge" in v and version_id in v), None)
-                     if forge_id:
-                         launch_version_id = forge_id
-                         print(f"[Backend] Forge version resolved: {launch_version_id}")
-                     else:
-                         print("[Backend] Could not find installed Forge version ID.")
-                except Exception as e:
-                    print(f"Error installing Forge: {e}")
-                    if progress_callback: progress_callback(f"Error installing Forge: {e}", 0)
-                    return
+        stages.begin("install_loader")
+        launch_version_id = self.resolve_loader(version_id, modloader, progress_callback)
+        if launch_version_id is None:
+            return
+
+        # 3. Build the launch command
+        stages.begin("build_command")
 
         # Settings
-        max_memory = 2048
-        java_path = None
-        width = 854
-        height = 480
-        fullscreen = False
+        max_memory = settings["max_memory"]
+        java_path = settings["java_path"]
+        width = settings["width"]
+        height = settings["height"]
+        fullscreen = settings["fullscreen"]
 
-        try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    settings = json.load(f)
-                    max_memory = settings.get("max_memory", 2048)
-                    java_path = settings.get("java_path", "")
-                    width = settings.get("width", 854)
-                    height = settings.get("height", 480)
-                    fullscreen = settings.get("fullscreen", False)
-        except:
-            pass
-
-        # Options for launching
+        # Pick the runtime up front — a wrong major would only show as a crash after the JVM started
+        java, java_major = self._launch_java(launch_version_id, java_path)
+
+        # Options for launching — username/uuid stay tokens so the command can be reused
         options = {
-            "username": username,
-            "uuid": str(uuid.uuid4()),
+            "username": USERNAME_TOKEN,
+            "uuid": UUID_TOKEN,
             "token": "",
             "launcherName": "QLauncher",
             "launcherVersion": "1.0",
-            "jvmArguments": [f"-Xmx{max_memory}M"],
+            "jvmArguments": self.launch_jvm_arguments(java, java_major, settings),
             "customResolution": True,
             "resolutionWidth": str(width),
             "resolutionHeight": str(height),
+            # Shared, content-hashed extraction instead of versions/<id>/natives
+            "nativesDirectory": self.installer.natives_dir(launch_version_id),
         }
-        
-        if java_path and os.path.exists(java_path):
-             options["executablePath"] = java_path
+        if java != "java":
+            options["executablePath"] = java
 
         # Use profile-specific game directory if provided
         if game_dir:
@@ -236,5 +430,4 @@ class LauncherBackend:
             print(f"[Backend] Failed to generate launch command: {e}")
             raise e
 
-        # Return launch command for the UI to manage the process
-        return minecraft_command
+        return launch_version_id, minecraft_command, options["nativesDirectory"]
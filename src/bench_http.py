@@ -0,0 +1,37 @@
+from src.http_client import HttpClient
+import statistics
+import requests
+import time
+import sys
+
+DEFAULT_URL = "https://api.modrinth.com/v2/search?limit=1"
+
+def _latencies(get, url, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        r = get(url)
+        r.raise_for_status()
+        r.content
+        times.append((time.perf_counter() - start) * 1000)
+    return times
+
+def _summary(times):
+    ordered = sorted(times)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return f"first {times[0]:.0f} ms, median {statistics.median(times):.0f} ms, p95 {p95:.0f} ms"
+
+def bench_http(url=DEFAULT_URL, runs=20):
+    """Print the latency of runs sequential GETs of url: bare requests.get (a new connection and
+    TLS handshake every time, as the mod browser used to) against the shared pooled HttpClient."""
+    runs = int(runs)
+    bare = _latencies(lambda u: requests.get(u, timeout=30), url, runs)
+    client = HttpClient()
+    pooled = _latencies(client.get, url, runs)
+    print(f"- bare requests.get: {_summary(bare)}")
+    print(f"- pooled client:     {_summary(pooled)}")
+    print(f"- median speedup: {statistics.median(bare) / statistics.median(pooled):.1f}x "
+          f"({client.stats['retries']} retries, {client.stats['paced_seconds']:.2f}s paced by rate limit)")
+
+if __name__ == "__main__":
+    bench_http(*sys.argv[1:])
@@ -0,0 +1,35 @@
+from src.installer import InstallEngine
+import minecraft_launcher_lib
+import tempfile
+import shutil
+import time
+import sys
+
+def bench_install(version_id="1.21.4"):
+    """Install a version into two empty directories — once through minecraft-launcher-lib,
+    once through QLauncher's parallel engine — and print the wall-clock time of each."""
+    results = {}
+
+    lib_dir = tempfile.mkdtemp(prefix="qlauncher-lib-")
+    try:
+        start = time.perf_counter()
+        minecraft_launcher_lib.install.install_minecraft_version(version_id, lib_dir)
+        results["minecraft-launcher-lib"] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(lib_dir, ignore_errors=True)
+
+    engine_dir = tempfile.mkdtemp(prefix="qlauncher-engine-")
+    try:
+        engine = InstallEngine(engine_dir)
+        start = time.perf_counter()
+        stats = engine.install_version(version_id)
+        results["QLauncher InstallEngine"] = time.perf_counter() - start
+        print(f"Engine fetched {stats['files']} files ({stats['bytes'] / 1048576:.1f} MB)")
+    finally:
+        shutil.rmtree(engine_dir, ignore_errors=True)
+
+    for name, seconds in results.items():
+        print(f"- {name}: {seconds:.1f}s")
+
+if __name__ == "__main__":
+    bench_install(*sys.argv[1:])
@@ -0,0 +1,62 @@
+from src.profile_manager import ProfileManager
+import statistics
+import tempfile
+import random
+import shutil
+import json
+import time
+import sys
+import os
+
+def _median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times) * 1000
+
+def bench_profiles(count=10000, runs=200):
+    """Batch-create count profiles in a throwaway directory, then print the latency of loading them,
+    switching the active profile and updating one — against rewriting the whole profiles.json with
+    indent=4 on every change, as the launcher used to."""
+    count, runs = int(count), int(runs)
+    root = tempfile.mkdtemp(prefix="qlauncher-profiles-")
+    try:
+        manager = ProfileManager(root, os.path.join(root, ".minecraft"))
+        start = time.perf_counter()
+        profiles = manager.create_profiles([{"name": f"Instance {i}", "version": "1.21.4"} for i in range(count)])
+        print(f"- batch create {count} profiles: {time.perf_counter() - start:.2f}s")
+        manager.compact()
+        ids = [p["id"] for p in profiles]
+
+        start = time.perf_counter()
+        manager = ProfileManager(root, manager.minecraft_dir)
+        print(f"- load {len(manager.get_profiles())} profiles: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        switch = _median_ms(lambda: manager.set_active_profile(random.choice(ids)), runs)
+        update = _median_ms(lambda: manager.update_profile(random.choice(ids), color=f"#{random.randrange(1 << 24):06x}"), runs)
+        start = time.perf_counter()
+        manager.flush()
+        flush = (time.perf_counter() - start) * 1000
+        print(f"- switch: {switch:.3f} ms, update: {update:.3f} ms, write-behind flush of {2 * runs} changes: {flush:.1f} ms")
+
+        # What every switch or update used to cost: a linear scan plus the whole file rewritten
+        data = {"active_profile_id": ids[0], "profiles": manager.get_profiles()}
+        legacy_file = os.path.join(root, "legacy.json")
+        def legacy_update():
+            target = random.choice(ids)
+            next(p for p in data["profiles"] if p["id"] == target)
+            with open(legacy_file, "w") as f:
+                json.dump(data, f, indent=4)
+        legacy = _median_ms(legacy_update, max(runs // 10, 5))
+        print(f"- legacy full rewrite per change: {legacy:.1f} ms ({legacy / max(switch, update):.0f}x slower)")
+
+        start = time.perf_counter()
+        manager.compact()
+        print(f"- compact snapshot: {(time.perf_counter() - start) * 1000:.1f} ms")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+if __name__ == "__main__":
+    bench_profiles(*sys.argv[1:])
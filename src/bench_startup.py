@@ -0,0 +1,74 @@
+import subprocess
+import statistics
+import tempfile
+import time
+import sys
+import re
+import os
+from src.startup_profile import TTI_TARGET_MS
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What each entry point has to load before it can do any work
+ENTRY_POINTS = {
+    "qlauncher CLI": (
+        "import sys; from src import cli; from src import backend, profile_manager, mod_manager; "
+        "assert 'PyQt5' not in sys.modules, 'the CLI imported PyQt5'"
+    ),
+    "GUI (main.py)": (
+        "from PyQt5.QtWidgets import QApplication; from src import ui; app = QApplication([]); "
+        "from src import backend, profile_manager"
+    ),
+}
+
+def _env():
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    # The GUI keeps .minecraft under %APPDATA%; give other platforms a throwaway one
+    env.setdefault("APPDATA", tempfile.mkdtemp(prefix="qlauncher-bench-"))
+    return env
+
+def bench_tti(runs=5):
+    """Launch the GUI until it reports itself interactive, runs times (after one warm-up run that
+    fills the background cache). Prints the median against TTI_TARGET_MS and returns True if within."""
+    env = _env()
+    times = []
+    for i in range(int(runs) + 1):
+        result = subprocess.run([sys.executable, "main.py", "--quit-when-interactive"], cwd=ROOT, env=env,
+                                capture_output=True, text=True, timeout=120)
+        match = re.search(r"\[Startup\] Interactive after (\d+) ms", result.stdout)
+        if not match:
+            print(f"GUI did not report time to interactive: {(result.stderr or result.stdout).strip()[-300:]}")
+            return False
+        if i:
+            times.append(int(match.group(1)))
+    median = statistics.median(times)
+    verdict = "within" if median <= TTI_TARGET_MS else "OVER"
+    print(f"- GUI time to interactive: {median:.0f} ms (runs: {', '.join(map(str, times))}) — "
+          f"{verdict} the {TTI_TARGET_MS} ms target")
+    return median <= TTI_TARGET_MS
+
+def bench_startup(runs=5):
+    """Start a fresh interpreter per run for each entry point and print the median cold start."""
+    env = _env()
+    results = {}
+    for name, code in ENTRY_POINTS.items():
+        times = []
+        for _ in range(int(runs)):
+            start = time.perf_counter()
+            result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True)
+            times.append(time.perf_counter() - start)
+            if result.returncode != 0:
+                print(f"{name} failed: {result.stderr.strip().splitlines()[-1]}")
+                break
+        else:
+            results[name] = statistics.median(times)
+
+    for name, seconds in results.items():
+        print(f"- {name}: {seconds * 1000:.0f} ms")
+    if len(results) == 2:
+        cli, gui = results.values()
+        print(f"CLI starts {gui / cli:.1f}x faster than the GUI")
+
+if __name__ == "__main__":
+    bench_startup(*sys.argv[1:])
+    sys.exit(0 if bench_tti(*sys.argv[1:]) else 1)
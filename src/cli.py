@@ -0,0 +1,343 @@
+"""
+Headless command-line interface — ``python qlauncher.py <command>``.
+
+Drives LauncherBackend, ProfileManager and the mod backends directly so
+installs, launches and mod management can be scripted on machines
+without a display. Nothing here (or in the modules it imports) may
+import PyQt5: the CLI has to start fast and run where Qt isn't installed.
+
+Results go to stdout; the backends' log lines and progress go to stderr,
+so the output of e.g. ``mods search --json`` can be piped.
+"""
+import os
+import sys
+import json
+import time
+import shlex
+import argparse
+import subprocess
+from contextlib import redirect_stdout
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def default_minecraft_dir():
+    """The .minecraft folder the GUI uses — under %APPDATA% on Windows, the home folder elsewhere."""
+    return os.path.join(os.getenv("APPDATA") or os.path.expanduser("~"), ".minecraft")
+
+
+class _Progress:
+    """Progress callback printing one stderr line per new message, with the percentage."""
+
+    def __init__(self):
+        self._last = None
+
+    def __call__(self, text, value):
+        if text != self._last:
+            self._last = text
+            sys.stderr.write(f"[{int(value or 0):3d}%] {text}\n")
+            sys.stderr.flush()
+
+
+class Cli:
+    """Holds the backends of one CLI run; each cmd_* method implements a subcommand."""
+
+    def __init__(self, args):
+        self.args = args
+        self.minecraft_dir = args.minecraft_dir or default_minecraft_dir()
+        self.stdout = sys.stdout
+        self._backend = None
+        self._profiles = None
+
+    def out(self, text):
+        """Write a result line to the real stdout."""
+        print(text, file=self.stdout, flush=True)
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            from .backend import LauncherBackend
+            self._backend = LauncherBackend(self.minecraft_dir)
+        return self._backend
+
+    @property
+    def profiles(self):
+        if self._profiles is None:
+            from .profile_manager import ProfileManager
+            self._profiles = ProfileManager(APP_DIR, self.minecraft_dir)
+        return self._profiles
+
+    def profile(self):
+        """The profile named by --profile (id or name), else the active one."""
+        wanted = getattr(self.args, "profile", None)
+        if not wanted:
+            return self.profiles.get_active_profile()
+        for profile in self.profiles.get_profiles():
+            if wanted in (profile["id"], profile["name"]):
+                return profile
+        raise SystemExit(f"qlauncher: no profile named {wanted!r}")
+
+    def _target(self):
+        """(version, loader) from the command line, falling back to the profile's."""
+        profile = self.profile()
+        version = self.args.version or (profile and profile["version"])
+        loader = self.args.loader or (profile and profile["loader"]) or "Vanilla"
+        if not version:
+            raise SystemExit("qlauncher: no version given and no profile to take it from")
+        return profile, version, loader
+
+    def _mod_backend(self, mods_dir):
+        from .mod_manager import ModrinthBackend, CurseForgeBackend
+        backend = CurseForgeBackend if self.args.source == "curseforge" else ModrinthBackend
+        return backend(mods_dir)
+
+    # ─── Subcommands ───
+
+    def cmd_install(self):
+        backend = self.backend
+        version, loader = self.args.version, self.args.loader
+        if not backend.registry.is_installed(version):
+            stats = backend.install_version(version, _Progress())
+            if stats:
+                print(f"[CLI] Fetched {stats['files']} files ({stats['bytes'] / 1048576:.1f} MB)", file=sys.stderr)
+        launch_version_id = backend.resolve_loader(version, loader, _Progress())
+        if launch_version_id is None:
+            print(f"qlauncher: installing {loader} for {version} failed", file=sys.stderr)
+            return 1
+        self.out(launch_version_id)
+        return 0
+
+    def cmd_provision(self):
+        from .provision import parse_target
+        targets = [parse_target(text) for text in self.args.targets]
+        report = self.backend.provision(targets, _Progress())
+        if self.args.json:
+            self.out(json.dumps(report, indent=2))
+        else:
+            for target in report["targets"]:
+                name = f"{target['version']} {target['loader']}"
+                if target["error"]:
+                    self.out(f"{name:<24} FAILED: {target['error']}")
+                else:
+                    self.out(f"{name:<24} {target['launch_version']:<40} {target['files']:>6} files "
+                             f"({target['shared_files']} shared), ~{target['seconds_alone']:.1f}s alone, "
+                             f"~{target['saved']:.1f}s saved")
+            self.out(f"Provisioned {len(report['targets'])} target(s) in {report['seconds']:.1f}s "
+                     f"(~{report['sequential_seconds']:.1f}s one by one): {report['files']} files, "
+                     f"{report['bytes'] / 1048576:.1f} MB downloaded, {report['linked']} linked from the store")
+        return 1 if any(target["error"] for target in report["targets"]) else 0
+
+    def cmd_launch(self):
+        profile, version, loader = self._target()
+        game_dir = self.profiles.get_game_dir(profile["id"]) if profile else None
+        appcds = bool(profile and profile.get("appcds"))
+        backend = self.backend
+        command = backend.launch_game(version, loader, self.args.username, progress_callback=_Progress(),
+                                      game_dir=game_dir, appcds=appcds)
+        if not command:
+            print(f"qlauncher: could not prepare {version} ({loader})", file=sys.stderr)
+            return 1
+        if self.args.print_command:
+            self.out(shlex.join(command))
+            return 0
+        return self._run_game(command, profile["id"] if profile else "default", game_dir, appcds)
+
+    def _run_game(self, command, profile_key, game_dir, appcds):
+        """Run the game with its output on stdout, timing it like the GUI console does."""
+        from .launch_history import STARTUP_MARKER
+        backend = self.backend
+        timing = backend.last_launch_timing
+        game_spans = {}
+
+        def record():
+            if timing and game_spans:
+                regression = backend.record_launch_timing(profile_key, timing, game_spans)
+                if regression:
+                    print(f"[CLI] {regression}", file=sys.stderr)
+
+        start = time.perf_counter()
+        process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True,
+                                   bufsize=1, creationflags=_CREATE_NO_WINDOW)
+        game_spans["spawn"] = time.perf_counter() - start
+        recorded = False
+        try:
+            for line in process.stdout:
+                if "first_output" not in game_spans:
+                    game_spans["first_output"] = time.perf_counter() - start
+                if not recorded and STARTUP_MARKER in line:
+                    game_spans["game_ready"] = time.perf_counter() - start
+                    print(f"[CLI] Game started in {game_spans['game_ready']:.1f} s", file=sys.stderr)
+                    record()
+                    recorded = True
+                self.stdout.write(line)
+            exit_code = process.wait()
+        except KeyboardInterrupt:
+            process.kill()
+            exit_code = process.wait()
+        if not recorded:
+            record()
+        if appcds and game_dir:
+            backend.appcds_session_ended(game_dir, command, exit_code)
+        return exit_code
+
+    def cmd_verify(self):
+        report = self.backend.verify_installation(self.args.version, repair=not self.args.no_repair,
+                                                  progress_callback=_Progress())
+        if self.args.json:
+            self.out(json.dumps(report, indent=2))
+            return 1 if report["failed"] and not report["repaired"] else 0
+        lines = [f"{self.args.version}: checked {report['checked']} files "
+                 f"({report['hashed']} hashed, {report['memo_hits']} memoized) in {report['seconds']:.2f}s"]
+        lines += [f"  bad: {path}" for path in report["failed"]]
+        if report["repaired"]:
+            lines.append(f"  repaired {report['repaired']} file(s)")
+        self.out("\n".join(lines))
+        return 1 if report["failed"] and not report["repaired"] else 0
+
+    def cmd_uninstall(self):
+        if not self.backend.uninstall_version(self.args.version):
+            print(f"qlauncher: {self.args.version} is not installed", file=sys.stderr)
+            return 1
+        self.out(f"Uninstalled {self.args.version}")
+        return 0
+
+    def cmd_mods_search(self):
+        profile = self.profile()
+        version = self.args.version or (profile and profile["version"])
+        loader = self.args.loader or (profile and profile["loader"])
+        mods_dir = self.profiles.get_mods_dir(profile["id"]) if profile else os.path.join(self.minecraft_dir, "mods")
+        hits = self._mod_backend(mods_dir).search_mods(self.args.query, version=version, loader=loader,
+                                                       limit=self.args.limit, index=self.args.sort)
+        if self.args.json:
+            self.out(json.dumps([{k: v for k, v in hit.items() if not k.startswith("_")} for hit in hits], indent=2))
+            return 0
+        for hit in hits:
+            self.out(f"{hit.get('slug', ''):<32} {hit.get('downloads', 0):>11,}  {hit.get('title', '')}")
+        return 0
+
+    def cmd_mods_install(self):
+        profile = self.profile()
+        if profile is None:
+            raise SystemExit("qlauncher: mods install needs a profile")
+        version = self.args.version or profile["version"]
+        loader = (self.args.loader or profile["loader"]).lower()
+        mods = self._mod_backend(self.profiles.get_mods_dir(profile["id"]))
+        for mod_version in mods.get_mod_versions(self.args.mod):
+            loaders = mod_version.get("loaders", [])
+            if version in mod_version.get("game_versions", []) and (loader == "vanilla" or loader in loaders):
+                break
+        else:
+            print(f"qlauncher: {self.args.mod} has no build for {version} ({loader})", file=sys.stderr)
+            return 1
+        ok, result = mods.download_mod(mod_version)
+        if not ok:
+            print(f"qlauncher: download failed: {result}", file=sys.stderr)
+            return 1
+        self.out(f"Installed {os.path.basename(result)} into {profile['name']}")
+        return 0
+
+    def cmd_profiles(self):
+        active = self.profiles.get_active_profile()
+        for profile in self.profiles.get_profiles():
+            marker = "*" if active and profile["id"] == active["id"] else " "
+            self.out(f"{marker} {profile['id']}  {profile['name']:<24} {profile['version']:<10} {profile['loader']}")
+        return 0
+
+    def cmd_usage(self):
+        from .disk_usage import format_size, INSTANCE_OTHER
+        profiles = [self.profile()] if self.args.profile else self.profiles.get_profiles()
+        # Every instance lives inside versions/ and is excluded from it, even when only one is reported
+        instance_dirs = self.profiles.instance_dirs()
+        report = self.backend.disk_usage.report(instance_dirs, self.profiles.INSTANCE_DIRS)
+        print(f"[CLI] Listed {report['scanned']} directories, {report['reused']} unchanged since the last run")
+        if self.args.json:
+            report["profiles"] = {p["id"]: report["profiles"][p["id"]] for p in profiles}
+            self.out(json.dumps(report, indent=2))
+            return 0
+
+        for profile in profiles:
+            usage = report["profiles"][profile["id"]]
+            parts = [f"{name} {format_size(usage[name])}" for name in self.profiles.INSTANCE_DIRS + [INSTANCE_OTHER]
+                     if usage[name]]
+            self.out(f"{profile['name']:<24} {format_size(usage['total']):>10}  {', '.join(parts)}")
+        shared = report["shared"]
+        parts = [f"{name} {format_size(size)}" for name, size in shared.items() if name not in ("total", "store") and size]
+        self.out(f"{'Shared':<24} {format_size(shared['total']):>10}  {', '.join(parts)}")
+        if shared.get("store"):
+            self.out(f"Sizes are apparent: {format_size(shared['store'])} in the object store is hardlinked into the shared files.")
+        return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="qlauncher", description="QLauncher without the GUI.")
+    parser.add_argument("--minecraft-dir", help="Minecraft root (default: the GUI's .minecraft)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    install = commands.add_parser("install", help="install a version and optionally a modloader")
+    install.add_argument("version")
+    install.add_argument("--loader", default="Vanilla", choices=["Vanilla", "Fabric", "Forge", "Quilt"])
+    install.set_defaults(run=Cli.cmd_install)
+
+    provision = commands.add_parser("provision", help="install many versions and loaders at once")
+    provision.add_argument("targets", nargs="+", metavar="VERSION[:LOADER]",
+                           help="e.g. 1.21.4 1.20.1:Fabric 1.19.2:Forge")
+    provision.add_argument("--json", action="store_true")
+    provision.set_defaults(run=Cli.cmd_provision)
+
+    launch = commands.add_parser("launch", help="launch a profile, or a version with --version")
+    launch.add_argument("--profile", help="profile id or name (default: the active profile)")
+    launch.add_argument("--version", help="override the profile's version")
+    launch.add_argument("--loader", choices=["Vanilla", "Fabric", "Forge", "Quilt"], help="override the profile's loader")
+    launch.add_argument("--username", default="Player")
+    launch.add_argument("--print-command", action="store_true", help="prepare the launch and print the command only")
+    launch.set_defaults(run=Cli.cmd_launch)
+
+    verify = commands.add_parser("verify", help="check (and repair) the files of an installed version")
+    verify.add_argument("version")
+    verify.add_argument("--no-repair", action="store_true")
+    verify.add_argument("--json", action="store_true")
+    verify.set_defaults(run=Cli.cmd_verify)
+
+    uninstall = commands.add_parser("uninstall", help="remove an installed version and natives nothing else uses")
+    uninstall.add_argument("version")
+    uninstall.set_defaults(run=Cli.cmd_uninstall)
+
+    mods = commands.add_parser("mods", help="search and install mods").add_subparsers(dest="mods_command", required=True)
+    for name, help_text in (("search", "search mods"), ("install", "install a mod into a profile")):
+        sub = mods.add_parser(name, help=help_text)
+        sub.add_argument("query" if name == "search" else "mod",
+                         help="search text" if name == "search" else "slug or project id")
+        sub.add_argument("--profile", help="profile id or name (default: the active profile)")
+        sub.add_argument("--source", default="modrinth", choices=["modrinth", "curseforge"])
+        sub.add_argument("--version", help="game version (default: the profile's)")
+        sub.add_argument("--loader", help="modloader (default: the profile's)")
+        if name == "search":
+            sub.add_argument("--limit", type=int, default=20)
+            sub.add_argument("--sort", default="relevance", choices=["relevance", "downloads", "newest", "updated"])
+            sub.add_argument("--json", action="store_true")
+            sub.set_defaults(run=Cli.cmd_mods_search)
+        else:
+            sub.set_defaults(run=Cli.cmd_mods_install)
+
+    profiles = commands.add_parser("profiles", help="list profiles")
+    profiles.set_defaults(run=Cli.cmd_profiles)
+
+    usage = commands.add_parser("usage", help="disk space used by each profile and by shared files")
+    usage.add_argument("--profile", help="profile id or name (default: every profile)")
+    usage.add_argument("--json", action="store_true")
+    usage.set_defaults(run=Cli.cmd_usage)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cli = Cli(args)
+    # Keep stdout for results — backend logging and worker threads print to stderr meanwhile
+    with redirect_stdout(sys.stderr):
+        return args.run(cli)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,24 +2,29 @@
 Embedded game console panel — runs Minecraft as a subprocess and
 streams stdout / stderr into a QTextEdit inside the launcher.
 """
+import time
 import subprocess
 from PyQt5.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QLabel
+    QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, QPushButton, QLabel, QDialog
 )
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, QProcess
 from PyQt5.QtGui import QFont, QTextCursor, QColor
+from .launch_history import STARTUP_MARKER
 
 FONT = "'Segoe UI', 'Helvetica Neue', Arial, sans-serif"
 MONO = "'Cascadia Code', 'Consolas', 'Courier New', monospace"
 C_GREEN = "#4ade80"
 C_GREEN_D = "#22c55e"
 
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
 
 class GameRunnerThread(QThread):
     """Runs the Minecraft process and emits stdout/stderr line by line."""
     output_signal = pyqtSignal(str)       # each line of output
     error_signal = pyqtSignal(str)        # each line of stderr
     finished_signal = pyqtSignal(int)     # exit code
+    spawned_signal = pyqtSignal(float)    # seconds taken by Popen
 
     def __init__(self, command, parent=None):
         super().__init__(parent)
@@ -28,14 +33,16 @@ class GameRunnerThread(QThread):
 
     def run(self):
         try:
+            start = time.perf_counter()
             self._process = subprocess.Popen(
                 self.command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
                 bufsize=1,
-                creationflags=subprocess.CREATE_NO_WINDOW,
+                creationflags=_CREATE_NO_WINDOW,
             )
+            self.spawned_signal.emit(time.perf_counter() - start)
 
             # Read stdout in real time
             for line in iter(self._process.stdout.readline, ""):
@@ -61,9 +68,20 @@ class GameRunnerThread(QThread):
 class ConsolePanel(QWidget):
     """Embedded console panel shown inside the launcher while the game runs."""
     closed = pyqtSignal()
+    cancelled = pyqtSignal()              # killed while still waiting to start
+    startup_signal = pyqtSignal(float)    # seconds from spawn to STARTUP_MARKER
+    first_output_signal = pyqtSignal(float)  # seconds from spawn to the first line of output
 
-    def __init__(self, command, parent=None):
+    def __init__(self, command, parent=None, title="Game Console", start=True):
+        """With start=False the game waits until start() is called (see LaunchManagerPanel)."""
         super().__init__(parent)
+        self.command = command
+        self.started = False
+        self.done = False                 # exited, or cancelled before it started
+        self._started_at = time.perf_counter()
+        self._startup_seen = False
+        self._output_seen = False
+        self._timing_report = None
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.setObjectName("consoleRoot")
         self.setStyleSheet(f"""
@@ -84,7 +102,7 @@ class ConsolePanel(QWidget):
 
         # ── Header ──
         header = QHBoxLayout()
-        title = QLabel("🎮  Game Console")
+        title = QLabel(f"🎮  {title}")
         title.setStyleSheet("font-size: 18px; font-weight: 700; color: white;")
         header.addWidget(title)
 
@@ -113,6 +131,27 @@ class ConsolePanel(QWidget):
         self.kill_btn.clicked.connect(self._kill_game)
         header.addWidget(self.kill_btn)
 
+        self.timings_btn = QPushButton("⏱ Timings")
+        self.timings_btn.setCursor(Qt.PointingHandCursor)
+        self.timings_btn.setStyleSheet("""
+            QPushButton {
+                background-color: rgba(255,255,255,0.06);
+                border: 1px solid rgba(255,255,255,0.08);
+                border-radius: 8px;
+                color: white;
+                padding: 8px 18px;
+                font-weight: 600;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255,255,255,0.10);
+                border: 1px solid rgba(255,255,255,0.15);
+            }
+        """)
+        self.timings_btn.clicked.connect(self._show_timings)
+        self.timings_btn.setVisible(False)
+        header.addWidget(self.timings_btn)
+
         self.close_btn = QPushButton("← Geri")
         self.close_btn.setCursor(Qt.PointingHandCursor)
         self.close_btn.setStyleSheet("""
@@ -153,43 +192,102 @@ class ConsolePanel(QWidget):
         """)
         layout.addWidget(self.console)
 
-        # ── Start the game thread ──
+        # ── Game thread ──
         self.runner = GameRunnerThread(command)
         self.runner.output_signal.connect(self._on_stdout)
         self.runner.error_signal.connect(self._on_stderr)
         self.runner.finished_signal.connect(self._on_finished)
+        self.runner.spawned_signal.connect(self._on_spawned)
+        if start:
+            self.start()
+        else:
+            self._set_status("● Waiting", "#facc15")
+
+    def start(self):
+        """Start the game process."""
+        if self.started or self.done:
+            return
+        self.started = True
+        self._started_at = time.perf_counter()
+        self._set_status("● Running", C_GREEN)
         self.runner.start()
+        self.append_system(f"[QLauncher] Game process started...")
 
-        self._append_system(f"[QLauncher] Game process started...")
+    def _set_status(self, text, color):
+        self.status_label.setText(text)
+        self.status_label.setStyleSheet(f"color: {color}; font-weight: 600; font-size: 13px;")
 
-    def _append_system(self, text):
+    def append_system(self, text):
+        """Append a launcher message (in green) to the console."""
         self.console.setTextColor(QColor(74, 222, 128))
         self.console.append(text)
         self.console.moveCursor(QTextCursor.End)
 
+    def _on_spawned(self, seconds):
+        print(f"[Launch] Starting game: {seconds * 1000:.0f} ms")
+        self.append_system(f"[QLauncher] Process spawned in {seconds * 1000:.0f} ms")
+
+    def set_timing_report(self, report):
+        """Show the Timings button; report() returns the launch history text it displays."""
+        self._timing_report = report
+        self.timings_btn.setVisible(True)
+
+    def _show_timings(self):
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Launch Timings")
+        dialog.resize(900, 420)
+        dialog.setStyleSheet("background-color: #111; color: #ddd;")
+        layout = QVBoxLayout(dialog)
+        text = QTextEdit()
+        text.setReadOnly(True)
+        text.setFont(QFont("Cascadia Code, Consolas, Courier New", 10))
+        text.setLineWrapMode(QTextEdit.NoWrap)
+        text.setPlainText(self._timing_report())
+        layout.addWidget(text)
+        dialog.exec_()
+
+    def _note_output(self):
+        if not self._output_seen:
+            self._output_seen = True
+            self.first_output_signal.emit(time.perf_counter() - self._started_at)
+
     def _on_stdout(self, line):
+        self._note_output()
+        if not self._startup_seen and STARTUP_MARKER in line:
+            self._startup_seen = True
+            seconds = time.perf_counter() - self._started_at
+            self.append_system(f"[QLauncher] Game started in {seconds:.1f} s")
+            self.startup_signal.emit(seconds)
         self.console.setTextColor(QColor(200, 200, 200))
         self.console.append(line)
         self.console.moveCursor(QTextCursor.End)
 
     def _on_stderr(self, line):
+        self._note_output()
         self.console.setTextColor(QColor(248, 113, 113))
         self.console.append(line)
         self.console.moveCursor(QTextCursor.End)
 
     def _on_finished(self, exit_code):
         if exit_code == 0:
-            self._append_system(f"[QLauncher] Game exited successfully (code {exit_code}).")
-            self.status_label.setText("● Finished")
-            self.status_label.setStyleSheet("color: #60a5fa; font-weight: 600; font-size: 13px;")
+            self.append_system(f"[QLauncher] Game exited successfully (code {exit_code}).")
+            self._set_status("● Finished", "#60a5fa")
         else:
-            self._append_system(f"[QLauncher] Game exited with code {exit_code}.")
-            self.status_label.setText("● Crashed")
-            self.status_label.setStyleSheet("color: #ef4444; font-weight: 600; font-size: 13px;")
+            self.append_system(f"[QLauncher] Game exited with code {exit_code}.")
+            self._set_status("● Crashed", "#ef4444")
 
+        self.done = True
         self.kill_btn.setEnabled(False)
         self.close_btn.setEnabled(True)
 
     def _kill_game(self):
+        if not self.started:
+            self.done = True
+            self.append_system("[QLauncher] Launch cancelled by user.")
+            self._set_status("● Cancelled", "#94a3b8")
+            self.kill_btn.setEnabled(False)
+            self.close_btn.setEnabled(True)
+            self.cancelled.emit()
+            return
         self.runner.kill_process()
-        self._append_system("[QLauncher] Game process killed by user.")
+        self.append_system("[QLauncher] Game process killed by user.")
@@ -0,0 +1,167 @@
+"""
+Disk usage of profiles and of the files they share.
+
+Sizes are summed per directory and cached together with the directory's
+mtime, which changes whenever an entry is added, removed or renamed in it.
+A refresh still stats every directory, but only lists the ones whose mtime
+moved — the rest reuse the cached file total and subdirectory names. A
+file rewritten in place (a growing world region, say) doesn't touch its
+directory's mtime, so its new size shows once something else in that
+directory changes.
+
+Sizes are apparent sizes: files hardlinked from the shared object store
+count in every place they appear (see ObjectStore.report for the savings).
+The store itself is reported beside the shared total but left out of it —
+the libraries and assets it backs are already counted there.
+"""
+import os
+import json
+import threading
+
+# Shared categories: name → path relative to the Minecraft root
+SHARED = {
+    "versions": "versions",
+    "libraries": "libraries",
+    "assets": "assets",
+    "runtime": "runtime",
+}
+
+INSTANCE_OTHER = "other"
+
+
+def format_size(size):
+    """Human-readable byte count: 512 B, 3.4 MB, 1.20 GB."""
+    if size < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB", "GB"):
+        size /= 1024
+        if size < 1024 or unit == "GB":
+            return f"{size:.2f} {unit}" if unit == "GB" else f"{size:.1f} {unit}"
+
+
+class DiskUsage:
+    """Per-directory size cache keyed by directory mtime."""
+
+    def __init__(self, cache_file, minecraft_directory, store_dir=None):
+        self.cache_file = cache_file
+        self.minecraft_directory = minecraft_directory
+        self.store_dir = store_dir
+        self._dirs = {}      # path → [mtime_ns, bytes of the files directly inside, [subdirectory names]]
+        self._lock = threading.Lock()
+        self._dirty = False
+        self.scanned = 0     # directories listed since the last report
+        self.reused = 0      # directories answered from the cache since the last report
+        self._load()
+
+    def _load(self):
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
+                    self._dirs = json.load(f)
+        except Exception as e:
+            print(f"[DiskUsage] Error loading cache: {e}")
+            self._dirs = {}
+
+    def flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(self._dirs, f, separators=(",", ":"))
+                os.replace(tmp, self.cache_file)
+                self._dirty = False
+            except Exception as e:
+                print(f"[DiskUsage] Error saving cache: {e}")
+
+    def _forget(self, path):
+        """Drop the cached records of a directory that went away, and of everything under it."""
+        prefix = path + os.sep
+        for key in [key for key in self._dirs if key == path or key.startswith(prefix)]:
+            del self._dirs[key]
+
+    def _directory(self, path):
+        """(bytes of the files directly in path, subdirectory names), listing path only if it changed."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            with self._lock:
+                if path in self._dirs:
+                    self._forget(path)
+                    self._dirty = True
+            return 0, []
+
+        with self._lock:
+            record = self._dirs.get(path)
+        if record and record[0] == mtime:
+            self.reused += 1
+            return record[1], record[2]
+
+        files, subdirs = 0, []
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.name)
+                        elif entry.is_file(follow_symlinks=False):
+                            files += entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue
+        except OSError:
+            return 0, []
+        self.scanned += 1
+
+        with self._lock:
+            if record:
+                for gone in set(record[2]) - set(subdirs):
+                    self._forget(os.path.join(path, gone))
+            self._dirs[path] = [mtime, files, subdirs]
+            self._dirty = True
+        return files, subdirs
+
+    def tree_size(self, path, exclude=()):
+        """Total bytes under path. Directories in exclude (absolute paths) are skipped."""
+        files, subdirs = self._directory(path)
+        total = files
+        for name in subdirs:
+            child = os.path.join(path, name)
+            if child not in exclude:
+                total += self.tree_size(child, exclude)
+        return total
+
+    def profile_usage(self, instance_dir, categories):
+        """{category: bytes} for the named subdirectories of an instance, plus "other" and "total"."""
+        instance_dir = os.path.normpath(instance_dir)
+        files, subdirs = self._directory(instance_dir)
+        usage = dict.fromkeys(categories, 0)
+        usage[INSTANCE_OTHER] = files
+        for name in subdirs:
+            size = self.tree_size(os.path.join(instance_dir, name))
+            usage[name if name in usage else INSTANCE_OTHER] += size
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def shared_usage(self, instance_dirs=()):
+        """{category: bytes} of what every profile shares. Instance directories live inside
+        versions/, so they are left out of it. The object store is reported as "store" when
+        there is one, but not added to "total": its files are hardlinked into the categories."""
+        exclude = {os.path.normpath(d) for d in instance_dirs}
+        usage = {}
+        for name, relative in SHARED.items():
+            usage[name] = self.tree_size(os.path.normpath(os.path.join(self.minecraft_directory, relative)), exclude)
+        usage["total"] = sum(usage.values())
+        if self.store_dir:
+            usage["store"] = self.tree_size(os.path.normpath(self.store_dir))
+        return usage
+
+    def report(self, instance_dirs, categories):
+        """Usage of several profiles and of the shared files in one pass, then save the cache.
+        instance_dirs maps profile id → instance directory. Returns
+        {"profiles": {id: usage}, "shared": usage, "scanned": n, "reused": n}."""
+        self.scanned = self.reused = 0
+        profiles = {pid: self.profile_usage(path, categories) for pid, path in instance_dirs.items()}
+        shared = self.shared_usage(instance_dirs.values())
+        self.flush()
+        return {"profiles": profiles, "shared": shared, "scanned": self.scanned, "reused": self.reused}
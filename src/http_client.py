@@ -0,0 +1,193 @@
+"""
+Shared HTTP client for the mod APIs, icons, the background image and the
+version manifest.
+
+Every caller goes through one requests.Session, so the connection pools
+(one per host) keep TLS connections alive between searches instead of
+handshaking for every request. Requests get a (connect, read) timeout
+unless they pass their own. Idempotent requests that fail to connect,
+time out or come back 429 / 5xx are retried with exponential backoff and
+full jitter; a Retry-After header wins over the computed delay.
+
+Hosts that publish their rate limit (Modrinth's X-Ratelimit-Limit,
+-Remaining and -Reset) get a token bucket resynced from those headers on
+every response, so bursts are paced on our side instead of being answered
+with 429.
+
+The install engine downloads game files over its own session: its pool is
+sized to its worker count and it retries per file itself. Its manifest
+lookups go through this client.
+"""
+import time
+import random
+import threading
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+USER_AGENT = "QLauncher"
+# (connect, read) seconds; read is per chunk, so long downloads are fine
+TIMEOUT = (5, 30)
+RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+RETRY_STATUS = {429, 500, 502, 503, 504}
+IDEMPOTENT = {"GET", "HEAD", "OPTIONS"}
+POOL_HOSTS = 16
+POOL_SIZE = 8
+# Length of a rate limit window when the server doesn't say (Modrinth: per minute)
+RATE_WINDOW = 60.0
+
+
+class TokenBucket:
+    """Paces requests to one host: up to `capacity` at once, refilled at `rate` per second."""
+
+    def __init__(self, capacity, rate, clock=time.monotonic, sleep=time.sleep):
+        self.capacity = capacity
+        self.rate = rate
+        self.tokens = float(capacity)
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Take a token, sleeping until it is due. Returns the seconds slept.
+        Tokens are reserved under the lock and slept for outside it, so waiting
+        callers are served in order without holding each other up."""
+        with self._lock:
+            self._refill(self._clock())
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait:
+            self._sleep(wait)
+        return wait
+
+    def observe(self, limit, remaining, reset):
+        """Resync with the server: `remaining` of `limit` requests are left and the window resets in `reset` s.
+        The server also counts requests from other programs on this address, so it has the last word."""
+        with self._lock:
+            self._refill(self._clock())
+            self.capacity = limit
+            self.rate = limit / RATE_WINDOW
+            if remaining > 0:
+                self.tokens = float(remaining)
+            else:
+                # Nothing left: the next token comes when the window resets
+                self.tokens = min(self.tokens, 1 - reset * self.rate)
+
+
+def _retry_after(response):
+    """Seconds the server asked us to wait (Retry-After as seconds or an HTTP date), or None."""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _header_int(headers, name):
+    try:
+        return int(float(headers[name]))
+    except (KeyError, ValueError):
+        return None
+
+
+class HttpClient:
+    """Pooled session with default timeouts, jittered retries and per-host rate limit pacing."""
+
+    def __init__(self, timeout=TIMEOUT, retries=RETRIES, pool_size=POOL_SIZE, clock=time.monotonic, sleep=time.sleep):
+        self.timeout = timeout
+        self.retries = retries
+        self._clock = clock
+        self._sleep = sleep
+        self.session = requests.Session()
+        self.session.headers["User-Agent"] = USER_AGENT
+        adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._buckets = {}      # host → TokenBucket, for hosts that sent rate limit headers
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "paced_seconds": 0.0}
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def request(self, method, url, retries=None, **kwargs):
+        """Like Session.request, with the client's timeout, pacing and retries.
+        Returns the last response (callers still raise_for_status); raises the last
+        connection error or timeout once the retries are used up."""
+        kwargs.setdefault("timeout", self.timeout)
+        host = urlsplit(url).netloc
+        attempts = (self.retries if retries is None else retries) if method.upper() in IDEMPOTENT else 0
+        for attempt in range(attempts + 1):
+            bucket = self._buckets.get(host)
+            if bucket:
+                paced = bucket.acquire()
+                if paced:
+                    self._count("paced_seconds", paced)
+            self._count("requests")
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == attempts:
+                    raise
+                self._backoff(attempt, None)
+                continue
+            self._observe(host, response.headers)
+            if response.status_code in RETRY_STATUS and attempt < attempts:
+                delay = _retry_after(response)
+                response.close()
+                self._backoff(attempt, delay)
+                continue
+            return response
+
+    def _backoff(self, attempt, delay):
+        if delay is None:
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        self._count("retries")
+        self._sleep(min(delay, BACKOFF_CAP))
+
+    def _observe(self, host, headers):
+        limit = _header_int(headers, "X-Ratelimit-Limit")
+        remaining = _header_int(headers, "X-Ratelimit-Remaining")
+        if limit is None or remaining is None or limit <= 0:
+            return
+        reset = _header_int(headers, "X-Ratelimit-Reset") or 0
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(limit, limit / RATE_WINDOW, self._clock, self._sleep)
+        bucket.observe(limit, remaining, reset)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide HttpClient."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HttpClient()
+        return _client
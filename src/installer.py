@@ -0,0 +1,398 @@
+"""
+Parallel install engine for vanilla Minecraft versions.
+
+Resolves the version JSON and asset index into one flat download plan
+(libraries, natives, client jar, log config, asset objects) and fetches
+it through a bounded worker pool sharing a keep-alive connection pool.
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+import requests
+from requests.adapters import HTTPAdapter
+import minecraft_launcher_lib
+from minecraft_launcher_lib._helper import parse_rule_list, inherit_json
+from minecraft_launcher_lib.natives import get_natives
+
+from .natives_cache import NativesCache
+from .http_client import get_client
+
+MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+RESOURCES_URL = "https://resources.download.minecraft.net"
+LIBRARIES_URL = "https://libraries.minecraft.net"
+
+CHUNK_SIZE = 64 * 1024
+PROGRESS_INTERVAL = 0.1  # seconds between progress callbacks
+
+
+class DownloadError(Exception):
+    """Raised when one or more files of a download plan could not be fetched."""
+
+
+class DownloadCancelled(Exception):
+    """Raised when a download is stopped through its cancel event."""
+
+
+def maven_path(name):
+    """Turn a maven coordinate (group:artifact:version[:classifier][@ext]) into a relative path."""
+    if "@" in name:
+        name, ext = name.split("@", 1)
+    else:
+        ext = "jar"
+    parts = name.split(":")
+    group, artifact, version = parts[0:3]
+    classifier = "".join(f"-{p}" for p in parts[3:])
+    return "/".join(group.split(".") + [artifact, version, f"{artifact}-{version}{classifier}.{ext}"])
+
+
+class InstallEngine:
+    """Downloads everything a version needs through a bounded worker pool.
+
+    Progress is reported through the launcher's usual ``callback(text, percent)``
+    contract, always from the thread that called into the engine."""
+
+    def __init__(self, minecraft_directory, max_workers=16, retries=3, timeout=30, store=None, manifest=None):
+        self.minecraft_directory = minecraft_directory
+        self.store = store  # optional ObjectStore shared with other roots
+        self.manifest = manifest  # optional ManifestCache, saves a manifest download per install
+        self.natives = NativesCache(os.path.join(minecraft_directory, "qlauncher_natives"))
+        self.max_workers = max_workers
+        self.retries = retries
+        self.timeout = timeout
+
+        # One session for every worker: connections are kept alive and reused. Retries are
+        # left to _fetch, which also retries checksum mismatches, so the adapter doesn't add its own
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+
+    # ─── Version metadata ───
+    def version_json_path(self, version_id):
+        return os.path.join(self.minecraft_directory, "versions", version_id, f"{version_id}.json")
+
+    def _load_version_json(self, version_id):
+        """Read the version JSON from disk, fetching it from the manifest if missing."""
+        path = self.version_json_path(version_id)
+        if not os.path.isfile(path):
+            if self.manifest:
+                entry = self.manifest.find(version_id)
+            else:
+                manifest = get_client().get(MANIFEST_URL).json()
+                entry = next((v for v in manifest.get("versions", []) if v["id"] == version_id), None)
+            if entry is None:
+                raise minecraft_launcher_lib.exceptions.VersionNotFound(version_id)
+            self.download([self._task(entry["url"], path, entry.get("sha1"), 0, "version")])
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _load_asset_index(self, version_data):
+        """Read the asset index for a version, fetching it if missing or stale."""
+        index = version_data.get("assetIndex")
+        if not index:
+            return {}
+        path = os.path.join(self.minecraft_directory, "assets", "indexes", f"{version_data['assets']}.json")
+        task = self._task(index["url"], path, index.get("sha1"), index.get("size", 0), "asset_index")
+        if self.needs_download(task):
+            self.download([task])
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    # ─── Plan ───
+    def _task(self, url, path, sha1, size, kind, **extra):
+        task = {"url": url, "path": path, "sha1": sha1, "size": size or 0, "kind": kind}
+        task.update(extra)
+        return task
+
+    def _library_tasks(self, lib):
+        """Return the artifact (and native classifier) tasks for one library entry."""
+        if "rules" in lib and not parse_rule_list(lib["rules"], {}):
+            return []
+        lib_dir = os.path.join(self.minecraft_directory, "libraries")
+        downloads = lib.get("downloads", {})
+        tasks = []
+
+        artifact = downloads.get("artifact")
+        if artifact and artifact.get("url") and artifact.get("path"):
+            tasks.append(self._task(artifact["url"], os.path.join(lib_dir, artifact["path"]),
+                                    artifact.get("sha1"), artifact.get("size"), "library"))
+        elif "downloads" not in lib and "name" in lib:
+            # Maven-style entry (Fabric / Quilt) — build the URL from the coordinate
+            rel = maven_path(lib["name"])
+            base = lib.get("url", LIBRARIES_URL).rstrip("/")
+            tasks.append(self._task(f"{base}/{rel}", os.path.join(lib_dir, rel),
+                                    lib.get("sha1"), lib.get("size"), "library"))
+
+        native = get_natives(lib)
+        if native:
+            classifier = downloads.get("classifiers", {}).get(native)
+            if classifier:
+                url, rel = classifier["url"], classifier["path"]
+                sha1, size = classifier.get("sha1"), classifier.get("size")
+            else:
+                rel = maven_path(f"{lib['name']}:{native}")
+                url, sha1, size = f"{lib.get('url', LIBRARIES_URL).rstrip('/')}/{rel}", None, 0
+            tasks.append(self._task(url, os.path.join(lib_dir, rel), sha1, size, "native",
+                                    extract=lib.get("extract", {"exclude": []})))
+        return tasks
+
+    def build_plan(self, version_data, asset_index=None):
+        """Build the full list of download tasks for an (inherited) version JSON."""
+        tasks = []
+        for lib in version_data.get("libraries", []):
+            tasks.extend(self._library_tasks(lib))
+
+        client = version_data.get("downloads", {}).get("client")
+        if client:
+            jar = os.path.join(self.minecraft_directory, "versions", version_data["id"], f"{version_data['id']}.jar")
+            tasks.append(self._task(client["url"], jar, client.get("sha1"), client.get("size"), "client"))
+
+        logging_file = version_data.get("logging", {}).get("client", {}).get("file")
+        if logging_file:
+            path = os.path.join(self.minecraft_directory, "assets", "log_configs", logging_file["id"])
+            tasks.append(self._task(logging_file["url"], path, logging_file.get("sha1"), logging_file.get("size"), "log_config"))
+
+        # Asset objects are addressed by hash, so identical files are fetched once
+        seen = set()
+        for obj in (asset_index or {}).get("objects", {}).values():
+            h = obj["hash"]
+            if h in seen:
+                continue
+            seen.add(h)
+            path = os.path.join(self.minecraft_directory, "assets", "objects", h[:2], h)
+            tasks.append(self._task(f"{RESOURCES_URL}/{h[:2]}/{h}", path, h, obj.get("size"), "asset"))
+        return tasks
+
+    def needs_download(self, task):
+        """Cheap presence check — existing files are trusted when their size matches."""
+        if not os.path.isfile(task["path"]):
+            return True
+        return bool(task["size"]) and os.path.getsize(task["path"]) != task["size"]
+
+    # ─── Shared store ───
+    def link_from_store(self, tasks):
+        """Satisfy tasks from the shared object store. Returns (remaining, linked_count, linked_bytes)."""
+        if not self.store:
+            return tasks, 0, 0
+        remaining = []
+        linked = 0
+        linked_bytes = 0
+        for task in tasks:
+            if task["sha1"] and self.store.has(task["sha1"]):
+                self.store.link_into(task["sha1"], task["path"])
+                linked += 1
+                linked_bytes += task["size"]
+            else:
+                remaining.append(task)
+        if linked:
+            self.store.flush()
+        return remaining, linked, linked_bytes
+
+    def adopt_into_store(self, tasks):
+        """Hand freshly downloaded, checksummed files over to the shared store."""
+        if not self.store:
+            return
+        for task in tasks:
+            if task["sha1"] and os.path.isfile(task["path"]):
+                self.store.adopt(task["path"], task["sha1"])
+        self.store.flush()
+
+    # ─── Download ───
+    @staticmethod
+    def _checkpoint(cancel_event, resume_event):
+        """Raise DownloadCancelled if cancelled; block while resume_event is cleared (paused)."""
+        while True:
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled()
+            if resume_event is None or resume_event.wait(PROGRESS_INTERVAL):
+                return
+
+    def _fetch(self, task, progress, cancel_event=None, resume_event=None):
+        """Download one task to a temp file, verify its SHA1 and move it into place."""
+        self._checkpoint(cancel_event, resume_event)
+        os.makedirs(os.path.dirname(task["path"]), exist_ok=True)
+        # Per-thread temp name: two installs sharing a library never write the same file
+        tmp_path = f"{task['path']}.{threading.get_ident()}.part"
+        last_error = None
+
+        for _ in range(self.retries):
+            written = 0
+            digest = hashlib.sha1()
+            try:
+                with self.session.get(task["url"], stream=True, timeout=self.timeout) as r:
+                    r.raise_for_status()
+                    with open(tmp_path, "wb") as f:
+                        for chunk in r.iter_content(CHUNK_SIZE):
+                            self._checkpoint(cancel_event, resume_event)
+                            f.write(chunk)
+                            digest.update(chunk)
+                            written += len(chunk)
+                            with progress["lock"]:
+                                progress["bytes"] += len(chunk)
+                if task["sha1"] and digest.hexdigest() != task["sha1"]:
+                    raise DownloadError(f"Checksum mismatch for {task['url']}")
+                os.replace(tmp_path, task["path"])
+                with progress["lock"]:
+                    progress["files"] += 1
+                return written
+            except DownloadCancelled:
+                last_error = None
+                break
+            except Exception as e:
+                last_error = e
+                with progress["lock"]:
+                    progress["bytes"] -= written
+
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        if last_error is None:
+            raise DownloadCancelled()
+        raise DownloadError(f"{task['url']}: {last_error}")
+
+    def _report(self, progress_callback, progress, status, total_files, total_bytes):
+        with progress["lock"]:
+            files, done = progress["files"], progress["bytes"]
+        if total_bytes:
+            percent = min(100, done * 100 // total_bytes)
+        else:
+            percent = files * 100 // total_files if total_files else 100
+        progress_callback(
+            f"{status} {files}/{total_files} files ({done / 1048576:.1f}/{total_bytes / 1048576:.1f} MB)",
+            percent
+        )
+
+    def download(self, tasks, progress_callback=None, status="Downloading", cancel_event=None, resume_event=None):
+        """Fetch the given tasks concurrently. Returns {files, bytes, seconds}.
+        Setting cancel_event stops in-flight transfers and raises DownloadCancelled;
+        clearing resume_event pauses them until it is set again."""
+        start = time.perf_counter()
+        progress = {"files": 0, "bytes": 0, "lock": threading.Lock()}
+        total_bytes = sum(t["size"] for t in tasks)
+        failures = []
+        cancelled = False
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = {pool.submit(self._fetch, t, progress, cancel_event, resume_event) for t in tasks}
+            while pending:
+                done, pending = wait(pending, timeout=PROGRESS_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    error = future.exception() if not future.cancelled() else None
+                    if isinstance(error, DownloadCancelled):
+                        cancelled = True
+                    elif error:
+                        failures.append(error)
+                if cancel_event is not None and cancel_event.is_set() and not cancelled:
+                    # Drop queued tasks; running ones notice the event at their next chunk
+                    cancelled = True
+                    for future in pending:
+                        future.cancel()
+                if progress_callback:
+                    self._report(progress_callback, progress, status, len(tasks), total_bytes)
+
+        if cancelled:
+            print(f"[Installer] Download cancelled after {progress['files']}/{len(tasks)} files")
+            raise DownloadCancelled()
+        stats = {"files": progress["files"], "bytes": progress["bytes"], "seconds": time.perf_counter() - start}
+        if failures:
+            for e in failures[:5]:
+                print(f"[Installer] {e}")
+            raise DownloadError(f"{len(failures)} of {len(tasks)} file(s) failed to download")
+        return stats
+
+    def repair(self, version_data, plan, tasks, progress_callback=None):
+        """Re-download the given tasks of a plan, replacing corrupted copies in the shared store too."""
+        if self.store:
+            for task in tasks:
+                if task["sha1"]:
+                    self.store.evict(task["sha1"])
+        stats = self.download(tasks, progress_callback, status="Repairing")
+        self.adopt_into_store(tasks)
+        self.extract_natives(version_data, plan, force=any(t["kind"] == "native" for t in tasks))
+        return stats
+
+    # ─── Install ───
+    def resolve(self, version_id):
+        """Load the (inherited) version JSON and asset index and return (version_data, plan)."""
+        version_data = self._load_version_json(version_id)
+        if "inheritsFrom" in version_data:
+            version_data = inherit_json(version_data, self.minecraft_directory)
+        asset_index = self._load_asset_index(version_data)
+        return version_data, self.build_plan(version_data, asset_index)
+
+    def extract_natives(self, version_data, plan, force=False):
+        """Make sure the version's native jars are unpacked in the shared natives cache.
+        Returns the extraction folder."""
+        natives = [t for t in plan if t["kind"] == "native"]
+        return self.natives.ensure(natives, version_data["id"], force=force)
+
+    def natives_dir(self, version_id):
+        """Return the verified natives folder of an installed version, re-extracting it if needed.
+        Reads only the version JSON chain — no asset index."""
+        version_data = self._load_version_json(version_id)
+        if "inheritsFrom" in version_data:
+            version_data = inherit_json(version_data, self.minecraft_directory)
+        plan = [t for lib in version_data.get("libraries", []) for t in self._library_tasks(lib)]
+        return self.extract_natives(version_data, plan)
+
+    def install_version(self, version_id, progress_callback=None, cancel_event=None, resume_event=None):
+        """Install a vanilla (or inheriting) version.
+        Returns the stats {files, bytes, linked, linked_bytes, seconds}."""
+        json_path = self.version_json_path(version_id)
+        fresh_json = not os.path.exists(json_path)
+        try:
+            return self._install_version(version_id, progress_callback, cancel_event, resume_event)
+        except BaseException:
+            # The version JSON marks a version as installed — don't leave one behind
+            # for an install that never completed
+            if fresh_json and os.path.exists(json_path):
+                os.remove(json_path)
+            raise
+
+    def _install_version(self, version_id, progress_callback, cancel_event, resume_event):
+        start = time.perf_counter()
+        callback = progress_callback or (lambda text, value: None)
+
+        callback(f"Resolving {version_id}...", 0)
+        parent = self._load_version_json(version_id).get("inheritsFrom")
+        if parent:
+            self.install_version(parent, progress_callback, cancel_event, resume_event)
+
+        version_data, plan = self.resolve(version_id)
+        missing = [t for t in plan if self.needs_download(t)]
+        to_fetch, linked, linked_bytes = self.link_from_store(missing)
+        print(f"[Installer] {version_id}: {len(missing)} of {len(plan)} files missing, "
+              f"{linked} linked from the shared store")
+
+        stats = {"files": 0, "bytes": 0, "seconds": 0.0}
+        if to_fetch:
+            try:
+                stats = self.download(to_fetch, callback, status=f"Installing {version_id}:",
+                                      cancel_event=cancel_event, resume_event=resume_event)
+            except DownloadCancelled:
+                # Keep what finished so the next attempt only fetches the rest
+                self.adopt_into_store([t for t in to_fetch if not self.needs_download(t)])
+                raise
+            self.adopt_into_store(to_fetch)
+        stats["linked"] = linked
+        stats["linked_bytes"] = linked_bytes
+
+        self.extract_natives(version_data, plan)
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled()
+        if "javaVersion" in version_data:
+            callback(f"Installing Java runtime ({version_data['javaVersion']['component']})...", 100)
+            minecraft_launcher_lib.runtime.install_jvm_runtime(
+                version_data["javaVersion"]["component"], self.minecraft_directory
+            )
+
+        stats["seconds"] = time.perf_counter() - start
+        print(f"[Installer] {version_id} installed: {stats['files']} files, "
+              f"{stats['bytes'] / 1048576:.1f} MB downloaded, {linked_bytes / 1048576:.1f} MB linked "
+              f"in {stats['seconds']:.1f}s")
+        return stats
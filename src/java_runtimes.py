@@ -0,0 +1,180 @@
+"""
+Java runtime discovery and selection.
+
+The launcher scans the usual JDK locations and the Mojang runtime folders
+once per session and keeps the `java -version` result of every runtime
+it found, keyed on path and mtime, in ``qlauncher_java.json``. Picking a
+runtime for a version is then a lookup: the major version the version
+JSON asks for, or the closest newer one where that is safe. A launch
+never probes a known runtime again, and never starts a JVM that is bound
+to fail on the class file version.
+"""
+import os
+import sys
+import glob
+import json
+import shutil
+import threading
+from .jvm_tuning import parse_java_major, run_java
+
+# Versions whose JSON predates the javaVersion field all run on Java 8
+LEGACY_JAVA_MAJOR = 8
+
+JAVA_EXECUTABLE = "java.exe" if sys.platform == "win32" else "java"
+
+
+def is_compatible(required_major, major):
+    """Whether a runtime of major can run a version that asks for required_major.
+    Java 8 versions (LaunchWrapper, old Forge) break on 9+; later ones run on anything newer."""
+    if major is None:
+        return False
+    if required_major is None:
+        return True
+    if required_major <= LEGACY_JAVA_MAJOR:
+        return major == LEGACY_JAVA_MAJOR
+    return major >= required_major
+
+
+def _search_patterns(minecraft_directory):
+    """Glob patterns of java executables, as (source, pattern), Mojang runtimes first."""
+    exe = JAVA_EXECUTABLE
+    patterns = [
+        ("mojang", os.path.join(minecraft_directory, "runtime", "*", "*", "*", "bin", exe)),
+        ("mojang", os.path.join(minecraft_directory, "runtime", "*", "*", "*", "jre.bundle", "Contents", "Home", "bin", exe)),
+    ]
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA", "")
+        for base in filter(None, {os.environ.get("ProgramFiles"), os.environ.get("ProgramFiles(x86)"),
+                                  os.environ.get("ProgramW6432")}):
+            for vendor in ("Java", "Eclipse Adoptium", "Eclipse Foundation", "Microsoft", "Zulu",
+                           "BellSoft", "Amazon Corretto", "Semeru"):
+                patterns.append(("system", os.path.join(base, vendor, "*", "bin", exe)))
+            patterns.append(("mojang", os.path.join(base, "Minecraft Launcher", "runtime", "*", "*", "*", "bin", exe)))
+        if local:
+            patterns.append(("mojang", os.path.join(
+                local, "Packages", "Microsoft.4297127D64EC6_8wekyb3d8bbwe", "LocalCache", "Local",
+                "runtime", "*", "*", "*", "bin", exe)))
+    elif sys.platform == "darwin":
+        for base in ("/Library/Java/JavaVirtualMachines", os.path.expanduser("~/Library/Java/JavaVirtualMachines")):
+            patterns.append(("system", os.path.join(base, "*", "Contents", "Home", "bin", exe)))
+        patterns.append(("system", "/opt/homebrew/opt/openjdk*/bin/" + exe))
+        patterns.append(("system", "/usr/local/opt/openjdk*/bin/" + exe))
+    else:
+        for base in ("/usr/lib/jvm", "/usr/lib64/jvm", "/usr/java", "/opt", "/opt/java", os.path.expanduser("~/.jdks")):
+            patterns.append(("system", os.path.join(base, "*", "bin", exe)))
+        patterns.append(("system", os.path.expanduser("~/.sdkman/candidates/java/*/bin/" + exe)))
+    return patterns
+
+
+class JavaRegistry:
+    """Known Java runtimes with their major versions, probed once per (path, mtime)."""
+
+    def __init__(self, cache_file, minecraft_directory):
+        self.cache_file = cache_file
+        self.minecraft_directory = minecraft_directory
+        self.records = {}
+        self._found = None  # {path: source} of this session's scan
+        self._lock = threading.RLock()
+        self._load()
+
+    def _load(self):
+        """Load cached probe results from disk."""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
+                    self.records = json.load(f)
+        except Exception as e:
+            print(f"[Java] Error loading cache: {e}")
+            self.records = {}
+
+    def _save(self):
+        """Save cached probe results to disk."""
+        try:
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.records, f, indent=1)
+            os.replace(tmp, self.cache_file)
+        except Exception as e:
+            print(f"[Java] Error saving cache: {e}")
+
+    def _probe(self, java):
+        """Return the record of an executable path, running `java -version` only if it is new or changed.
+        Returns None if the path doesn't exist."""
+        try:
+            mtime = os.stat(java).st_mtime_ns
+        except OSError:
+            return None
+        record = self.records.get(java)
+        if record and record.get("mtime") == mtime:
+            return record
+        code, output = run_java(java, ["-version"])
+        major = parse_java_major(output) if code == 0 else None
+        lines = output.strip().splitlines()
+        record = {"mtime": mtime, "major": major, "version": lines[0].strip() if code == 0 and lines else None}
+        self.records[java] = record
+        self._save()
+        print(f"[Java] {java}: {record['version'] or 'not runnable'}")
+        return record
+
+    def _scan(self):
+        """Collect candidate executables: Mojang runtimes, JAVA_HOME, PATH and the usual JDK folders."""
+        found = {}
+
+        def add(path, source):
+            path = os.path.realpath(path)
+            if os.path.isfile(path) and path not in found:
+                found[path] = source
+
+        for source, pattern in _search_patterns(self.minecraft_directory)[:2]:
+            for path in glob.glob(pattern):
+                add(path, source)
+        java_home = os.environ.get("JAVA_HOME")
+        if java_home:
+            add(os.path.join(java_home, "bin", JAVA_EXECUTABLE), "system")
+        on_path = shutil.which("java")
+        if on_path:
+            add(on_path, "system")
+        for source, pattern in _search_patterns(self.minecraft_directory)[2:]:
+            for path in glob.glob(pattern):
+                add(path, source)
+        return found
+
+    def runtimes(self, rescan=False):
+        """Return the runnable runtimes as dicts of path, major, version and source ("mojang" or "system").
+        The file system is scanned once per session unless rescan is set."""
+        with self._lock:
+            if self._found is None or rescan:
+                self._found = self._scan()
+            result = []
+            for path, source in self._found.items():
+                record = self._probe(path)
+                if record and record["major"] is not None:
+                    result.append({"path": path, "major": record["major"], "version": record["version"],
+                                   "source": source})
+            # Forget runtimes that were uninstalled so the cache doesn't grow forever
+            stale = [path for path in self.records if path not in self._found and not os.path.exists(path)]
+            if stale:
+                for path in stale:
+                    del self.records[path]
+                self._save()
+            return result
+
+    def major(self, java):
+        """Return the major version of an executable (a path, or a bare name looked up on PATH),
+        or None if it can't be run."""
+        path = java if os.path.isabs(java) else shutil.which(java)
+        if not path:
+            return None
+        with self._lock:
+            record = self._probe(path)
+        return record["major"] if record else None
+
+    def pick(self, required_major):
+        """Return the path of the best runtime for a version asking for required_major, or None.
+        An exact major wins, then the nearest newer compatible one; Mojang runtimes win ties."""
+        candidates = [r for r in self.runtimes() if is_compatible(required_major, r["major"])]
+        if not candidates:
+            return None
+        required = required_major or 0
+        best = min(candidates, key=lambda r: (r["major"] - required, r["source"] != "mojang", r["path"]))
+        return best["path"]
@@ -0,0 +1,243 @@
+"""
+Hardware-aware JVM tuning profiles.
+
+A profile turns (max memory, core count, total RAM, Java major version)
+into a set of JVM flags — heap floor, collector, pause targets, GC thread
+counts and transparent huge pages. Flags are checked against the Java
+executable that will run the game before they are used; the result is
+cached per (executable, mtime) so a launch pays for the check once.
+"""
+import os
+import re
+import sys
+import json
+import ctypes
+import threading
+import subprocess
+
+DEFAULT_PROFILE = "default"
+
+PROFILES = {
+    "default": "JVM defaults",
+    "g1": "G1 low-pause",
+    "zgc": "ZGC generational",
+    "throughput": "Throughput (Parallel GC)",
+}
+
+# Java the bundled runtime of current releases ships with — used when the version is unknown
+DEFAULT_JAVA_MAJOR = 21
+
+# Flags every HotSpot accepts that would make a probe commit and touch the whole heap — never probed
+UNPROBED_FLAGS = ("-Xms", "-XX:+AlwaysPreTouch")
+
+_CREATE_NO_WINDOW = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+
+def total_memory_mb():
+    """Return the physical memory of this machine in MB, or None if it can't be read."""
+    try:
+        if sys.platform == "win32":
+            class MemoryStatus(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+            status = MemoryStatus()
+            status.dwLength = ctypes.sizeof(MemoryStatus)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys // 1048576
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 1048576
+    except (AttributeError, ValueError, OSError):
+        return None
+
+
+def detect_hardware():
+    """Return {"cores", "total_ram_mb"} for this machine."""
+    return {"cores": os.cpu_count() or 2, "total_ram_mb": total_memory_mb()}
+
+
+def parse_java_major(version_output):
+    """Extract the major version from `java -version` output: "1.8.0_392" → 8, "21.0.2" → 21."""
+    match = re.search(r'version "(\d+)(?:\.(\d+))?', version_output)
+    if not match:
+        return None
+    major = int(match.group(1))
+    if major == 1 and match.group(2):
+        return int(match.group(2))
+    return major
+
+
+def run_java(java, args):
+    """Run java with args. Returns (exit code, combined output)."""
+    try:
+        result = subprocess.run(
+            [java, *args], capture_output=True, text=True, timeout=15,
+            creationflags=_CREATE_NO_WINDOW,
+        )
+        return result.returncode, result.stdout + result.stderr
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return -1, str(e)
+
+
+def build_flags(profile, max_memory, cores, total_ram_mb=None, java_major=DEFAULT_JAVA_MAJOR, platform=sys.platform):
+    """Return the JVM flags of a profile, ending with -Xmx. Unknown profiles give just -Xmx."""
+    xmx = f"-Xmx{max_memory}M"
+    if profile not in PROFILES or profile == DEFAULT_PROFILE:
+        return [xmx]
+    if profile == "zgc" and java_major < 21:
+        # Generational ZGC arrived in Java 21 — older runtimes get the G1 profile
+        profile = "g1"
+
+    # Keep a core or two free for the render and server threads
+    gc_threads = max(1, cores - 2) if cores > 2 else 1
+    conc_threads = max(1, gc_threads // 4)
+    # Commit the whole heap up front unless that would crowd the rest of the machine
+    roomy = total_ram_mb is None or max_memory * 2 <= total_ram_mb
+    xms = f"-Xms{max_memory}M" if roomy else f"-Xms{max_memory // 2}M"
+
+    if profile == "g1":
+        large_heap = max_memory >= 12288
+        flags = [
+            xms,
+            "-XX:+UseG1GC",
+            "-XX:+ParallelRefProcEnabled",
+            "-XX:MaxGCPauseMillis=50",
+            "-XX:+UnlockExperimentalVMOptions",
+            "-XX:+DisableExplicitGC",
+            f"-XX:G1NewSizePercent={40 if large_heap else 30}",
+            f"-XX:G1MaxNewSizePercent={50 if large_heap else 40}",
+            f"-XX:G1HeapRegionSize={16 if large_heap else 8}M",
+            f"-XX:G1ReservePercent={15 if large_heap else 20}",
+            "-XX:G1HeapWastePercent=5",
+            "-XX:G1MixedGCCountTarget=4",
+            f"-XX:InitiatingHeapOccupancyPercent={20 if large_heap else 15}",
+            "-XX:G1MixedGCLiveThresholdPercent=90",
+            "-XX:G1RSetUpdatingPauseTimePercent=5",
+            "-XX:SurvivorRatio=32",
+            "-XX:MaxTenuringThreshold=1",
+            f"-XX:ParallelGCThreads={gc_threads}",
+            f"-XX:ConcGCThreads={conc_threads}",
+        ]
+        if roomy:
+            flags.append("-XX:+AlwaysPreTouch")
+    elif profile == "zgc":
+        flags = [xms, "-XX:+UseZGC"]
+        if java_major < 23:
+            # Generational mode is the default (and the only mode) from Java 23 on
+            flags.append("-XX:+ZGenerational")
+        flags.append(f"-XX:ConcGCThreads={conc_threads}")
+    else:
+        flags = [
+            xms,
+            "-XX:+UseParallelGC",
+            f"-XX:ParallelGCThreads={gc_threads}",
+        ]
+        if roomy:
+            flags.append("-XX:+AlwaysPreTouch")
+
+    flags.append("-XX:+PerfDisableSharedMem")
+    if platform.startswith("linux"):
+        flags.append("-XX:+UseTransparentHugePages")
+    flags.append(xmx)
+    return flags
+
+
+class JvmTuner:
+    """Builds validated tuning flags for a Java executable, caching probes per (path, mtime).
+    Major versions come from runtimes (a JavaRegistry), which keeps its own probe cache."""
+
+    def __init__(self, cache_file, runtimes):
+        self.cache_file = cache_file
+        self.runtimes = runtimes
+        self.records = {}
+        self._hardware = None
+        self._lock = threading.RLock()  # the Settings preview and launches may probe at the same time
+        self._load()
+
+    def _load(self):
+        """Load cached probe results from disk."""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
+                    self.records = json.load(f)
+        except Exception as e:
+            print(f"[JvmTuner] Error loading cache: {e}")
+            self.records = {}
+
+    def _save(self):
+        """Save cached probe results to disk."""
+        try:
+            with open(self.cache_file, "w") as f:
+                json.dump(self.records, f)
+        except Exception as e:
+            print(f"[JvmTuner] Error saving cache: {e}")
+
+    @property
+    def hardware(self):
+        if self._hardware is None:
+            self._hardware = detect_hardware()
+        return self._hardware
+
+    def _record(self, java):
+        """Return the cache record of a Java executable, resetting it when the file changed."""
+        try:
+            mtime = os.stat(java).st_mtime_ns
+        except OSError:
+            mtime = None  # bare "java" from PATH
+        record = self.records.get(java)
+        if not record or record.get("mtime") != mtime:
+            record = {"mtime": mtime, "flags": {}}
+            self.records[java] = record
+        return record
+
+    def java_major(self, java):
+        """Return the major version of a Java executable, or None if it can't be run."""
+        return self.runtimes.major(java)
+
+    def validate(self, java, flags):
+        """Return the subset of flags the Java executable accepts."""
+        with self._lock:
+            return self._validate(java, flags)
+
+    def _validate(self, java, flags):
+        record = self._record(java)
+        key = " ".join(flags)
+        if key in record["flags"]:
+            return record["flags"][key]
+
+        probed = [f for f in flags if not f.startswith(UNPROBED_FLAGS)]
+        code, _ = run_java(java, [*probed, "-version"])
+        if code == 0:
+            accepted = list(flags)
+        elif self.java_major(java) is None:
+            # Not a runnable Java at all — nothing to validate against, launching will report it
+            return list(flags)
+        else:
+            # Probe one flag at a time; experimental flags need the unlock flag in front, and
+            # heap-sizing flags the -Xmx they are checked against
+            unlock = [f for f in probed if f.startswith("-XX:+Unlock")]
+            heap = [f for f in probed if f.startswith("-Xmx")]
+            accepted = []
+            for flag in flags:
+                if (flag not in probed or flag in unlock or flag in heap
+                        or run_java(java, [*unlock, *heap, flag, "-version"])[0] == 0):
+                    accepted.append(flag)
+                else:
+                    print(f"[JvmTuner] {java} rejects {flag}, leaving it out")
+        record["flags"][key] = accepted
+        self._save()
+        return accepted
+
+    def flags_for(self, profile, max_memory, java, java_major=None):
+        """Return validated flags of a profile for the given Java executable.
+        java_major (e.g. from the version JSON) saves probing the executable for it."""
+        if profile not in PROFILES or profile == DEFAULT_PROFILE:
+            return build_flags(DEFAULT_PROFILE, max_memory, 0)
+        if java_major is None:
+            java_major = self.java_major(java) or DEFAULT_JAVA_MAJOR
+        hardware = self.hardware
+        flags = build_flags(profile, max_memory, hardware["cores"], hardware["total_ram_mb"], java_major)
+        return self.validate(java, flags)
@@ -0,0 +1,107 @@
+"""
+Launch fingerprint cache — the fast path for repeat launches.
+
+A resolved launch command is stored together with a fingerprint of
+everything that went into it: the bytes of the version JSON chain, the
+loader version id, the launch settings and the game directory. When the
+fingerprint still matches on the next Play, installation checks, loader
+resolution and classpath construction are skipped entirely.
+"""
+import os
+import json
+import uuid
+import hashlib
+import threading
+
+# Per-launch values are stored as tokens and filled in when the command is handed out
+USERNAME_TOKEN = "__QLAUNCHER_USERNAME__"
+UUID_TOKEN = "__QLAUNCHER_UUID__"
+
+
+class LaunchCache:
+    """Persistent map of (version, loader, game dir) → fingerprinted launch command."""
+
+    def __init__(self, minecraft_directory):
+        self.minecraft_directory = minecraft_directory
+        self.cache_file = os.path.join(minecraft_directory, "qlauncher_launch_cache.json")
+        self.records = {}
+        self._lock = threading.Lock()  # launches of different profiles finish on their own threads
+        self._load()
+
+    def _load(self):
+        """Load cached commands from disk."""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r") as f:
+                    self.records = json.load(f)
+        except Exception as e:
+            print(f"[LaunchCache] Error loading cache: {e}")
+            self.records = {}
+
+    def _save(self):
+        """Save cached commands to disk (temp file + rename, so a crash never leaves half a file).
+        Called with the lock held."""
+        try:
+            tmp = f"{self.cache_file}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.records, f)
+            os.replace(tmp, self.cache_file)
+        except Exception as e:
+            print(f"[LaunchCache] Error saving cache: {e}")
+
+    @staticmethod
+    def key(version_id, modloader, game_dir):
+        return f"{version_id}|{modloader}|{game_dir or ''}"
+
+    def fingerprint(self, launch_version_id, settings, game_dir):
+        """Hash the version JSON chain, loader id, settings and game dir.
+        Returns None if a version JSON in the chain is missing."""
+        digest = hashlib.sha1()
+        current = launch_version_id
+        while current:
+            path = os.path.join(self.minecraft_directory, "versions", current, f"{current}.json")
+            try:
+                with open(path, "rb") as f:
+                    raw = f.read()
+            except FileNotFoundError:
+                return None
+            digest.update(hashlib.sha1(raw).digest())
+            current = json.loads(raw).get("inheritsFrom")
+
+        digest.update(launch_version_id.encode())
+        digest.update(json.dumps(settings, sort_keys=True).encode())
+        digest.update((game_dir or "").encode())
+        return digest.hexdigest()
+
+    def match(self, key, settings, game_dir, launch_version_id=None):
+        """Return the cached record for key if its fingerprint still holds, else None.
+        With launch_version_id, a record built for a different loader build also misses."""
+        record = self.records.get(key)
+        if not record:
+            return None
+        if launch_version_id is not None and record["launch_version_id"] != launch_version_id:
+            return None
+        if self.fingerprint(record["launch_version_id"], settings, game_dir) != record["fingerprint"]:
+            return None
+        return record
+
+    def remember(self, key, launch_version_id, settings, game_dir, command, prepare_seconds, natives_dir=None):
+        """Store a freshly resolved command template for key, with the natives folder it points at."""
+        fingerprint = self.fingerprint(launch_version_id, settings, game_dir)
+        if fingerprint is None:
+            return
+        with self._lock:
+            self.records[key] = {
+                "launch_version_id": launch_version_id,
+                "fingerprint": fingerprint,
+                "command": command,
+                "prepare_seconds": prepare_seconds,
+                "natives_dir": natives_dir,
+            }
+            self._save()
+
+    @staticmethod
+    def personalise(command, username):
+        """Fill the per-launch tokens of a cached command template."""
+        player_uuid = str(uuid.uuid4())
+        return [arg.replace(USERNAME_TOKEN, username).replace(UUID_TOKEN, player_uuid) for arg in command]
@@ -0,0 +1,169 @@
+"""
+Per-profile launch timing history.
+
+Every launch leaves one entry: the duration of each launch stage, the
+process spawn, the first line the game logged and the point the title
+screen is up (STARTUP_MARKER in the game log), together with the context
+the launch ran in — the launched version, a hash of the launch settings
+and a hash of the mods folder. Consecutive launches with the same context
+form a run; comparing the latest run with the one before it shows which
+spans got slower after a mod, setting or version change.
+"""
+import os
+import json
+import time
+import hashlib
+import statistics
+from .mods_folder import mods_digest
+from .launch_pipeline import STAGE_LABELS
+
+HISTORY = 30
+
+# Logged once the title screen is about to appear — the end of game startup
+STARTUP_MARKER = "Sound engine started"
+
+# Spans in display order; the game spans are measured from the moment the process is started
+SPANS = ["load_settings", "resolve", "install_vanilla", "install_loader", "build_command",
+         "spawn", "first_output", "game_ready"]
+GAME_SPANS = ["spawn", "first_output", "game_ready"]
+
+SPAN_LABELS = dict(STAGE_LABELS, first_output="First log line", game_ready="Title screen")
+
+# A span regressed if its median grew by this much — relative and absolute, so noise in tiny spans doesn't count
+REGRESSION_RATIO = 1.2
+REGRESSION_MIN_SECONDS = 0.1
+
+
+def launch_context(launch_version_id, settings, game_dir):
+    """Describe what a launch ran with: version, and short hashes of the settings and mods folder."""
+    mods = hashlib.sha1()
+    mod_count = 0
+    if game_dir:
+        mod_count = mods_digest(mods, os.path.join(game_dir, "mods"))
+    return {
+        "version": launch_version_id,
+        "settings": hashlib.sha1(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:10],
+        "mods": mods.hexdigest()[:10],
+        "mod_count": mod_count,
+    }
+
+
+def _describe_change(before, after):
+    """Human-readable difference between two launch contexts."""
+    changes = []
+    if before["version"] != after["version"]:
+        changes.append(f"version {before['version']} → {after['version']}")
+    if before["mods"] != after["mods"]:
+        changes.append(f"mods changed ({before['mod_count']} → {after['mod_count']} files)")
+    if before["settings"] != after["settings"]:
+        changes.append("launch settings changed")
+    return ", ".join(changes) or "no change"
+
+
+class LaunchHistory:
+    """Launch timings per profile, kept in a small JSON file."""
+
+    def __init__(self, history_file):
+        self.history_file = history_file
+        self.profiles = {}
+        self._load()
+
+    def _load(self):
+        """Load the history from disk."""
+        try:
+            if os.path.exists(self.history_file):
+                with open(self.history_file, "r") as f:
+                    self.profiles = json.load(f)
+        except Exception as e:
+            print(f"[LaunchHistory] Error loading history: {e}")
+            self.profiles = {}
+
+    def _save(self):
+        """Save the history to disk."""
+        try:
+            tmp = self.history_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.profiles, f)
+            os.replace(tmp, self.history_file)
+        except Exception as e:
+            print(f"[LaunchHistory] Error saving history: {e}")
+
+    def record(self, profile_key, context, spans, fast_path=False):
+        """Append one launch of a profile. spans maps span names to seconds; unknown names are dropped."""
+        entry = {
+            "time": time.time(),
+            "context": context,
+            "fast_path": fast_path,
+            "spans": {name: round(seconds, 4) for name, seconds in spans.items() if name in SPANS},
+        }
+        entries = self.profiles.setdefault(profile_key, [])
+        entries.append(entry)
+        del entries[:-HISTORY]
+        self._save()
+        return entry
+
+    def entries(self, profile_key):
+        return self.profiles.get(profile_key, [])
+
+    def _runs(self, profile_key):
+        """Split a profile's entries into runs of consecutive launches with the same context."""
+        runs = []
+        for entry in self.entries(profile_key):
+            if runs and runs[-1][0]["context"] == entry["context"]:
+                runs[-1].append(entry)
+            else:
+                runs.append([entry])
+        return runs
+
+    def regressions(self, profile_key):
+        """Compare the latest run with the run before it.
+        Returns (change description, [(span, median before, median after)]) of the spans that got
+        slower, or None if the context never changed."""
+        runs = self._runs(profile_key)
+        if len(runs) < 2:
+            return None
+        before, after = runs[-2], runs[-1]
+        # The first launch after a change always misses the fast path — compare launcher stages like for like
+        mode = after[-1]["fast_path"]
+        slower = []
+        for span in SPANS:
+            def like(entry):
+                return span in entry["spans"] and (span in GAME_SPANS or entry["fast_path"] == mode)
+            old = [e["spans"][span] for e in before if like(e)]
+            new = [e["spans"][span] for e in after if like(e)]
+            if not old or not new:
+                continue
+            old_median, new_median = statistics.median(old), statistics.median(new)
+            if new_median > old_median * REGRESSION_RATIO and new_median - old_median > REGRESSION_MIN_SECONDS:
+                slower.append((span, old_median, new_median))
+        return _describe_change(before[0]["context"], after[0]["context"]), slower
+
+    def report(self, profile_key, limit=10):
+        """Text table of the latest launches of a profile, followed by the regression check."""
+        entries = self.entries(profile_key)[-limit:]
+        if not entries:
+            return "No launches recorded yet."
+        width = max(len(SPAN_LABELS[s]) for s in SPANS)
+        lines = ["Launch timings (ms), newest last" + (" — * fast path" if any(e["fast_path"] for e in entries) else "")]
+        lines.append(" " * width + "".join(
+            f"{time.strftime('%d %H:%M', time.localtime(e['time'])):>13}{'*' if e['fast_path'] else ' '}"
+            for e in entries))
+        for span in SPANS:
+            cells = "".join(
+                f"{e['spans'][span] * 1000:>13.0f} " if span in e["spans"] else f"{'-':>13} " for e in entries
+            )
+            lines.append(f"{SPAN_LABELS[span]:<{width}}{cells}")
+
+        result = self.regressions(profile_key)
+        lines.append("")
+        if result is None:
+            lines.append("No mod, setting or version change in the recorded launches.")
+        else:
+            change, slower = result
+            lines.append(f"Since the last change ({change}):")
+            if not slower:
+                lines.append("  no span got slower")
+            for span, old, new in slower:
+                growth = f" (+{(new - old) * 100 / old:.0f}%)" if old else ""
+                lines.append(f"  {SPAN_LABELS[span]}: {old * 1000:.0f} ms → {new * 1000:.0f} ms{growth}")
+        return "\n".join(lines)
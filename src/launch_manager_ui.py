@@ -0,0 +1,150 @@
+"""
+Launch manager panel — one console tab per running game instance.
+
+Several profiles can run side by side. Each launch asks RamScheduler for
+the heap in its command; while the running heaps would exceed the RAM
+budget (a share of physical RAM, set in the settings) a launch waits in
+its tab and starts once enough instances have exited.
+"""
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTabWidget
+from PyQt5.QtCore import Qt, pyqtSignal
+from .console_ui import ConsolePanel, FONT, C_GREEN
+from .launch_scheduler import RamScheduler, xmx_mb
+
+
+class LaunchManagerPanel(QWidget):
+    """Tabs of game consoles, started as the RAM budget allows."""
+    closed = pyqtSignal()
+    activity_changed = pyqtSignal(int, int)   # running, waiting
+
+    def __init__(self, budget_percent, parent=None):
+        super().__init__(parent)
+        self.scheduler = RamScheduler(budget_percent)
+        self._consoles = {}     # scheduler key → ConsolePanel
+        self._next_key = 0
+        self.setAttribute(Qt.WA_StyledBackground, True)
+        self.setObjectName("launchRoot")
+        self.setStyleSheet(f"""
+            QWidget#launchRoot {{
+                background-color: rgba(8, 8, 8, 0.95);
+                color: #e8e8e8;
+                font-family: {FONT};
+            }}
+            QTabWidget::pane {{
+                border: none;
+            }}
+            QTabBar::tab {{
+                background: rgba(255,255,255,0.05);
+                color: rgba(255,255,255,0.6);
+                padding: 8px 14px;
+                margin-right: 4px;
+                border-top-left-radius: 8px;
+                border-top-right-radius: 8px;
+            }}
+            QTabBar::tab:selected {{
+                background: rgba(255,255,255,0.12);
+                color: white;
+            }}
+        """)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 16, 20, 16)
+        layout.setSpacing(8)
+
+        header = QHBoxLayout()
+        title = QLabel("Running Instances")
+        title.setStyleSheet("font-size: 18px; font-weight: 700; color: white;")
+        header.addWidget(title)
+        header.addStretch()
+        self.budget_label = QLabel()
+        self.budget_label.setStyleSheet(f"color: {C_GREEN}; font-size: 12px; font-weight: 600;")
+        header.addWidget(self.budget_label)
+
+        back_btn = QPushButton("← Geri")
+        back_btn.setCursor(Qt.PointingHandCursor)
+        back_btn.setStyleSheet("""
+            QPushButton {
+                background-color: rgba(255,255,255,0.06);
+                border: 1px solid rgba(255,255,255,0.08);
+                border-radius: 8px;
+                color: white;
+                padding: 8px 18px;
+                font-weight: 600;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255,255,255,0.10);
+                border: 1px solid rgba(255,255,255,0.15);
+            }
+        """)
+        back_btn.clicked.connect(lambda: self.closed.emit())
+        header.addWidget(back_btn)
+        layout.addLayout(header)
+
+        self.tabs = QTabWidget()
+        self.tabs.setTabsClosable(True)
+        self.tabs.tabCloseRequested.connect(self._close_tab)
+        layout.addWidget(self.tabs)
+        self._update_budget()
+
+    def add_launch(self, command, title, default_heap_mb, setup=None):
+        """Open a console tab for a prepared launch and start it as soon as the RAM budget allows.
+        setup(console) runs first, so it can connect to the console's signals before the game starts."""
+        key = self._next_key
+        self._next_key += 1
+        console = ConsolePanel(command, self, title=title, start=False)
+        console.close_btn.setText("✕ Close")
+        console.closed.connect(lambda: self._close_tab(self.tabs.indexOf(console)))
+        console.runner.finished_signal.connect(lambda exit_code: self._release(key))
+        console.cancelled.connect(lambda: self._release(key))
+        self._consoles[key] = console
+        self.tabs.addTab(console, title)
+        self.tabs.setCurrentWidget(console)
+        if setup:
+            setup(console)
+
+        heap = xmx_mb(command, default_heap_mb)
+        if self.scheduler.submit(key, heap):
+            console.start()
+        else:
+            console.append_system(f"[QLauncher] Waiting for RAM: this instance needs {heap} MB. "
+                                   f"{self.scheduler.describe()}.")
+        self._update_budget()
+        return console
+
+    def set_budget_percent(self, percent):
+        self._start(self.scheduler.set_budget_percent(percent))
+        self._update_budget()
+
+    def _release(self, key):
+        self._start(self.scheduler.release(key))
+        self._update_budget()
+
+    def _start(self, keys):
+        for key in keys:
+            console = self._consoles.get(key)
+            if console:
+                console.append_system("[QLauncher] RAM budget available — starting.")
+                console.start()
+
+    def _close_tab(self, index):
+        console = self.tabs.widget(index)
+        if console is None or not console.done:
+            # Kill or cancel the instance first — closing the tab must not orphan a running game
+            return
+        self.tabs.removeTab(index)
+        for key, known in list(self._consoles.items()):
+            if known is console:
+                del self._consoles[key]
+        console.deleteLater()
+        self._update_budget()
+
+    def running(self):
+        """(running, waiting) instances."""
+        running = sum(1 for c in self._consoles.values() if c.started and not c.done)
+        waiting = sum(1 for c in self._consoles.values() if not c.started and not c.done)
+        return running, waiting
+
+    def _update_budget(self):
+        self.budget_label.setText(self.scheduler.describe())
+        self.activity_changed.emit(*self.running())
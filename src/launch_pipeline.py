@@ -0,0 +1,61 @@
+"""
+Stage bookkeeping for the launch pipeline.
+
+A launch runs through fixed stages — load settings, resolve, install
+vanilla, install loader, build command, spawn. LaunchStages times each one, reports it to
+an optional stage callback and is the point where a pending cancel request
+turns into LaunchCancelled. It has no Qt dependency, so the same pipeline
+drives the GUI worker thread and headless callers.
+"""
+import time
+
+STAGES = ["load_settings", "resolve", "install_vanilla", "install_loader", "build_command", "spawn"]
+
+STAGE_LABELS = {
+    "load_settings": "Loading settings",
+    "resolve": "Resolving",
+    "install_vanilla": "Installing Minecraft",
+    "install_loader": "Installing modloader",
+    "build_command": "Building launch command",
+    "spawn": "Starting game",
+}
+
+
+class LaunchCancelled(Exception):
+    """Raised when a launch is cancelled between or during stages."""
+
+
+class LaunchStages:
+    """Times the stages of one launch and reports them as (stage, state, seconds)."""
+
+    def __init__(self, stage_callback=None, cancel_event=None):
+        self.stage_callback = stage_callback
+        self.cancel_event = cancel_event
+        self.timings = {}
+        self._current = None
+        self._started = 0.0
+
+    def check_cancelled(self):
+        """Raise LaunchCancelled if cancellation was requested."""
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise LaunchCancelled()
+
+    def begin(self, stage):
+        """Finish the running stage (if any) and start the next one."""
+        self.finish()
+        self.check_cancelled()
+        self._current = stage
+        self._started = time.perf_counter()
+        if self.stage_callback:
+            self.stage_callback(stage, "started", 0.0)
+
+    def finish(self):
+        """Close the running stage and record its duration."""
+        if self._current is None:
+            return
+        seconds = time.perf_counter() - self._started
+        self.timings[self._current] = seconds
+        print(f"[Launch] {STAGE_LABELS.get(self._current, self._current)}: {seconds * 1000:.0f} ms")
+        if self.stage_callback:
+            self.stage_callback(self._current, "finished", seconds)
+        self._current = None
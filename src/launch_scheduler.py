@@ -0,0 +1,103 @@
+"""
+RAM budget for running several game instances side by side.
+
+Each launch asks for its maximum heap (the -Xmx of its command). Launches
+are admitted while the heaps of everything running fit a share of the
+machine's physical RAM; the rest wait in order and are admitted as running
+instances exit. A launch is always admitted when nothing else runs, so a
+heap bigger than the whole budget still starts on its own.
+
+Qt-free: the launch manager panel drives it from the UI thread.
+"""
+import re
+import threading
+from collections import OrderedDict
+from .jvm_tuning import total_memory_mb
+
+# Share of physical RAM the game heaps may take together, when the settings don't say
+DEFAULT_BUDGET_PERCENT = 75
+# Physical RAM assumed when it can't be read
+FALLBACK_RAM_MB = 8192
+
+_XMX = re.compile(r"^-Xmx(\d+)([kKmMgG]?)$")
+
+
+def xmx_mb(command, default=None):
+    """Maximum heap in MB requested by a launch command (the last -Xmx wins, as in the JVM)."""
+    heap = default
+    for arg in command:
+        match = _XMX.match(arg)
+        if match:
+            value, unit = int(match.group(1)), match.group(2).lower()
+            heap = {"k": value // 1024, "m": value, "g": value * 1024}.get(unit, value // 1048576)
+    return heap
+
+
+class RamScheduler:
+    """Admits launches while the sum of their heaps fits budget_percent of physical RAM."""
+
+    def __init__(self, budget_percent=DEFAULT_BUDGET_PERCENT, total_ram_mb=None):
+        self.total_ram_mb = total_ram_mb or total_memory_mb() or FALLBACK_RAM_MB
+        self.budget_percent = budget_percent
+        self._running = {}               # key → heap MB
+        self._queue = OrderedDict()      # key → heap MB, in submission order
+        self._lock = threading.Lock()
+
+    @property
+    def budget_mb(self):
+        return self.total_ram_mb * self.budget_percent // 100
+
+    def used_mb(self):
+        with self._lock:
+            return sum(self._running.values())
+
+    def queued(self):
+        with self._lock:
+            return list(self._queue)
+
+    def _fits(self, heap):
+        return not self._running or sum(self._running.values()) + heap <= self.budget_mb
+
+    def submit(self, key, heap_mb):
+        """Ask to run key with a heap of heap_mb. Returns True if it may start now, False if it was queued."""
+        with self._lock:
+            # Nobody jumps the queue — a small heap waits behind a big one
+            if not self._queue and self._fits(heap_mb):
+                self._running[key] = heap_mb
+                return True
+            self._queue[key] = heap_mb
+            return False
+
+    def release(self, key):
+        """key stopped running (or gave up waiting). Returns the keys admitted in its place, in order."""
+        with self._lock:
+            self._running.pop(key, None)
+            self._queue.pop(key, None)
+            return self._admit()
+
+    def set_budget_percent(self, percent):
+        """Change the budget; returns the keys a bigger budget admitted."""
+        with self._lock:
+            self.budget_percent = percent
+            return self._admit()
+
+    def _admit(self):
+        admitted = []
+        while self._queue:
+            key, heap = next(iter(self._queue.items()))
+            if not self._fits(heap):
+                break
+            del self._queue[key]
+            self._running[key] = heap
+            admitted.append(key)
+        return admitted
+
+    def describe(self):
+        """One-line summary for the launch manager: heaps in use against the budget, and the queue."""
+        with self._lock:
+            used = sum(self._running.values())
+            text = (f"RAM budget: {used} / {self.budget_mb} MB ({self.budget_percent}% of "
+                    f"{self.total_ram_mb} MB) — {len(self._running)} running")
+            if self._queue:
+                text += f", {len(self._queue)} waiting for {sum(self._queue.values())} MB"
+            return text
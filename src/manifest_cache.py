@@ -0,0 +1,89 @@
+"""
+On-disk cache of Mojang's version manifest.
+
+The manifest is stored together with its ETag / Last-Modified validators,
+so the launcher can show versions instantly from disk and revalidate with
+a conditional request that usually comes back as a bodyless 304.
+"""
+import os
+import json
+from .http_client import get_client
+
+MANIFEST_URL = "https://launchermeta.mojang.com/mc/game/version_manifest_v2.json"
+
+
+class ManifestCache:
+    """Version manifest stored on disk and revalidated with If-None-Match / If-Modified-Since."""
+
+    def __init__(self, cache_file, url=MANIFEST_URL, timeout=10):
+        self.cache_file = cache_file
+        self.url = url
+        self.timeout = timeout
+        self.etag = None
+        self.last_modified = None
+        self.manifest = None
+        self._load()
+
+    def _load(self):
+        """Load the cached manifest and validators from disk."""
+        try:
+            if os.path.exists(self.cache_file):
+                with open(self.cache_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self.etag = data.get("etag")
+                self.last_modified = data.get("last_modified")
+                self.manifest = data.get("manifest")
+        except Exception as e:
+            print(f"[ManifestCache] Error loading cache: {e}")
+            self.manifest = None
+
+    def _save(self):
+        """Write the manifest atomically so a crash never leaves a truncated cache."""
+        try:
+            data = {"etag": self.etag, "last_modified": self.last_modified, "manifest": self.manifest}
+            tmp = self.cache_file + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_file)
+        except Exception as e:
+            print(f"[ManifestCache] Error saving cache: {e}")
+
+    def cached(self):
+        """Return the cached manifest without touching the network (None if never fetched)."""
+        return self.manifest
+
+    def revalidate(self, session=None):
+        """Conditionally refetch the manifest. Returns (manifest, changed).
+        Network errors propagate so callers can fall back to cached()."""
+        headers = {}
+        if self.manifest is not None:
+            if self.etag:
+                headers["If-None-Match"] = self.etag
+            if self.last_modified:
+                headers["If-Modified-Since"] = self.last_modified
+
+        r = (session or get_client()).get(self.url, headers=headers, timeout=self.timeout)
+        if r.status_code == 304 and self.manifest is not None:
+            return self.manifest, False
+        r.raise_for_status()
+
+        manifest = r.json()
+        changed = manifest != self.manifest
+        self.manifest = manifest
+        self.etag = r.headers.get("ETag")
+        self.last_modified = r.headers.get("Last-Modified")
+        self._save()
+        return manifest, changed
+
+    def find(self, version_id, session=None):
+        """Return the manifest entry for a version, revalidating once if it isn't cached yet."""
+        entry = self._find_in(self.manifest, version_id)
+        if entry is None:
+            manifest, _ = self.revalidate(session)
+            entry = self._find_in(manifest, version_id)
+        return entry
+
+    def _find_in(self, manifest, version_id):
+        if not manifest:
+            return None
+        return next((v for v in manifest.get("versions", []) if v["id"] == version_id), None)
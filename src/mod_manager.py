@@ -1,6 +1,6 @@
-import requests
 import os
 import json
+from .http_client import get_client
 
 
 class ModrinthBackend:
@@ -11,9 +11,10 @@ class ModrinthBackend:
         if not os.path.exists(self.mods_directory):
             os.makedirs(self.mods_directory)
         self.base_url = "https://api.modrinth.com/v2"
+        self.http = get_client()
 
-    def search_mods(self, query, version=None, loader=None, limit=20, index="relevance", category=None):
-        """Searches for mods on Modrinth with optional filters."""
+    def search_mods(self, query, version=None, loader=None, limit=20, index="relevance", category=None, offset=0):
+        """Searches for mods on Modrinth with optional filters. offset skips that many hits (paging)."""
         try:
             facets = [['project_type:mod']]
             if version:
@@ -27,10 +28,11 @@ class ModrinthBackend:
                 "query": query,
                 "limit": limit,
                 "index": index,
+                "offset": offset,
                 "facets": json.dumps(facets)
             }
             
-            response = requests.get(f"{self.base_url}/search", params=params)
+            response = self.http.get(f"{self.base_url}/search", params=params)
             response.raise_for_status()
             data = response.json()
             return data.get('hits', [])
@@ -41,7 +43,7 @@ class ModrinthBackend:
     def get_mod_versions(self, slug_or_id):
         """Gets versions for a mod."""
         try:
-            response = requests.get(f"{self.base_url}/project/{slug_or_id}/version")
+            response = self.http.get(f"{self.base_url}/project/{slug_or_id}/version")
             response.raise_for_status()
             return response.json()
         except Exception as e:
@@ -56,18 +58,21 @@ class ModrinthBackend:
             filename = primary_file['filename']
             path = os.path.join(self.mods_directory, filename)
             
-            response = requests.get(url, stream=True)
+            response = self.http.get(url, stream=True)
             response.raise_for_status()
             
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
             
-            with open(path, 'wb') as f:
+            # Write beside the target and rename over it: a hardlinked copy shared with
+            # a duplicated profile must be replaced, not overwritten in place
+            with open(path + ".part", 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
                     downloaded += len(chunk)
                     if callback and total_size > 0:
                         callback(downloaded, total_size)
+            os.replace(path + ".part", path)
             
             return True, path
         except Exception as e:
@@ -92,9 +97,10 @@ class CurseForgeBackend:
             "Accept": "application/json",
             "x-api-key": self.API_KEY
         }
+        self.http = get_client()
 
-    def search_mods(self, query, version=None, loader=None, limit=20, index="relevance", category=None):
-        """Searches for mods on CurseForge."""
+    def search_mods(self, query, version=None, loader=None, limit=20, index="relevance", category=None, offset=0):
+        """Searches for mods on CurseForge. offset skips that many hits (paging)."""
         try:
             # Map sort index
             sort_map = {
@@ -118,6 +124,7 @@ class CurseForgeBackend:
                 "classId": self.CLASS_ID_MODS,
                 "searchFilter": query,
                 "pageSize": limit,
+                "index": offset,
                 "sortField": sort_field,
                 "sortOrder": "desc",
             }
@@ -126,7 +133,7 @@ class CurseForgeBackend:
             if loader and loader.lower() in loader_map:
                 params["modLoaderType"] = loader_map[loader.lower()]
 
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/mods/search",
                 params=params,
                 headers=self.headers
@@ -157,7 +164,7 @@ class CurseForgeBackend:
     def get_mod_versions(self, mod_id):
         """Gets versions (files) for a CurseForge mod."""
         try:
-            response = requests.get(
+            response = self.http.get(
                 f"{self.base_url}/mods/{mod_id}/files",
                 headers=self.headers,
                 params={"pageSize": 50}
@@ -210,18 +217,21 @@ class CurseForgeBackend:
                     url = f"https://edge.forgecdn.net/files/{str(file_id)[:4]}/{str(file_id)[4:]}/{filename}"
 
             path = os.path.join(self.mods_directory, filename)
-            response = requests.get(url, stream=True)
+            response = self.http.get(url, stream=True)
             response.raise_for_status()
 
             total_size = int(response.headers.get('content-length', 0))
             downloaded = 0
 
-            with open(path, 'wb') as f:
+            # Write beside the target and rename over it: a hardlinked copy shared with
+            # a duplicated profile must be replaced, not overwritten in place
+            with open(path + ".part", 'wb') as f:
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
                     downloaded += len(chunk)
                     if callback and total_size > 0:
                         callback(downloaded, total_size)
+            os.replace(path + ".part", path)
 
             return True, path
         except Exception as e:
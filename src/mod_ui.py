@@ -1,41 +1,81 @@
 import os
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton, 
     QListWidget, QListWidgetItem, QLabel, QMessageBox,
     QSplitter, QComboBox, QCheckBox, QTextBrowser, QProgressBar, QFrame
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize, QTimer
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, QSize, QTimer, QBuffer, QByteArray, QIODevice
 from PyQt5.QtGui import QPixmap, QImage, QIcon
 from .mod_manager import ModrinthBackend, CurseForgeBackend
+from .http_client import get_client
+from .search_cache import search_key
 
 
-class ImageLoaderThread(QThread):
-    image_loaded = pyqtSignal(str, QPixmap)
+ICON_SIZE = 56      # results list icon size
+ICON_WORKERS = 4
 
-    def __init__(self, url, mod_id):
+
+class IconLoader(QObject):
+    """Fetches mod icons on a fixed pool of worker threads, which also decode them and scale
+    them down to ICON_SIZE. Thumbnails are read from and written to a ThumbnailCache when
+    one is given, so icons seen before need no network at all."""
+    icon_loaded = pyqtSignal(str, QImage)    # url, thumbnail
+
+    def __init__(self, cache=None, workers=ICON_WORKERS):
         super().__init__()
-        self.url = url
-        self.mod_id = mod_id
+        self.cache = cache
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="icons")
+        self._pending = set()
+        self._lock = threading.Lock()
+
+    def request(self, url):
+        """Queue url unless it is already on its way."""
+        with self._lock:
+            if url in self._pending:
+                return
+            self._pending.add(url)
+        try:
+            self._pool.submit(self._load, url)
+        except RuntimeError:
+            # Shut down with the panel
+            pass
 
-    def run(self):
+    def _load(self, url):
         try:
-            if not self.url:
-                return
-            response = requests.get(self.url)
-            response.raise_for_status()
             image = QImage()
-            image.loadFromData(response.content)
-            pixmap = QPixmap(image)
-            self.image_loaded.emit(self.mod_id, pixmap)
-        except:
-            pass
+            data = self.cache.get(url) if self.cache is not None else None
+            if data is None or not image.loadFromData(data):
+                response = get_client().get(url)
+                response.raise_for_status()
+                if not image.loadFromData(response.content):
+                    return
+                image = image.scaled(ICON_SIZE, ICON_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                if self.cache is not None:
+                    png = QByteArray()
+                    buffer = QBuffer(png)
+                    buffer.open(QIODevice.WriteOnly)
+                    image.save(buffer, "PNG")
+                    self.cache.put(url, bytes(png))
+            self.icon_loaded.emit(url, image)
+        except Exception as e:
+            print(f"[Icons] Failed to load {url}: {e}")
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def shutdown(self):
+        """Drop the icons still queued; the ones being fetched finish on their own."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
 
 
 class SearchThread(QThread):
     results_signal = pyqtSignal(list)
 
-    def __init__(self, backend, query, version=None, loader=None, index="relevance", category=None):
+    def __init__(self, backend, query, version=None, loader=None, index="relevance", category=None,
+                 cache=None, key=None, revalidate=False):
+        """With a cache the hits are stored under key; revalidate=True emits them only if they changed."""
         super().__init__()
         self.backend = backend
         self.query = query
@@ -43,9 +83,16 @@ class SearchThread(QThread):
         self.loader = loader
         self.index = index
         self.category = category
+        self.cache = cache
+        self.key = key
+        self.revalidate = revalidate
 
     def run(self):
         hits = self.backend.search_mods(self.query, self.version, self.loader, index=self.index, category=self.category)
+        if self.cache is not None:
+            changed = self.cache.put(self.key, hits)
+            if self.revalidate and not changed:
+                return
         self.results_signal.emit(hits)
 
 
@@ -75,18 +122,21 @@ class ModDownloadThread(QThread):
     def run(self):
         try:
              path = os.path.join(self.backend.mods_directory, self.filename)
-             response = requests.get(self.url, stream=True)
+             response = get_client().get(self.url, stream=True)
              response.raise_for_status()
              
              total_size = int(response.headers.get('content-length', 0))
              downloaded = 0
              
-             with open(path, 'wb') as f:
+             # Write beside the target and rename over it — a hardlinked copy shared with
+             # a duplicated profile must be replaced, not overwritten in place
+             with open(path + ".part", 'wb') as f:
                  for chunk in response.iter_content(chunk_size=8192):
                      f.write(chunk)
                      downloaded += len(chunk)
                      if total_size > 0:
                          self.progress_signal.emit(downloaded, total_size)
+             os.replace(path + ".part", path)
              
              self.finished_signal.emit(True, path)
         except Exception as e:
@@ -107,7 +157,10 @@ C_ORANGE_D = "#ea580c"
 class ModManagerPanel(QWidget):
     closed = pyqtSignal()
 
-    def __init__(self, minecraft_directory, parent=None, current_version=None, current_loader=None):
+    def __init__(self, minecraft_directory, parent=None, current_version=None, current_loader=None, search_cache=None,
+                 thumbnail_cache=None):
+        """search_cache (a SearchCache) shows repeated searches at once and refreshes them in the background;
+        thumbnail_cache (a ThumbnailCache) keeps result icons on disk between sessions."""
         super().__init__(parent)
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.setObjectName("modManagerRoot")
@@ -246,7 +299,13 @@ class ModManagerPanel(QWidget):
         self.active_backend = self.modrinth_backend
         self.active_source = "modrinth"
         
-        self.image_cache = {}
+        self.image_cache = {}   # icon URL → ICON_SIZE pixmap
+        self.icon_loader = IconLoader(thumbnail_cache)
+        self.icon_loader.icon_loaded.connect(self.on_icon_loaded)
+        self.closed.connect(self.icon_loader.shutdown)
+        self.search_cache = search_cache
+        self._search_key = None
+        self._search_threads = set()
         
         # ── Main horizontal layout ──
         main_h = QHBoxLayout(self)
@@ -379,7 +438,7 @@ class ModManagerPanel(QWidget):
         
         # Results list
         self.results_list = QListWidget()
-        self.results_list.setIconSize(QSize(56, 56))
+        self.results_list.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
         self.results_list.itemClicked.connect(self.on_mod_selected)
         splitter.addWidget(self.results_list)
         
@@ -581,13 +640,33 @@ class ModManagerPanel(QWidget):
             if category == "world gen":
                 category = "worldgen"
             
-        self.search_thread = SearchThread(self.active_backend, query, version_filter, loader_filter, index=sort_mode, category=category)
-        self.search_thread.results_signal.connect(self.on_search_finished)
-        self.search_thread.start()
+        key = search_key(self.active_source, query, version_filter, loader_filter, category, sort_mode)
+        self._search_key = key
+        cached = self.search_cache.get(key) if self.search_cache is not None else None
+        if cached:
+            hits, fresh = cached
+            self.on_search_finished(hits)
+            if fresh:
+                return
+
+        # Stale or missing: fetch in the background; a stale list is only redrawn if the hits changed
+        thread = SearchThread(self.active_backend, query, version_filter, loader_filter, index=sort_mode, category=category,
+                              cache=self.search_cache, key=key, revalidate=cached is not None)
+        thread.results_signal.connect(lambda hits, key=key: self._on_search_results(key, hits))
+        thread.finished.connect(lambda: self._search_threads.discard(thread))
+        self._search_threads.add(thread)
+        self.search_thread = thread
+        thread.start()
+
+    def _on_search_results(self, key, hits):
+        # Results of a search the user has since moved on from are dropped
+        if key == self._search_key:
+            self.on_search_finished(hits)
 
     def on_search_finished(self, results):
         self.search_button.setEnabled(True)
         self.status_label.setText(f"Found {len(results)} results.")
+        self.results_list.clear()
         
         for mod in results:
             item = QListWidgetItem(f"{mod['title']}")
@@ -600,20 +679,16 @@ class ModManagerPanel(QWidget):
                 if icon_url in self.image_cache:
                     item.setIcon(QIcon(self.image_cache[icon_url]))
                 else:
-                    loader = ImageLoaderThread(icon_url, mod['slug'])
-                    loader.image_loaded.connect(self.on_icon_loaded)
-                    loader.start()
-                    if not hasattr(self, 'icon_loaders'):
-                        self.icon_loaders = []
-                    self.icon_loaders.append(loader)
-
-    def on_icon_loaded(self, mod_slug, pixmap):
+                    self.icon_loader.request(icon_url)
+
+    def on_icon_loaded(self, icon_url, image):
+        pixmap = QPixmap.fromImage(image)
+        self.image_cache[icon_url] = pixmap
         for i in range(self.results_list.count()):
              item = self.results_list.item(i)
              data = item.data(Qt.UserRole)
-             if data['slug'] == mod_slug:
+             if data.get('icon_url') == icon_url:
                  item.setIcon(QIcon(pixmap))
-                 self.image_cache[data.get('icon_url')] = pixmap
                  
     def on_mod_selected(self, item):
         mod = item.data(Qt.UserRole)
@@ -0,0 +1,25 @@
+"""
+Fingerprint of a mods folder.
+
+AppCDS archives and the launch history are both keyed on the mods a game
+directory loads. Names, sizes and mtimes stand in for the contents: a mod
+added, removed, updated or replaced changes at least one of them, and no
+jar has to be read.
+"""
+import os
+
+
+def mods_digest(digest, mods_dir):
+    """Feed the name, size and mtime of every file in the mods folder into digest (a hashlib object).
+    Returns the number of files; a missing folder counts as empty."""
+    try:
+        entries = sorted(os.scandir(mods_dir), key=lambda e: e.name)
+    except FileNotFoundError:
+        return 0
+    count = 0
+    for entry in entries:
+        if entry.is_file():
+            st = entry.stat()
+            digest.update(f"{entry.name}\0{st.st_size}\0{st.st_mtime_ns}\n".encode())
+            count += 1
+    return count
@@ -0,0 +1,135 @@
+"""
+Content-addressed cache of extracted native libraries.
+
+Native jars are unpacked once per distinct (jar contents, exclude rules,
+platform) into ``qlauncher_natives/<key>/`` and every version with the
+same natives shares that folder. A small manifest of extracted files and
+sizes lets a launch check the folder with a few stats instead of
+re-extracting, and records which versions use it so folders of
+uninstalled versions can be collected.
+"""
+import os
+import json
+import time
+import shutil
+import hashlib
+import platform
+import threading
+from minecraft_launcher_lib.natives import extract_natives_file
+
+MANIFEST = ".manifest.json"
+STALE_TMP_SECONDS = 3600
+
+
+class NativesCache:
+    """Shared, verified extraction folders for native jars."""
+
+    def __init__(self, cache_root):
+        self.cache_root = cache_root
+
+    @staticmethod
+    def key(native_tasks):
+        """Hash the native jars (by SHA1, or size and mtime when unknown), their exclude rules and the platform."""
+        digest = hashlib.sha1()
+        digest.update(f"{platform.system()}\0{platform.machine()}\0{platform.architecture()[0]}".encode())
+        parts = []
+        for task in native_tasks:
+            if task["sha1"]:
+                identity = task["sha1"]
+            else:
+                st = os.stat(task["path"])
+                identity = f"{os.path.basename(task['path'])}:{st.st_size}:{st.st_mtime_ns}"
+            parts.append(f"{identity}\0{json.dumps(task['extract'], sort_keys=True)}")
+        for part in sorted(parts):
+            digest.update(part.encode() + b"\n")
+        return digest.hexdigest()[:20]
+
+    def path_for(self, key):
+        return os.path.join(self.cache_root, key)
+
+    def _read_manifest(self, path):
+        try:
+            with open(os.path.join(path, MANIFEST), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_manifest(self, path, manifest):
+        tmp = os.path.join(path, MANIFEST + ".tmp")
+        with open(tmp, "w") as f:
+            json.dump(manifest, f)
+        os.replace(tmp, os.path.join(path, MANIFEST))
+
+    def verify(self, path):
+        """Cheap check of an extraction folder: every file in its manifest exists with its size."""
+        manifest = self._read_manifest(path)
+        if manifest is None:
+            return False
+        for rel, size in manifest["files"].items():
+            try:
+                if os.path.getsize(os.path.join(path, rel)) != size:
+                    return False
+            except OSError:
+                return False
+        return True
+
+    def ensure(self, native_tasks, version_id, force=False):
+        """Return the extraction folder for native_tasks, extracting only if it is missing,
+        damaged or force is set. version_id is recorded as a user of the folder."""
+        key = self.key(native_tasks)
+        path = self.path_for(key)
+        if not force and self.verify(path):
+            manifest = self._read_manifest(path)
+            if version_id not in manifest["versions"]:
+                manifest["versions"].append(version_id)
+                self._write_manifest(path, manifest)
+            return path
+
+        # Extract next to the final folder and swap it in, so a reader never sees half a folder
+        tmp = f"{path}.{os.getpid()}-{threading.get_ident()}.tmp"
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for task in native_tasks:
+            extract_natives_file(task["path"], tmp, task["extract"])
+        files = {}
+        for root, _, names in os.walk(tmp):
+            for name in names:
+                full = os.path.join(root, name)
+                files[os.path.relpath(full, tmp)] = os.path.getsize(full)
+        previous = self._read_manifest(path) or {"versions": []}
+        versions = sorted(set(previous["versions"]) | {version_id})
+        self._write_manifest(tmp, {"files": files, "versions": versions})
+
+        if not force and self.verify(path):
+            # Another install extracted the same natives meanwhile — theirs is as good as ours
+            shutil.rmtree(tmp, ignore_errors=True)
+            return self.ensure(native_tasks, version_id)
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+        if files:
+            print(f"[Natives] Extracted {len(files)} files for {version_id} into {key}")
+        return path
+
+    def collect(self, installed_ids):
+        """Remove folders none of whose versions are installed any more. Returns how many were removed."""
+        installed = set(installed_ids)
+        removed = 0
+        try:
+            entries = list(os.scandir(self.cache_root))
+        except FileNotFoundError:
+            return 0
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            if entry.name.endswith(".tmp"):
+                # Leftover of an interrupted extraction, unless one is running right now
+                if time.time() - entry.stat().st_mtime > STALE_TMP_SECONDS:
+                    shutil.rmtree(entry.path, ignore_errors=True)
+                continue
+            manifest = self._read_manifest(entry.path)
+            if manifest is None or not installed & set(manifest["versions"]):
+                shutil.rmtree(entry.path, ignore_errors=True)
+                removed += 1
+        if removed:
+            print(f"[Natives] Collected {removed} unused natives folder(s)")
+        return removed
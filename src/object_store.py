@@ -0,0 +1,140 @@
+"""
+Content-addressed object store shared by every .minecraft root on the machine.
+
+Library jars, client jars, natives and asset objects are kept once under
+``objects/<aa>/<sha1>`` and linked into each root — as a reflink where the
+filesystem supports copy-on-write clones, otherwise as a hardlink.
+"""
+import os
+import sys
+import json
+import shutil
+import threading
+
+FICLONE = 0x40049409  # linux/fs.h: _IOW(0x94, 9, int)
+
+
+def reflink(src, dst):
+    """Clone src into dst sharing extents (Btrfs, XFS, bcachefs). Returns True on success."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        import fcntl
+        with open(src, "rb") as s, open(dst, "wb") as d:
+            fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+        return True
+    except Exception:
+        if os.path.exists(dst):
+            os.remove(dst)
+        return False
+
+
+class ObjectStore:
+    """SHA1-keyed global store that installs link into instead of downloading again."""
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+        self.objects_dir = os.path.join(store_dir, "objects")
+        self.stats_file = os.path.join(store_dir, "reflinks.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        self._lock = threading.Lock()
+        self._reflinked = self._load_reflink_stats()
+        self._can_reflink = True  # cleared after the first clone the filesystem refuses
+
+    def _load_reflink_stats(self):
+        try:
+            if os.path.exists(self.stats_file):
+                with open(self.stats_file, "r") as f:
+                    return json.load(f)
+        except Exception as e:
+            print(f"[ObjectStore] Error loading stats: {e}")
+        return {"files": 0, "bytes": 0}
+
+    def _save_reflink_stats(self):
+        try:
+            with open(self.stats_file, "w") as f:
+                json.dump(self._reflinked, f)
+        except Exception as e:
+            print(f"[ObjectStore] Error saving stats: {e}")
+
+    def path_for(self, sha1):
+        """Return the store path of an object."""
+        return os.path.join(self.objects_dir, sha1[:2], sha1)
+
+    def has(self, sha1):
+        """Return True if the object is already in the store."""
+        return bool(sha1) and os.path.isfile(self.path_for(sha1))
+
+    def adopt(self, path, sha1):
+        """Take a freshly downloaded file into the store. The file stays where it is,
+        hardlinked to its store copy so the first root costs no extra space."""
+        target = self.path_for(sha1)
+        if os.path.exists(target):
+            return
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        try:
+            os.link(path, target)
+        except FileExistsError:
+            pass
+        except OSError:
+            # Store on another volume — keep a private copy instead
+            shutil.copyfile(path, target)
+
+    def evict(self, sha1):
+        """Drop an object from the store, e.g. when a hardlinked copy turned out corrupted.
+        Roots that still link to it keep their own directory entry."""
+        target = self.path_for(sha1)
+        if os.path.exists(target):
+            os.remove(target)
+
+    def link_into(self, sha1, dest):
+        """Materialise a stored object at dest. Returns "reflink", "hardlink" or "copy"."""
+        source = self.path_for(sha1)
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        if os.path.lexists(dest):
+            os.remove(dest)
+
+        if self._can_reflink:
+            if reflink(source, dest):
+                with self._lock:
+                    self._reflinked["files"] += 1
+                    self._reflinked["bytes"] += os.path.getsize(source)
+                return "reflink"
+            self._can_reflink = False
+        try:
+            os.link(source, dest)
+            return "hardlink"
+        except OSError:
+            shutil.copyfile(source, dest)
+            return "copy"
+
+    def flush(self):
+        """Persist counters that can't be read back from the filesystem."""
+        with self._lock:
+            self._save_reflink_stats()
+
+    def report(self):
+        """Summarise the store: object count, stored bytes and bytes deduplicated across roots.
+
+        A hardlinked object is referenced by the store plus one link per root, so every
+        link beyond the first root is a copy that was never written to disk."""
+        objects = 0
+        stored = 0
+        hardlinked = 0
+        for bucket in os.scandir(self.objects_dir):
+            if not bucket.is_dir():
+                continue
+            for entry in os.scandir(bucket.path):
+                st = entry.stat()
+                objects += 1
+                stored += st.st_size
+                hardlinked += st.st_size * max(0, st.st_nlink - 2)
+        with self._lock:
+            reflinked = self._reflinked["bytes"]
+        return {
+            "objects": objects,
+            "stored_bytes": stored,
+            "hardlinked_bytes": hardlinked,
+            "reflinked_bytes": reflinked,
+            "deduplicated_bytes": hardlinked + reflinked,
+        }
@@ -0,0 +1,115 @@
+"""
+Speculative background installs.
+
+Users settle on a version and loader a few seconds before they press
+Play. The prefetcher uses that time to install the selection at low
+priority — a small worker pool whose transfers pause whenever a
+foreground operation (a launch, a repair) runs. When a launch targets the
+version being prefetched, the prefetch is stopped and the launch picks up
+every file it already finished.
+"""
+import threading
+from contextlib import contextmanager
+from .installer import InstallEngine, DownloadCancelled
+
+PREFETCH_WORKERS = 4
+
+
+class Prefetcher:
+    """Installs the selected (version, loader) in the background until something needs the bandwidth."""
+
+    def __init__(self, backend, max_workers=PREFETCH_WORKERS):
+        self.backend = backend
+        self.engine = InstallEngine(
+            backend.minecraft_directory, max_workers=max_workers,
+            store=backend.store, manifest=backend.manifest,
+        )
+        self._lock = threading.Lock()
+        self._thread = None
+        self._target = None
+        self._cancel = None
+        self._resume = threading.Event()
+        self._resume.set()
+        self._foreground = 0
+
+    def request(self, version_id, modloader):
+        """Start prefetching a selection, superseding whatever was prefetched before."""
+        target = (version_id, modloader)
+        with self._lock:
+            if target == self._target and self._thread and self._thread.is_alive():
+                return
+            previous = self._thread
+            if self._cancel is not None:
+                self._cancel.set()
+            self._target = target
+            self._cancel = threading.Event()
+            self._thread = threading.Thread(
+                target=self._run, args=(target, self._cancel, previous), name="prefetch", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """Cancel the running prefetch, if any."""
+        with self._lock:
+            if self._cancel is not None:
+                self._cancel.set()
+            self._target = None
+
+    @contextmanager
+    def foreground(self, version_id=None):
+        """Give a foreground operation priority over the prefetch.
+        A prefetch of version_id is stopped and waited for, so the caller reuses what it
+        finished; any other prefetch is paused until the last foreground operation ends."""
+        with self._lock:
+            self._foreground += 1
+            self._resume.clear()
+            thread = self._thread
+            same = self._target is not None and self._target[0] == version_id
+            if same:
+                self._cancel.set()
+                self._target = None
+        if same and thread is not None and thread.is_alive():
+            print(f"[Prefetch] Handing {version_id} over to the launch")
+            thread.join()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground -= 1
+                if self._foreground == 0:
+                    self._resume.set()
+
+    def _wait_resumed(self, cancel):
+        """Block while paused. Returns False if the prefetch was cancelled meanwhile."""
+        while not cancel.is_set():
+            if self._resume.wait(0.2):
+                return True
+        return False
+
+    def _run(self, target, cancel, previous):
+        # Let a superseded prefetch wind down first — both may share a parent version
+        if previous is not None:
+            previous.join()
+        version_id, modloader = target
+        registry = self.backend.registry
+        try:
+            if not registry.is_installed(version_id):
+                if not self._wait_resumed(cancel):
+                    return
+                print(f"[Prefetch] Installing {version_id} in the background")
+                try:
+                    self.engine.install_version(version_id, cancel_event=cancel, resume_event=self._resume)
+                finally:
+                    registry.invalidate(version_id)
+
+            if self.backend.expected_launch_version(version_id, modloader) is None:
+                # Loader installers can't pause mid-way, so don't start one during a launch
+                if not self._wait_resumed(cancel):
+                    return
+                print(f"[Prefetch] Installing {modloader} for {version_id} in the background")
+                self.backend.resolve_loader(version_id, modloader)
+            print(f"[Prefetch] {version_id} ({modloader}) ready")
+        except DownloadCancelled:
+            print(f"[Prefetch] {version_id} ({modloader}) cancelled")
+        except Exception as e:
+            print(f"[Prefetch] {version_id} ({modloader}) failed: {e}")
@@ -1,52 +1,221 @@
 import json
 import os
 import uuid
+import atexit
 import shutil
+import threading
+from contextlib import contextmanager
 from datetime import datetime
+from .object_store import reflink as reflink_file
+
+# Journal writes are delayed this long so a burst of changes is one append
+JOURNAL_DELAY = 0.2
+# Fold the journal into profiles.json once it holds this many entries
+COMPACT_AFTER = 1000
+
+# Archives (mod jars, resource and shader pack zips) are only ever added, removed or replaced
+# whole, so a duplicate can hardlink them when the filesystem can't reflink. Everything else —
+# configs, shader pack settings, worlds — may be rewritten in place and is copied.
+LINKABLE_EXTENSIONS = (".jar", ".zip")
+# Left out of duplicates unless asked for
+DUPLICATE_EXCLUDE = ("logs",)
+
+
+def _clone_file(src, dst, reflink=True):
+    """Materialise src at dst as cheaply as is safe. Returns "reflink", "hardlink" or "copy"."""
+    if reflink and reflink_file(src, dst):
+        return "reflink"
+    if src.lower().endswith(LINKABLE_EXTENSIONS):
+        try:
+            os.link(src, dst)
+            return "hardlink"
+        except OSError:
+            pass
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def clone_instance(src_dir, dst_dir, subdirs, progress_callback=None, cancel_event=None):
+    """Clone subdirs of one instance directory into another, empty folders included.
+    Returns {"files", "shared_bytes", "copied_bytes"}. Raises InterruptedError once cancel_event is set."""
+    dirs, files = [], []
+    for subdir in subdirs:
+        for dirpath, _, filenames in os.walk(os.path.join(src_dir, subdir)):
+            dirs.append(dirpath)
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                if os.path.isfile(path) and not os.path.islink(path):
+                    files.append((subdir, path, os.path.getsize(path)))
+    for dirpath in dirs:
+        os.makedirs(os.path.join(dst_dir, os.path.relpath(dirpath, src_dir)), exist_ok=True)
+    total = sum(size for _, _, size in files) or 1
+
+    stats = {"files": 0, "shared_bytes": 0, "copied_bytes": 0}
+    reflink = True  # cleared after the first clone the filesystem refuses
+    done = 0
+    for subdir, path, size in files:
+        if cancel_event is not None and cancel_event.is_set():
+            raise InterruptedError("Duplication cancelled")
+        try:
+            how = _clone_file(path, os.path.join(dst_dir, os.path.relpath(path, src_dir)), reflink)
+        except OSError as e:
+            print(f"[ProfileManager] Error copying {path}: {e}")
+            continue
+        reflink = how == "reflink"
+        stats["files"] += 1
+        stats["copied_bytes" if how == "copy" else "shared_bytes"] += size
+        done += size
+        if progress_callback:
+            progress_callback(f"Duplicating {subdir}...", int(done * 100 / total))
+    return stats
 
 
 class ProfileManager:
     """Manages Minecraft profiles — each profile is a full game instance
-    located at .minecraft/versions/<ProfileName>/."""
+    located at .minecraft/versions/<ProfileName>/.
+
+    Profiles are indexed by id. profiles.json is a snapshot; changes are
+    appended to profiles.journal shortly after they happen (write-behind)
+    and folded into a new snapshot, written to a temp file and renamed
+    over the old one, once the journal grows long."""
 
     # Standard Minecraft directories to create for each profile
     INSTANCE_DIRS = ["mods", "config", "saves", "resourcepacks", "shaderpacks", "logs"]
 
-    def __init__(self, app_dir):
+    # Fields update_profile accepts
+    EDITABLE = ("name", "version", "loader", "color", "appcds")
+
+    def __init__(self, app_dir, minecraft_dir=None):
         self.app_dir = app_dir
-        self.minecraft_dir = os.path.join(os.getenv('APPDATA'), '.minecraft')
+        self.minecraft_dir = minecraft_dir or os.path.join(os.getenv('APPDATA'), '.minecraft')
         self.profiles_file = os.path.join(app_dir, "profiles.json")
-        self.profiles = []
+        self.journal_file = os.path.join(app_dir, "profiles.journal")
+        self._profiles = {}          # id → profile, in creation order
         self.active_profile_id = None
+        self._lock = threading.RLock()
+        self._pending = []           # journal lines not written yet
+        self._journal_entries = 0
+        self._timer = None
+        self._batch_depth = 0
         self._load()
+        atexit.register(self.flush)
+
+    @property
+    def profiles(self):
+        return list(self._profiles.values())
 
     def _load(self):
-        """Load profiles from disk."""
+        """Load the snapshot and replay the journal on top of it."""
         try:
             if os.path.exists(self.profiles_file):
                 with open(self.profiles_file, "r") as f:
                     data = json.load(f)
-                self.profiles = data.get("profiles", [])
+                self._profiles = {p["id"]: p for p in data.get("profiles", [])}
                 self.active_profile_id = data.get("active_profile_id")
         except Exception as e:
             print(f"[ProfileManager] Error loading profiles: {e}")
-            self.profiles = []
+            self._profiles = {}
+
+        torn = False
+        try:
+            with open(self.journal_file, "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # Torn last line of an interrupted write — everything before it is good
+                        torn = True
+                        break
+                    self._replay(entry)
+                    self._journal_entries += 1
+        except FileNotFoundError:
+            pass
+        if torn:
+            # New entries appended after the torn line would be lost on the next load
+            self.compact()
 
         # Create default profile if none exist
-        if not self.profiles:
+        if not self._profiles:
             self.create_profile("Default", "1.21.4", "Vanilla", "#4ade80")
 
-    def _save(self):
-        """Save profiles to disk."""
+    def _replay(self, entry):
+        op = entry["op"]
+        if op == "put":
+            self._profiles[entry["profile"]["id"]] = entry["profile"]
+        elif op == "delete":
+            self._profiles.pop(entry["id"], None)
+        elif op == "active":
+            self.active_profile_id = entry["id"]
+
+    def _journal(self, op, **fields):
+        """Queue a change for the journal and schedule the write."""
+        with self._lock:
+            self._pending.append(json.dumps(dict(op=op, **fields)))
+            if self._batch_depth == 0:
+                self._schedule_flush()
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(JOURNAL_DELAY, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write queued changes to the journal now, compacting it into profiles.json if it got long."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._pending:
+                return
+            try:
+                if self._journal_entries + len(self._pending) >= COMPACT_AFTER:
+                    self._compact()
+                else:
+                    with open(self.journal_file, "a") as f:
+                        f.write("\n".join(self._pending) + "\n")
+                    self._journal_entries += len(self._pending)
+                self._pending = []
+            except Exception as e:
+                print(f"[ProfileManager] Error saving profiles: {e}")
+
+    def _compact(self):
+        """Write a full snapshot atomically and start an empty journal."""
+        data = {
+            "active_profile_id": self.active_profile_id,
+            "profiles": list(self._profiles.values()),
+        }
+        tmp = f"{self.profiles_file}.{os.getpid()}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+        os.replace(tmp, self.profiles_file)
+        # Only after the snapshot is in place — a crash in between replays the journal onto it, which is idempotent
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+        self._journal_entries = 0
+
+    def compact(self):
+        """Fold everything, journal included, into profiles.json now."""
+        with self._lock:
+            try:
+                self._compact()
+                self._pending = []
+            except Exception as e:
+                print(f"[ProfileManager] Error saving profiles: {e}")
+
+    @contextmanager
+    def batch(self):
+        """Group many changes: the journal is written once, when the outermost batch ends."""
+        with self._lock:
+            self._batch_depth += 1
         try:
-            data = {
-                "active_profile_id": self.active_profile_id,
-                "profiles": self.profiles
-            }
-            with open(self.profiles_file, "w") as f:
-                json.dump(data, f, indent=4)
-        except Exception as e:
-            print(f"[ProfileManager] Error saving profiles: {e}")
+            yield self
+        finally:
+            with self._lock:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._pending:
+                    self.flush()
 
     def _safe_name(self, name):
         """Sanitize profile name for use as directory name."""
@@ -61,22 +230,25 @@ class ProfileManager:
         """Return all profiles."""
         return self.profiles
 
+    def get_profile(self, profile_id):
+        """Return a profile by ID, or None."""
+        return self._profiles.get(profile_id)
+
     def get_active_profile(self):
         """Return the active profile, or the first one."""
-        if self.active_profile_id:
-            for p in self.profiles:
-                if p["id"] == self.active_profile_id:
-                    return p
-        if self.profiles:
-            return self.profiles[0]
-        return None
+        profile = self._profiles.get(self.active_profile_id) if self.active_profile_id else None
+        if profile is None and self._profiles:
+            profile = next(iter(self._profiles.values()))
+        return profile
 
     def set_active_profile(self, profile_id):
         """Set the active profile by ID."""
+        if profile_id == self.active_profile_id:
+            return
         self.active_profile_id = profile_id
-        self._save()
+        self._journal("active", id=profile_id)
 
-    def create_profile(self, name, version="1.21.4", loader="Vanilla", color="#4ade80"):
+    def create_profile(self, name, version="1.21.4", loader="Vanilla", color="#4ade80", appcds=False):
         """Create a new profile with its own game directory."""
         profile = {
             "id": str(uuid.uuid4())[:8],
@@ -84,9 +256,10 @@ class ProfileManager:
             "version": version,
             "loader": loader,
             "color": color,
+            "appcds": appcds,
             "created_at": datetime.now().isoformat()
         }
-        self.profiles.append(profile)
+        self._profiles[profile["id"]] = profile
 
         # Create instance directory with full Minecraft folder structure
         inst_dir = self.get_instance_dir(profile["id"])
@@ -94,103 +267,123 @@ class ProfileManager:
         for subdir in self.INSTANCE_DIRS:
             os.makedirs(os.path.join(inst_dir, subdir), exist_ok=True)
 
-        if self.active_profile_id is None:
-            self.active_profile_id = profile["id"]
-
-        self._save()
+        with self.batch():
+            self._journal("put", profile=profile)
+            if self.active_profile_id is None:
+                self.set_active_profile(profile["id"])
         return profile
 
+    def create_profiles(self, specs):
+        """Create many profiles in one batch. specs are dicts of create_profile arguments."""
+        with self.batch():
+            return [self.create_profile(**spec) for spec in specs]
+
     def update_profile(self, profile_id, **kwargs):
         """Update fields of a profile. If name changes, rename the directory."""
-        for p in self.profiles:
-            if p["id"] == profile_id:
-                old_name = p.get("name")
-                for key, value in kwargs.items():
-                    if key in ("name", "version", "loader", "color"):
-                        p[key] = value
-
-                # Rename directory if name changed
-                new_name = p.get("name")
-                if old_name and new_name and old_name != new_name:
-                    old_dir = os.path.join(self.minecraft_dir, "versions", self._safe_name(old_name))
-                    new_dir = os.path.join(self.minecraft_dir, "versions", self._safe_name(new_name))
-                    if os.path.exists(old_dir) and not os.path.exists(new_dir):
-                        try:
-                            os.rename(old_dir, new_dir)
-                        except Exception as e:
-                            print(f"[ProfileManager] Could not rename directory: {e}")
-
-                self._save()
-                return p
-        return None
+        p = self._profiles.get(profile_id)
+        if p is None:
+            return None
+        old_name = p.get("name")
+        changed = False
+        for key, value in kwargs.items():
+            if key in self.EDITABLE and p.get(key) != value:
+                p[key] = value
+                changed = True
+        if not changed:
+            return p
+
+        # Rename directory if name changed
+        new_name = p.get("name")
+        if old_name and new_name and old_name != new_name:
+            old_dir = os.path.join(self.minecraft_dir, "versions", self._safe_name(old_name))
+            new_dir = os.path.join(self.minecraft_dir, "versions", self._safe_name(new_name))
+            if os.path.exists(old_dir) and not os.path.exists(new_dir):
+                try:
+                    os.rename(old_dir, new_dir)
+                except Exception as e:
+                    print(f"[ProfileManager] Could not rename directory: {e}")
+
+        self._journal("put", profile=p)
+        return p
+
+    def update_profiles(self, updates):
+        """Apply {profile_id: {field: value}} in one batch. Returns the updated profiles."""
+        with self.batch():
+            return [p for p in (self.update_profile(pid, **fields) for pid, fields in updates.items()) if p]
 
     def delete_profile(self, profile_id):
         """Delete a profile. Cannot delete the last profile."""
-        if len(self.profiles) <= 1:
-            return False
-
-        # Find the profile to get its directory
-        target = None
-        for p in self.profiles:
-            if p["id"] == profile_id:
-                target = p
-                break
-
-        self.profiles = [p for p in self.profiles if p["id"] != profile_id]
-        if self.active_profile_id == profile_id:
-            self.active_profile_id = self.profiles[0]["id"] if self.profiles else None
-
-        # Optionally remove the instance directory (we keep it for safety)
-        # User can manually delete from .minecraft/versions/<name>/
-
-        self._save()
-        return True
-
-    def duplicate_profile(self, profile_id):
-        """Duplicate an existing profile including its directory."""
-        source = None
-        for p in self.profiles:
-            if p["id"] == profile_id:
-                source = p
-                break
-        if not source:
-            return None
+        return self.delete_profiles([profile_id]) == 1
 
-        new_profile = self.create_profile(
-            name=f"{source['name']} (Copy)",
-            version=source["version"],
-            loader=source["loader"],
-            color=source["color"]
-        )
-
-        # Copy files from source to new profile directory
-        src_dir = self.get_instance_dir(profile_id)
-        dst_dir = self.get_instance_dir(new_profile["id"])
-        if os.path.exists(src_dir):
-            for subdir in self.INSTANCE_DIRS:
-                src_sub = os.path.join(src_dir, subdir)
-                dst_sub = os.path.join(dst_dir, subdir)
-                if os.path.exists(src_sub):
-                    try:
-                        shutil.copytree(src_sub, dst_sub, dirs_exist_ok=True)
-                    except Exception as e:
-                        print(f"[ProfileManager] Error copying {subdir}: {e}")
+    def delete_profiles(self, profile_ids):
+        """Delete several profiles in one batch, always keeping at least one. Returns how many were deleted.
+        Instance directories are kept for safety — users can remove .minecraft/versions/<name>/ by hand."""
+        deleted = 0
+        with self.batch():
+            for profile_id in profile_ids:
+                if len(self._profiles) <= 1 or profile_id not in self._profiles:
+                    continue
+                del self._profiles[profile_id]
+                self._journal("delete", id=profile_id)
+                deleted += 1
+            if self.active_profile_id not in self._profiles:
+                self.set_active_profile(next(iter(self._profiles)) if self._profiles else None)
+        return deleted
+
+    def duplicate_profile(self, profile_id, exclude=DUPLICATE_EXCLUDE, progress_callback=None, cancel_event=None):
+        """Duplicate an existing profile including its directory.
+
+        Files are cloned with reflinks where the filesystem supports them. Otherwise archives
+        (mod jars, pack zips) are hardlinked and everything else is copied. Folders in exclude
+        are left empty. progress_callback(text, percent) reports progress. Runs off the UI thread."""
+        with self._lock:
+            source = self._profiles.get(profile_id)
+            if not source:
+                return None
 
+            # A name in use would share its instance directory
+            taken = {self._safe_name(p["name"]).lower() for p in self._profiles.values()}
+            name, n = f"{source['name']} (Copy)", 1
+            while self._safe_name(name).lower() in taken:
+                n += 1
+                name = f"{source['name']} (Copy {n})"
+
+            new_profile = self.create_profile(
+                name=name,
+                version=source["version"],
+                loader=source["loader"],
+                color=source["color"],
+                appcds=source.get("appcds", False)
+            )
+            src_dir = self.get_instance_dir(profile_id)
+            dst_dir = self.get_instance_dir(new_profile["id"])
+
+        try:
+            stats = clone_instance(src_dir, dst_dir, [d for d in self.INSTANCE_DIRS if d not in exclude],
+                                   progress_callback, cancel_event)
+        except InterruptedError:
+            # Don't leave a half-copied instance behind
+            with self._lock:
+                self.delete_profile(new_profile["id"])
+            shutil.rmtree(dst_dir, ignore_errors=True)
+            raise
+        print(f"[ProfileManager] Duplicated {source['name']}: {stats['files']} files, "
+              f"{stats['shared_bytes'] / 1048576:.1f} MB shared, {stats['copied_bytes'] / 1048576:.1f} MB copied")
         return new_profile
 
     def get_instance_dir(self, profile_id):
         """Get the game directory for a specific profile.
         Located at .minecraft/versions/<ProfileName>/"""
-        profile = None
-        for p in self.profiles:
-            if p["id"] == profile_id:
-                profile = p
-                break
+        profile = self._profiles.get(profile_id)
         if profile:
             return os.path.join(self.minecraft_dir, "versions", self._safe_name(profile["name"]))
         # Fallback
         return os.path.join(self.minecraft_dir, "versions", profile_id)
 
+    def instance_dirs(self):
+        """{profile id: instance directory} for every profile."""
+        return {pid: self.get_instance_dir(pid) for pid in self._profiles}
+
     def get_mods_dir(self, profile_id):
         """Get the mods directory for a specific profile."""
         return os.path.join(self.get_instance_dir(profile_id), "mods")
@@ -1,8 +1,9 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QComboBox, QPushButton
+    QComboBox, QPushButton, QCheckBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
+from .disk_usage import format_size
 
 FONT = "'Segoe UI', 'Helvetica Neue', Arial, sans-serif"
 C_GREEN = "#4ade80"
@@ -20,12 +21,29 @@ PROFILE_COLORS = [
 ]
 
 
+class DiskUsageThread(QThread):
+    """Runs a disk usage report off the UI thread."""
+    result_signal = pyqtSignal(dict)
+
+    def __init__(self, job, parent=None):
+        super().__init__(parent)
+        self.job = job
+
+    def run(self):
+        try:
+            self.result_signal.emit(self.job())
+        except Exception as e:
+            print(f"Disk usage failed: {e}")
+
+
 class ProfileEditorPanel(QWidget):
     """Embedded panel for creating or editing a profile."""
     closed = pyqtSignal()
     saved = pyqtSignal(dict)
 
-    def __init__(self, parent=None, profile=None, versions=None):
+    def __init__(self, parent=None, profile=None, versions=None, usage_job=None):
+        """usage_job, when editing, returns the profile's disk usage report (DiskUsage.report); it runs
+        in the background and fills in the disk usage line."""
         super().__init__(parent)
         self.profile = profile
         self.result_data = None
@@ -92,6 +110,22 @@ class ProfileEditorPanel(QWidget):
                 background-color: rgba(255,255,255,0.10);
                 border: 1px solid rgba(255,255,255,0.15);
             }}
+            QCheckBox {{
+                color: rgba(255,255,255,0.7);
+                spacing: 8px;
+                font-size: 13px;
+            }}
+            QCheckBox::indicator {{
+                width: 16px;
+                height: 16px;
+                background-color: rgba(255,255,255,0.05);
+                border: 1px solid rgba(255,255,255,0.15);
+                border-radius: 4px;
+            }}
+            QCheckBox::indicator:checked {{
+                background-color: {C_GREEN_D};
+                border-color: {C_GREEN};
+            }}
         """)
 
         layout = QVBoxLayout(self)
@@ -112,6 +146,19 @@ class ProfileEditorPanel(QWidget):
         title.setStyleSheet("font-size: 22px; font-weight: 700; color: white;")
         layout.addWidget(title)
 
+        # Disk usage, filled in once the background scan is done
+        self.usage_label = None
+        if is_edit and usage_job:
+            self.usage_label = QLabel("Disk usage: calculating...")
+            self.usage_label.setStyleSheet("color: rgba(255,255,255,0.45); font-size: 12px;")
+            self.usage_label.setWordWrap(True)
+            layout.addWidget(self.usage_label)
+            # Parented to the window, so closing the panel mid-scan doesn't destroy a running thread
+            self.usage_thread = DiskUsageThread(usage_job, parent)
+            self.usage_thread.finished.connect(self.usage_thread.deleteLater)
+            self.usage_thread.result_signal.connect(self._show_usage)
+            self.usage_thread.start()
+
         # Field label style
         lbl_ss = "color: rgba(255,255,255,0.45); font-size: 10px; font-weight: 600; letter-spacing: 1.5px;"
 
@@ -160,6 +207,15 @@ class ProfileEditorPanel(QWidget):
 
         layout.addLayout(row)
 
+        # AppCDS
+        self.appcds_check = QCheckBox("Faster startup — build a class data sharing archive (Java 11+)")
+        self.appcds_check.setToolTip(
+            "Records the classes the game loads on the next launch and maps them from an archive afterwards.\n"
+            "Rebuilt automatically when mods, the loader or Java change."
+        )
+        self.appcds_check.setChecked(bool(is_edit and profile.get("appcds")))
+        layout.addWidget(self.appcds_check)
+
         # Color picker
         lbl_color = QLabel("COLOR")
         lbl_color.setStyleSheet(lbl_ss)
@@ -214,6 +270,20 @@ class ProfileEditorPanel(QWidget):
 
         layout.addLayout(btn_row)
 
+    def _show_usage(self, report):
+        usage = report["profiles"].get(self.profile["id"])
+        if not usage:
+            return
+
+        def line(label, sizes):
+            parts = [f"{name} {format_size(size)}" for name, size in sizes.items()
+                     if name not in ("total", "store") and size]
+            return f"{label}: {format_size(sizes['total'])}" + (f" — {', '.join(parts)}" if parts else "")
+
+        # Apparent sizes: files hardlinked from the object store count wherever they appear
+        self.usage_label.setText(line("Disk usage (apparent size)", usage) + "\n"
+                                 + line("Shared with other profiles (apparent size)", report["shared"]))
+
     def _on_close(self):
         self.closed.emit()
 
@@ -246,6 +316,7 @@ class ProfileEditorPanel(QWidget):
             "version": self.version_combo.currentText(),
             "loader": self.loader_combo.currentText(),
             "color": self.selected_color,
+            "appcds": self.appcds_check.isChecked(),
         }
         self.saved.emit(self.result_data)
         self.closed.emit()
@@ -0,0 +1,239 @@
+"""
+Batch provisioning — install many (version, loader) targets in one go.
+
+Pressing Play once per combination installs each version on its own:
+metadata is fetched one version at a time and every install ends in its
+own tail of slow files. The provisioner instead resolves every version
+JSON and asset index concurrently, merges all plans into one deduplicated
+download (libraries and assets several versions share are fetched once)
+and spreads it over the install engine's worker pool. Java runtimes are
+installed concurrently too. Modloaders are installed last, one at a time:
+minecraft-launcher-lib writes their shared libraries in place, so two
+loader installs must not run side by side.
+
+Every target reports what installing it alone would have cost and the
+share of that the batch saved. Its stand-alone cost is its own metadata
+time, the download time of every missing file its plan needs (at the
+batch's measured throughput), its natives, runtime and loader time. The
+batch's wall-clock time is split over the targets in proportion to their
+charged cost, which counts a shared file's download only for the first
+target needing it.
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import minecraft_launcher_lib
+
+from .installer import DownloadCancelled
+
+METADATA_WORKERS = 8
+
+
+def parse_target(text):
+    """"1.21.4" → ("1.21.4", "Vanilla"); "1.20.1:Fabric" → ("1.20.1", "Fabric")."""
+    version, _, loader = text.partition(":")
+    return version.strip(), (loader.strip() or "Vanilla")
+
+
+class Provisioner:
+    """Installs a list of (version, loader) targets through one LauncherBackend."""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.engine = backend.installer
+
+    def _timed(self, fn, *args):
+        start = time.perf_counter()
+        result = fn(*args)
+        return result, time.perf_counter() - start
+
+    def _resolve(self, version_id):
+        """(version_data, plan) of a vanilla version, fetching its JSON and asset index if needed."""
+        return self.engine.resolve(version_id)
+
+    def provision(self, targets, progress_callback=None, cancel_event=None):
+        """Install every (version, loader) target. Returns the batch report:
+        {"targets": [...], "files", "bytes", "linked", "seconds", "sequential_seconds"}.
+        A target that fails carries an "error" and does not stop the others."""
+        callback = progress_callback or (lambda text, value: None)
+        start = time.perf_counter()
+        targets = list(dict.fromkeys(targets))
+        results = [{"version": v, "loader": l, "metadata": 0.0, "fetch_bytes": 0, "own_bytes": 0, "files": 0,
+                    "shared_files": 0, "finish": 0.0, "loader_seconds": 0.0, "error": None}
+                   for v, l in targets]
+        versions = list(dict.fromkeys(v for v, _ in targets))
+        # A version JSON marks a version as installed: the ones this batch fetches are removed again
+        # for every version that doesn't get all the way through steps 1-3
+        fresh_json = {v for v in versions if not os.path.exists(self.engine.version_json_path(v))}
+        incomplete = set(fresh_json)
+        try:
+            stats, linked = self._install_versions(targets, results, versions, fresh_json, incomplete,
+                                                   callback, cancel_event)
+        finally:
+            self._drop_incomplete(incomplete)
+            for version in versions:
+                self.backend.registry.invalidate(version)
+        if stats is None:
+            return self._report(results, {"files": 0, "bytes": 0, "seconds": 0.0}, linked, start)
+
+        # 4. Modloaders, one at a time
+        loader_targets = [i for i, (v, l) in enumerate(targets) if l != "Vanilla" and not results[i]["error"]]
+        for n, i in enumerate(loader_targets):
+            if cancel_event is not None and cancel_event.is_set():
+                raise DownloadCancelled()
+            version, loader = targets[i]
+            callback(f"Installing {loader} for {version} ({n + 1}/{len(loader_targets)})...",
+                     n * 100 // len(loader_targets))
+            launch_version, seconds = self._timed(self.backend.resolve_loader, version, loader)
+            results[i]["loader_seconds"] = seconds
+            if launch_version is None:
+                results[i]["error"] = f"could not install {loader}"
+            else:
+                results[i]["launch_version"] = launch_version
+        for i, (version, loader) in enumerate(targets):
+            if loader == "Vanilla" and not results[i]["error"]:
+                results[i]["launch_version"] = version
+
+        return self._report(results, stats, linked, start)
+
+    def _install_versions(self, targets, results, versions, fresh_json, incomplete, callback, cancel_event):
+        """Steps 1-3 of provision: metadata, the merged download, natives and Java runtimes.
+        Versions that complete are removed from incomplete. Returns (download stats, linked files);
+        the stats are None when the download failed, which fails every target."""
+        # 1. Metadata for every version at once
+        callback(f"Resolving {len(versions)} version(s)...", 0)
+        if fresh_json and self.engine.manifest:
+            # Warm the manifest once rather than from every worker
+            self.engine.manifest.find(next(iter(fresh_json)))
+        resolved = {}
+        with ThreadPoolExecutor(max_workers=METADATA_WORKERS) as pool:
+            futures = {v: pool.submit(self._timed, self._resolve, v) for v in versions}
+            for version, future in futures.items():
+                try:
+                    resolved[version] = future.result()
+                except Exception as e:
+                    self._fail(results, targets, version, str(e))
+        if cancel_event is not None and cancel_event.is_set():
+            raise DownloadCancelled()
+
+        # 2. One deduplicated download for every plan; the first target needing a file is charged for it
+        merged, owner, users = {}, {}, {}
+        for i, (version, _) in enumerate(targets):
+            if version not in resolved:
+                continue
+            (_, plan), seconds = resolved[version]
+            results[i]["metadata"] = seconds
+            for task in plan:
+                path = task["path"]
+                users.setdefault(path, set()).add(version)
+                if path not in merged:
+                    merged[path] = task
+                    owner[path] = i
+                results[i]["files"] += 1
+        for path, version_users in users.items():
+            if len(version_users) > 1:
+                for i, (version, _) in enumerate(targets):
+                    if version in version_users:
+                        results[i]["shared_files"] += 1
+
+        missing = [t for t in merged.values() if self.engine.needs_download(t)]
+        to_fetch, linked, linked_bytes = self.engine.link_from_store(missing)
+        shared = sum(1 for t in to_fetch if len(users[t["path"]]) > 1)
+        print(f"[Provision] {len(targets)} target(s): {len(merged)} distinct files, {len(missing)} missing, "
+              f"{linked} linked from the shared store, {shared} fetched once for several versions")
+
+        stats = {"files": 0, "bytes": 0, "seconds": 0.0}
+        if to_fetch:
+            try:
+                stats = self.engine.download(to_fetch, callback, status="Provisioning:", cancel_event=cancel_event)
+            except DownloadCancelled:
+                # Keep what did arrive so the next attempt only fetches the rest
+                self.engine.adopt_into_store([t for t in to_fetch if not self.engine.needs_download(t)])
+                raise
+            except Exception as e:
+                # Keep what did arrive; the versions stay uninstalled and report the failure
+                self.engine.adopt_into_store([t for t in to_fetch if not self.engine.needs_download(t)])
+                for result in results:
+                    result["error"] = result["error"] or str(e)
+                return None, linked
+            self.engine.adopt_into_store(to_fetch)
+        for task in to_fetch:
+            results[owner[task["path"]]]["fetch_bytes"] += task["size"]
+            for i, (version, _) in enumerate(targets):
+                if version in users[task["path"]]:
+                    results[i]["own_bytes"] += task["size"]
+
+        # 3. Natives per version, Java runtimes once per component (concurrently)
+        callback("Extracting natives and installing Java runtimes...", 100)
+        components = {}
+        for version, ((version_data, plan), _) in resolved.items():
+            try:
+                _, seconds = self._timed(self.engine.extract_natives, version_data, plan)
+            except Exception as e:
+                self._fail(results, targets, version, f"could not extract natives: {e}")
+                continue
+            self._charge(results, targets, version, seconds)
+            component = version_data.get("javaVersion", {}).get("component")
+            if component:
+                components.setdefault(component, []).append(version)
+            else:
+                incomplete.discard(version)
+        with ThreadPoolExecutor(max_workers=max(1, len(components))) as pool:
+            futures = {c: pool.submit(self._timed, minecraft_launcher_lib.runtime.install_jvm_runtime,
+                                      c, self.engine.minecraft_directory) for c in components}
+            for component, future in futures.items():
+                component_versions = components[component]
+                try:
+                    _, seconds = future.result()
+                except Exception as e:
+                    print(f"[Provision] Java runtime {component} failed: {e}")
+                    for version in component_versions:
+                        self._fail(results, targets, version, f"Java runtime {component} failed: {e}")
+                    continue
+                self._charge(results, targets, component_versions[0], seconds)
+                incomplete.difference_update(component_versions)
+        return stats, linked
+
+    @staticmethod
+    def _fail(results, targets, version, error):
+        """Mark every target of a version as failed, keeping the first error."""
+        for i, (v, _) in enumerate(targets):
+            if v == version:
+                results[i]["error"] = results[i]["error"] or error
+
+    @staticmethod
+    def _charge(results, targets, version, seconds):
+        """Book per-version work on the first target of that version."""
+        for i, (v, _) in enumerate(targets):
+            if v == version:
+                results[i]["finish"] += seconds
+                return
+
+    def _drop_incomplete(self, versions):
+        """Remove the version JSONs this batch fetched for versions it didn't finish installing."""
+        for version in versions:
+            path = self.engine.version_json_path(version)
+            if os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def _report(results, stats, linked, start):
+        seconds = time.perf_counter() - start
+        throughput = stats["bytes"] / stats["seconds"] if stats["bytes"] and stats["seconds"] else 0
+        download = lambda size: size / throughput if throughput else 0.0
+        charged = []
+        for result in results:
+            fixed = result["metadata"] + result["finish"] + result["loader_seconds"]
+            # Alone, a target downloads every file it needs; in the batch a shared file is paid for once
+            result["seconds_alone"] = fixed + download(result["own_bytes"])
+            charged.append(fixed + download(result["fetch_bytes"]))
+        sequential = sum(r["seconds_alone"] for r in results)
+        total_charged = sum(charged)
+        for result, cost in zip(results, charged):
+            share = seconds * cost / total_charged if total_charged else 0.0
+            result["saved"] = max(0.0, result["seconds_alone"] - share)
+            for key in ("metadata", "fetch_bytes", "own_bytes", "finish", "loader_seconds"):
+                del result[key]
+        return {"targets": results, "files": stats["files"], "bytes": stats["bytes"], "linked": linked,
+                "seconds": seconds, "sequential_seconds": sequential}
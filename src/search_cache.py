@@ -0,0 +1,112 @@
+"""
+On-disk cache of mod search results.
+
+Results are stored in SQLite, keyed by (source, query, facets, sort index,
+offset), so reopening the mod manager or flipping back to a sort order or
+category seen before shows its results at once. An entry younger than the
+TTL is used as is; an older one is still shown, while the mod manager
+fetches the results again in the background and only redraws the list if
+they changed (stale-while-revalidate). Entries nobody asked for in
+MAX_AGE are dropped.
+
+The backends report a failed search as an empty list, so empty results are
+neither stored nor allowed to replace stored ones — a search made offline
+keeps showing what was found last time.
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import threading
+
+DEFAULT_TTL = 10 * 60
+MAX_AGE = 7 * 24 * 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS searches (
+    source TEXT NOT NULL,
+    query TEXT NOT NULL,
+    facets TEXT NOT NULL,
+    sort_index TEXT NOT NULL,
+    "offset" INTEGER NOT NULL,
+    hits TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    fetched REAL NOT NULL,
+    PRIMARY KEY (source, query, facets, sort_index, "offset")
+) WITHOUT ROWID
+"""
+
+
+def search_key(source, query, version=None, loader=None, category=None, index="relevance", offset=0, limit=20):
+    """Cache key of one results page. Facets are every filter that changes the hits."""
+    facets = json.dumps({"version": version, "loader": (loader or "").lower() or None,
+                         "category": category, "limit": limit}, sort_keys=True, separators=(",", ":"))
+    return (source, (query or "").strip(), facets, index, int(offset))
+
+
+class SearchCache:
+    """Search results in SQLite with a TTL. Safe to use from the UI and search threads."""
+
+    def __init__(self, db_file, ttl=DEFAULT_TTL, clock=time.time):
+        self.db_file = db_file
+        self.ttl = ttl
+        self._clock = clock
+        self._conn = None
+        self._lock = threading.Lock()
+
+    def _db(self):
+        """The connection, opened (and pruned) on first use so the launcher starts without touching the file."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_file)), exist_ok=True)
+            self._conn = sqlite3.connect(self.db_file, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.execute("DELETE FROM searches WHERE fetched < ?", (self._clock() - MAX_AGE,))
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key):
+        """(hits, fresh) for a key, or None when it was never stored. fresh is False past the TTL."""
+        try:
+            with self._lock:
+                row = self._db().execute(
+                    'SELECT hits, fetched FROM searches WHERE source=? AND query=? AND facets=? '
+                    'AND sort_index=? AND "offset"=?', key).fetchone()
+        except sqlite3.Error as e:
+            print(f"[SearchCache] Error reading cache: {e}")
+            return None
+        if row is None:
+            return None
+        return json.loads(row[0]), self._clock() - row[1] < self.ttl
+
+    def put(self, key, hits):
+        """Store fresh results. Returns True if they differ from the stored ones (or none were stored)."""
+        if not hits:
+            return False
+        data = json.dumps(hits, sort_keys=True, separators=(",", ":"))
+        digest = hashlib.sha1(data.encode("utf-8")).hexdigest()
+        try:
+            with self._lock:
+                db = self._db()
+                row = db.execute('SELECT digest FROM searches WHERE source=? AND query=? AND facets=? '
+                                 'AND sort_index=? AND "offset"=?', key).fetchone()
+                db.execute('INSERT OR REPLACE INTO searches (source, query, facets, sort_index, "offset", hits, '
+                           'digest, fetched) VALUES (?, ?, ?, ?, ?, ?, ?, ?)', (*key, data, digest, self._clock()))
+                db.commit()
+        except sqlite3.Error as e:
+            print(f"[SearchCache] Error saving cache: {e}")
+            return True
+        return row is None or row[0] != digest
+
+    def clear(self):
+        with self._lock:
+            self._db().execute("DELETE FROM searches")
+            self._db().commit()
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -0,0 +1,181 @@
+"""
+The launcher's settings, loaded once per process.
+
+Settings used to be read from and rewritten to ``settings.json`` in the
+current directory by every panel that touched them. Now one Settings
+object holds them in memory with typed defaults, tells subscribers about
+changes through plain callbacks (no Qt, so the CLI can use it too) and
+writes the file atomically, a short while after the last change so a
+burst of changes costs one write. The file lives in the per-user config
+directory; a settings.json left in the current directory by older
+versions is migrated on first load.
+"""
+import os
+import sys
+import json
+import atexit
+import threading
+from .jvm_tuning import DEFAULT_PROFILE
+from .launch_scheduler import DEFAULT_BUDGET_PERCENT
+
+# key → (type, default)
+SCHEMA = {
+    "username": (str, ""),
+    "version": (str, ""),
+    "loader": (str, ""),
+    "active_profile": (str, ""),
+    "max_memory": (int, 2048),
+    "java_path": (str, ""),
+    "width": (int, 854),
+    "height": (int, 480),
+    "fullscreen": (bool, False),
+    "jvm_profile": (str, DEFAULT_PROFILE),
+    "ram_budget_percent": (int, DEFAULT_BUDGET_PERCENT),
+}
+
+# The settings that shape the launch command (and so the launch fingerprint)
+LAUNCH_KEYS = ["max_memory", "java_path", "width", "height", "fullscreen", "jvm_profile"]
+
+SAVE_DELAY = 0.5  # seconds of quiet before changes are written
+LEGACY_FILE = "settings.json"
+
+
+def config_dir():
+    """Per-user config directory: %APPDATA%\\QLauncher, ~/Library/Application Support/QLauncher
+    or $XDG_CONFIG_HOME/qlauncher. QLAUNCHER_CONFIG_DIR overrides it."""
+    override = os.environ.get("QLAUNCHER_CONFIG_DIR")
+    if override:
+        return override
+    if sys.platform == "win32" and os.environ.get("APPDATA"):
+        return os.path.join(os.environ["APPDATA"], "QLauncher")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Application Support/QLauncher")
+    return os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "qlauncher")
+
+
+def _coerce(key, value):
+    """Return value as the schema type of key, or the default if it can't be converted."""
+    kind, default = SCHEMA[key]
+    if value is None:
+        return default
+    try:
+        if kind is bool:
+            return value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes", "on")
+        return kind(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class Settings:
+    """Typed, in-memory settings with change callbacks and debounced atomic saves."""
+
+    def __init__(self, path=None, save_delay=SAVE_DELAY):
+        self.path = path or os.path.join(config_dir(), "settings.json")
+        self.save_delay = save_delay
+        self._values = {}
+        self._extra = {}          # unknown keys found in the file, written back untouched
+        self._listeners = []
+        self._lock = threading.RLock()
+        self._timer = None
+        self._dirty = False
+        self._load()
+        atexit.register(self.flush)
+
+    def _load(self):
+        """Load the settings file, migrating a legacy settings.json from the current directory."""
+        stored = {}
+        source = self.path if os.path.exists(self.path) else LEGACY_FILE
+        try:
+            if os.path.exists(source):
+                with open(source, "r") as f:
+                    stored = json.load(f)
+        except Exception as e:
+            print(f"[Settings] Error loading {source}: {e}")
+        self._values = {key: _coerce(key, stored.get(key)) for key in SCHEMA}
+        self._extra = {key: value for key, value in stored.items() if key not in SCHEMA}
+        if stored and source == LEGACY_FILE:
+            print(f"[Settings] Migrating {os.path.abspath(LEGACY_FILE)} to {self.path}")
+            self._dirty = True
+            self.flush()
+
+    def get(self, key):
+        with self._lock:
+            return self._values[key]
+
+    def __getitem__(self, key):
+        return self.get(key)
+
+    def set(self, key, value):
+        """Set one value; subscribers are called and a save is scheduled if it changed."""
+        self.update(**{key: value})
+
+    def update(self, **values):
+        """Set several values at once. Unknown keys raise KeyError."""
+        changed = []
+        with self._lock:
+            for key, value in values.items():
+                value = _coerce(key, value)
+                if self._values[key] != value:
+                    self._values[key] = value
+                    changed.append((key, value))
+            if changed:
+                self._dirty = True
+                self._schedule_save()
+        for key, value in changed:
+            for callback in list(self._listeners):
+                callback(key, value)
+
+    def launch_settings(self):
+        """Snapshot of the settings that shape the launch command."""
+        with self._lock:
+            return {key: self._values[key] for key in LAUNCH_KEYS}
+
+    def subscribe(self, callback):
+        """Call callback(key, value) after every change. Returns callback, for unsubscribe."""
+        self._listeners.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _schedule_save(self):
+        if self._timer is not None:
+            self._timer.cancel()
+        if self.save_delay <= 0:
+            self.flush()
+            return
+        self._timer = threading.Timer(self.save_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self):
+        """Write pending changes now (temp file + rename, so a crash never leaves half a file)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            self._dirty = False
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                tmp = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp, "w") as f:
+                    json.dump(dict(self._extra, **self._values), f, indent=4)
+                os.replace(tmp, self.path)
+            except Exception as e:
+                print(f"[Settings] Error saving settings: {e}")
+
+
+_instance = None
+_instance_lock = threading.Lock()
+
+
+def get_settings():
+    """The process-wide Settings, loaded on first use."""
+    global _instance
+    with _instance_lock:
+        if _instance is None:
+            _instance = Settings()
+        return _instance
@@ -1,21 +1,43 @@
 from PyQt5.QtWidgets import (
     QWidget, QVBoxLayout, QLabel, QSlider, QPushButton, QHBoxLayout, 
-    QSpinBox, QLineEdit, QCheckBox, QFileDialog, QGroupBox
+    QSpinBox, QLineEdit, QCheckBox, QFileDialog, QGroupBox, QComboBox
 )
-from PyQt5.QtCore import Qt, pyqtSignal
-import json
+from PyQt5.QtCore import Qt, QThread, pyqtSignal
 import os
+from .jvm_tuning import PROFILES, DEFAULT_JAVA_MAJOR, build_flags, detect_hardware
+from .settings import get_settings
 
 FONT = "'Segoe UI', 'Helvetica Neue', Arial, sans-serif"
 C_GREEN = "#4ade80"
 C_GREEN_D = "#22c55e"
 C_GREEN_DD = "#16a34a"
 
+class JvmFlagsThread(QThread):
+    """Validates the flags of a tuning profile against a Java executable off the UI thread."""
+    result_signal = pyqtSignal(tuple, list, object)   # (profile, memory, java), accepted flags, Java major
+
+    def __init__(self, jvm_tuner, request, parent=None):
+        super().__init__(parent)
+        self.jvm_tuner = jvm_tuner
+        self.request = request
+
+    def run(self):
+        profile, max_memory, java = self.request
+        try:
+            major = self.jvm_tuner.java_major(java)
+            self.result_signal.emit(self.request, self.jvm_tuner.flags_for(profile, max_memory, java, major), major)
+        except Exception as e:
+            print(f"JVM flag check failed: {e}")
+
+
 class SettingsPanel(QWidget):
     closed = pyqtSignal()
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, jvm_tuner=None):
         super().__init__(parent)
+        self.jvm_tuner = jvm_tuner
+        self._flags_request = None   # (profile, memory, java) the preview should show
+        self._flags_thread = None
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.setObjectName("settingsRoot")
         self.setStyleSheet(f"""
@@ -54,6 +76,19 @@ class SettingsPanel(QWidget):
                 border: 1px solid rgba(255,255,255,0.10);
                 border-radius: 8px;
             }}
+            QComboBox {{
+                padding: 8px 10px;
+                background-color: rgba(255,255,255,0.05);
+                color: white;
+                font-size: 13px;
+                border: 1px solid rgba(255,255,255,0.10);
+                border-radius: 8px;
+            }}
+            QComboBox QAbstractItemView {{
+                background-color: #1a1a1a;
+                color: white;
+                selection-background-color: rgba(74, 222, 128, 0.2);
+            }}
             QSpinBox::up-button, QSpinBox::down-button {{
                 background: transparent;
                 border: none;
@@ -172,6 +207,7 @@ class SettingsPanel(QWidget):
         java_path_layout.setSpacing(8)
         self.java_path_input = QLineEdit()
         self.java_path_input.setPlaceholderText("Auto-detect (leave empty)")
+        self.java_path_input.editingFinished.connect(self.update_jvm_flags)
         java_path_layout.addWidget(self.java_path_input)
         
         self.browse_java_button = QPushButton("Browse")
@@ -198,6 +234,36 @@ class SettingsPanel(QWidget):
         self.ram_value_label.setAlignment(Qt.AlignCenter)
         self.ram_value_label.setStyleSheet(f"color: {C_GREEN}; font-weight: 600; font-size: 15px;")
         java_layout.addWidget(self.ram_value_label)
+
+        # JVM tuning profile
+        lbl_profile = QLabel("GC Tuning Profile")
+        lbl_profile.setStyleSheet("color: rgba(255,255,255,0.45); font-size: 11px; font-weight: 600; letter-spacing: 1px; margin-top: 8px;")
+        java_layout.addWidget(lbl_profile)
+
+        self.jvm_profile_combo = QComboBox()
+        for key, label in PROFILES.items():
+            self.jvm_profile_combo.addItem(label, key)
+        self.jvm_profile_combo.currentIndexChanged.connect(self.update_jvm_flags)
+        java_layout.addWidget(self.jvm_profile_combo)
+
+        self.hardware = detect_hardware()
+        self.jvm_flags_label = QLabel()
+        self.jvm_flags_label.setWordWrap(True)
+        self.jvm_flags_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        self.jvm_flags_label.setStyleSheet("color: rgba(255,255,255,0.45); font-family: 'Consolas', monospace; font-size: 11px;")
+        java_layout.addWidget(self.jvm_flags_label)
+        self.ram_slider.valueChanged.connect(self.update_jvm_flags)
+
+        # Share of RAM several running instances may take together
+        lbl_budget = QLabel("Side-by-Side Instances: RAM Budget")
+        lbl_budget.setStyleSheet("color: rgba(255,255,255,0.45); font-size: 11px; font-weight: 600; letter-spacing: 1px; margin-top: 8px;")
+        java_layout.addWidget(lbl_budget)
+        self.ram_budget_input = QSpinBox()
+        self.ram_budget_input.setRange(10, 100)
+        self.ram_budget_input.setSuffix(" % of physical RAM")
+        self.ram_budget_input.setToolTip("Further launches wait while the memory allocations of the running\n"
+                                         "instances would add up to more than this.")
+        java_layout.addWidget(self.ram_budget_input)
         
         java_group.setLayout(java_layout)
         layout.addWidget(java_group)
@@ -278,6 +344,7 @@ class SettingsPanel(QWidget):
         layout.addLayout(button_layout)
 
         self.load_settings()
+        self.update_jvm_flags()
 
     def _on_close(self):
         self.closed.emit()
@@ -286,10 +353,59 @@ class SettingsPanel(QWidget):
         gb = value / 1024
         self.ram_value_label.setText(f"{value} MB ({gb:.1f} GB)")
 
+    def update_jvm_flags(self, *_):
+        """Preview the flags of the selected profile for this machine, validated against the
+        configured Java once the check comes back."""
+        profile = self.jvm_profile_combo.currentData()
+        memory = self.ram_slider.value()
+        java = self.java_path_input.text().strip()
+        flags = build_flags(profile, memory, self.hardware["cores"], self.hardware["total_ram_mb"])
+        if self.jvm_tuner is None or not java or not os.path.isfile(java):
+            # Auto-detect: the Java depends on the version, so the launch checks the flags
+            self._flags_request = None
+            self._show_jvm_flags(f"Java {DEFAULT_JAVA_MAJOR}+ (checked against the game's Java at launch)", flags)
+            return
+        self._show_jvm_flags(f"checking against {java}...", flags)
+        self._flags_request = (profile, memory, java)
+        if self._flags_thread is None:
+            self._check_jvm_flags()
+
+    def _check_jvm_flags(self):
+        # One check at a time; a newer request is picked up when the running one returns
+        # Parented to the window, so closing the panel mid-check doesn't destroy a running thread
+        self._flags_thread = JvmFlagsThread(self.jvm_tuner, self._flags_request, self.parent())
+        self._flags_thread.finished.connect(self._flags_thread.deleteLater)
+        self._flags_thread.result_signal.connect(self._on_jvm_flags_checked)
+        self._flags_thread.start()
+
+    def _on_jvm_flags_checked(self, request, accepted, major):
+        self._flags_thread = None
+        if request != self._flags_request:
+            if self._flags_request is not None:
+                self._check_jvm_flags()
+            return
+        profile, memory, java = request
+        java_major = major or DEFAULT_JAVA_MAJOR
+        flags = build_flags(profile, memory, self.hardware["cores"], self.hardware["total_ram_mb"], java_major)
+        if major is None:
+            self._show_jvm_flags(f"{java} could not be run — the flags are checked at launch", flags)
+            return
+        dropped = [f for f in flags if f not in accepted]
+        note = f"\nRejected by this Java and left out: {' '.join(dropped)}" if dropped else ""
+        self._show_jvm_flags(f"Java {major} at {java}", accepted, note)
+
+    def _show_jvm_flags(self, java_text, flags, note=""):
+        ram = self.hardware["total_ram_mb"]
+        ram_text = f"{ram / 1024:.0f} GB RAM" if ram else "unknown RAM"
+        self.jvm_flags_label.setText(
+            f"{self.hardware['cores']} cores, {ram_text}, {java_text}:\n{' '.join(flags)}{note}"
+        )
+
     def browse_java(self):
         filename, _ = QFileDialog.getOpenFileName(self, "Select Java Executable", "", "Executables (*.exe);;All Files (*)")
         if filename:
             self.java_path_input.setText(filename)
+            self.update_jvm_flags()
 
     def open_game_folder(self):
         try:
@@ -301,35 +417,25 @@ class SettingsPanel(QWidget):
             print(f"Error opening folder: {e}")
 
     def load_settings(self):
-        try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    settings = json.load(f)
-                    ram = settings.get("max_memory", 2048)
-                    self.ram_slider.setValue(int(ram))
-                    self.java_path_input.setText(settings.get("java_path", ""))
-                    self.width_input.setValue(settings.get("width", 854))
-                    self.height_input.setValue(settings.get("height", 480))
-                    self.fullscreen_check.setChecked(settings.get("fullscreen", False))
-        except Exception as e:
-            print(f"Error loading settings: {e}")
+        settings = get_settings()
+        self.ram_slider.setValue(settings["max_memory"])
+        self.java_path_input.setText(settings["java_path"])
+        self.width_input.setValue(settings["width"])
+        self.height_input.setValue(settings["height"])
+        self.fullscreen_check.setChecked(settings["fullscreen"])
+        self.ram_budget_input.setValue(settings["ram_budget_percent"])
+        index = self.jvm_profile_combo.findData(settings["jvm_profile"])
+        if index >= 0:
+            self.jvm_profile_combo.setCurrentIndex(index)
 
     def save_settings(self):
-        try:
-            settings = {}
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    settings = json.load(f)
-            
-            settings["max_memory"] = self.ram_slider.value()
-            settings["java_path"] = self.java_path_input.text()
-            settings["width"] = self.width_input.value()
-            settings["height"] = self.height_input.value()
-            settings["fullscreen"] = self.fullscreen_check.isChecked()
-            
-            with open("settings.json", "w") as f:
-                json.dump(settings, f, indent=4)
-                
-            self.closed.emit()
-        except Exception as e:
-            print(f"Error saving settings: {e}")
+        get_settings().update(
+            max_memory=self.ram_slider.value(),
+            java_path=self.java_path_input.text(),
+            width=self.width_input.value(),
+            height=self.height_input.value(),
+            fullscreen=self.fullscreen_check.isChecked(),
+            jvm_profile=self.jvm_profile_combo.currentData(),
+            ram_budget_percent=self.ram_budget_input.value(),
+        )
+        self.closed.emit()
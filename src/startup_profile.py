@@ -0,0 +1,119 @@
+"""
+Startup profiling — ``python main.py --profile-startup``.
+
+When enabled, every module import is timed (inclusive, and exclusive of
+the imports it triggers) and the launcher's init phases are timed through
+``span()``. Milestones such as the first painted frame and the moment the
+window becomes interactive are stamped with ``mark()``. All times are
+measured from the moment this module was imported, which main.py does
+first. Disabled (the default), span() and mark() cost a function call.
+
+Qt-free, so the CLI and benchmarks can use it too.
+"""
+import sys
+import time
+import builtins
+import importlib.util
+from contextlib import contextmanager
+
+# The window must be usable this soon after the process started its Python code
+TTI_TARGET_MS = 800
+
+_T0 = time.perf_counter()
+
+
+class StartupProfiler:
+    """Import, span and milestone timings of one process start."""
+
+    def __init__(self):
+        self.enabled = False
+        self.imports = {}      # module → [inclusive seconds, exclusive seconds]
+        self.spans = []        # (name, start, seconds)
+        self.marks = {}        # milestone → seconds since _T0
+        self._stack = []       # child time accumulated per import in progress
+        self._original_import = None
+
+    def enable(self):
+        """Start timing imports. Call as early as possible."""
+        if self.enabled:
+            return
+        self.enabled = True
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._timed_import
+
+    def disable(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+        self.enabled = False
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self._original_import
+        try:
+            package = globals.get("__package__") if level and globals else None
+            module = importlib.util.resolve_name("." * level + name, package) if level else name
+        except (ImportError, ValueError):
+            module = name
+        if module in sys.modules:
+            return original(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            inclusive = time.perf_counter() - start
+            children = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += inclusive
+            self.imports[module] = [inclusive, inclusive - children]
+
+    @contextmanager
+    def span(self, name):
+        """Time an init phase."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.spans.append((name, start - _T0, time.perf_counter() - start))
+
+    def mark(self, name):
+        """Stamp a milestone (only the first stamp of a name counts). Returns seconds since start."""
+        seconds = time.perf_counter() - _T0
+        if self.enabled:
+            self.marks.setdefault(name, seconds)
+        return seconds
+
+    def report(self, top=15):
+        """Text report: slowest imports, init spans in order, milestones."""
+        lines = [f"Startup profile (ms since Python started running main.py)"]
+        if self.imports:
+            lines.append("")
+            lines.append(f"Slowest imports ({len(self.imports)} modules, top {top} by own time):")
+            lines.append(f"  {'own':>7} {'total':>7}  module")
+            ranked = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+            for module, (inclusive, exclusive) in ranked[:top]:
+                lines.append(f"  {exclusive * 1000:>7.1f} {inclusive * 1000:>7.1f}  {module}")
+        if self.spans:
+            lines.append("")
+            lines.append("Init phases:")
+            for name, start, seconds in self.spans:
+                lines.append(f"  {start * 1000:>7.0f} +{seconds * 1000:>6.1f}  {name}")
+        if self.marks:
+            lines.append("")
+            lines.append("Milestones:")
+            for name, seconds in sorted(self.marks.items(), key=lambda item: item[1]):
+                lines.append(f"  {seconds * 1000:>7.0f}  {name}")
+            if "interactive" in self.marks:
+                tti = self.marks["interactive"] * 1000
+                verdict = "within" if tti <= TTI_TARGET_MS else "OVER"
+                lines.append(f"Time to interactive {tti:.0f} ms — {verdict} the {TTI_TARGET_MS} ms target")
+        return "\n".join(lines)
+
+
+profiler = StartupProfiler()
+span = profiler.span
+mark = profiler.mark
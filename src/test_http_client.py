@@ -0,0 +1,114 @@
+from src.http_client import TokenBucket, HttpClient, BACKOFF_BASE
+from requests.structures import CaseInsensitiveDict
+import requests
+import pytest
+import io
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers = CaseInsensitiveDict(headers or {})
+    response._content = b""
+    response.raw = io.BytesIO(b"")
+    return response
+
+class FakeSession:
+    """Answers requests from a script of responses and exceptions."""
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    def request(self, method, url, **kwargs):
+        self.calls += 1
+        outcome = self.script.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+def _client(script, clock, retries=3):
+    client = HttpClient(retries=retries, clock=clock, sleep=clock.sleep)
+    client.session = FakeSession(script)
+    return client
+
+def test_bucket_bursts_then_paces():
+    clock = FakeClock()
+    bucket = TokenBucket(2, 1.0, clock, clock.sleep)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+    assert bucket.acquire() == pytest.approx(1.0)
+    # Idle time refills, but never past capacity
+    clock.now += 10
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1.0)
+
+def test_bucket_waits_for_the_window_reset_when_nothing_is_left():
+    clock = FakeClock()
+    bucket = TokenBucket(300, 5.0, clock, clock.sleep)
+    bucket.observe(limit=300, remaining=0, reset=12)
+    assert bucket.acquire() == pytest.approx(12.0)
+
+def test_bucket_resyncs_to_the_servers_remaining_count():
+    clock = FakeClock()
+    bucket = TokenBucket(300, 5.0, clock, clock.sleep)
+    bucket.observe(limit=300, remaining=1, reset=30)
+    assert bucket.acquire() == 0.0
+    assert bucket.acquire() == pytest.approx(1 / 5.0)
+
+def test_retries_server_errors_with_jittered_backoff():
+    clock = FakeClock()
+    client = _client([_response(503), _response(502), _response(200)], clock)
+    assert client.get("https://api.example.com/x").status_code == 200
+    assert client.session.calls == 3
+    assert client.stats["retries"] == 2
+    # Full jitter: each delay is somewhere below the exponential ceiling of its attempt
+    assert 0 <= clock.slept[0] <= BACKOFF_BASE
+    assert 0 <= clock.slept[1] <= BACKOFF_BASE * 2
+
+def test_retry_after_wins_over_backoff():
+    clock = FakeClock()
+    client = _client([_response(429, {"Retry-After": "7"}), _response(200)], clock)
+    assert client.get("https://api.example.com/x").status_code == 200
+    assert clock.slept == [7.0]
+
+def test_gives_up_after_the_retries():
+    clock = FakeClock()
+    client = _client([_response(500)] * 3, clock, retries=2)
+    assert client.get("https://api.example.com/x").status_code == 500
+    assert client.session.calls == 3
+
+    client = _client([requests.ConnectionError("down")] * 2, clock, retries=1)
+    with pytest.raises(requests.ConnectionError):
+        client.get("https://api.example.com/x")
+    assert client.session.calls == 2
+
+def test_post_is_not_retried():
+    clock = FakeClock()
+    client = _client([_response(503), _response(200)], clock)
+    assert client.request("POST", "https://api.example.com/x").status_code == 503
+    assert client.session.calls == 1
+
+def test_rate_limit_headers_pace_the_host():
+    clock = FakeClock()
+    exhausted = {"X-Ratelimit-Limit": "300", "X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset": "20"}
+    client = _client([_response(200, exhausted), _response(200), _response(200)], clock)
+    client.get("https://api.modrinth.com/v2/search")
+    assert clock.slept == []
+    client.get("https://api.modrinth.com/v2/search")
+    assert clock.slept == [pytest.approx(20.0)]
+    # Other hosts aren't held up
+    client.get("https://cdn.modrinth.com/icon.png")
+    assert len(clock.slept) == 1
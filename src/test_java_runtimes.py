@@ -0,0 +1,69 @@
+from src import java_runtimes
+from src.java_runtimes import JavaRegistry, is_compatible
+import os
+
+# Fake runtimes: file name → `java -version` output
+VERSIONS = {
+    "mojang-8": 'openjdk version "1.8.0_392"',
+    "mojang-17": 'openjdk version "17.0.8" 2023-07-18',
+    "system-17": 'openjdk version "17.0.9" 2023-10-17',
+    "system-21": 'openjdk version "21.0.2" 2024-01-16',
+    "system-broken": "",
+}
+
+def _registry(tmp_path, monkeypatch, names=VERSIONS):
+    probes = []
+    found = {}
+    for name in names:
+        path = str(tmp_path / name)
+        if not os.path.exists(path):
+            open(path, "w").close()
+        found[path] = name.split("-")[0]
+
+    def fake_run_java(java, args):
+        probes.append(java)
+        output = VERSIONS[os.path.basename(java)]
+        return (0 if output else 1), output
+    monkeypatch.setattr(java_runtimes, "run_java", fake_run_java)
+    monkeypatch.setattr(JavaRegistry, "_scan", lambda self: dict(found))
+    return JavaRegistry(str(tmp_path / "java.json"), str(tmp_path)), probes
+
+def test_is_compatible():
+    assert is_compatible(8, 8) and not is_compatible(8, 17)
+    assert is_compatible(17, 21) and not is_compatible(17, 16)
+    assert is_compatible(None, 11)
+    assert not is_compatible(17, None)
+
+def test_pick_prefers_the_exact_major_then_mojang(tmp_path, monkeypatch):
+    registry, _ = _registry(tmp_path, monkeypatch)
+    assert registry.pick(17) == str(tmp_path / "mojang-17")
+    assert registry.pick(21) == str(tmp_path / "system-21")
+    assert registry.pick(8) == str(tmp_path / "mojang-8")
+    # Nothing newer than 21 is installed
+    assert registry.pick(25) is None
+    assert len(registry.runtimes()) == 4
+
+def test_pick_takes_the_nearest_newer_runtime(tmp_path, monkeypatch):
+    registry, _ = _registry(tmp_path, monkeypatch, ["mojang-8", "system-17", "system-21"])
+    assert registry.pick(16) == str(tmp_path / "system-17")
+    assert registry.pick(18) == str(tmp_path / "system-21")
+    # Legacy versions never get a modern runtime
+    registry, _ = _registry(tmp_path, monkeypatch, ["system-17", "system-21"])
+    assert registry.pick(8) is None
+
+def test_runtimes_are_probed_once_per_mtime(tmp_path, monkeypatch):
+    registry, probes = _registry(tmp_path, monkeypatch)
+    registry.pick(17)
+    registry.pick(21)
+    assert len(probes) == len(VERSIONS)
+
+    registry, probes = _registry(tmp_path, monkeypatch)
+    registry.pick(17)
+    assert probes == []
+
+    changed = str(tmp_path / "system-21")
+    stat = os.stat(changed)
+    os.utime(changed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    registry, probes = _registry(tmp_path, monkeypatch)
+    assert registry.major(changed) == 21
+    assert probes == [changed]
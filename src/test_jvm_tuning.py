@@ -0,0 +1,61 @@
+from src import jvm_tuning
+from src.jvm_tuning import JvmTuner, build_flags, parse_java_major
+
+def test_default_and_unknown_profiles_only_set_the_heap():
+    assert build_flags("default", 4096, 8) == ["-Xmx4096M"]
+    assert build_flags("nope", 4096, 8) == ["-Xmx4096M"]
+
+def test_zgc_by_java_version():
+    assert "-XX:+ZGenerational" in build_flags("zgc", 4096, 8, java_major=21)
+    # Generational is the only mode from 23 on, where the flag is obsolete
+    flags = build_flags("zgc", 4096, 8, java_major=23)
+    assert "-XX:+UseZGC" in flags and "-XX:+ZGenerational" not in flags
+    # Below 21 there is no generational ZGC, so the G1 profile is used instead
+    flags = build_flags("zgc", 4096, 8, java_major=17)
+    assert "-XX:+UseG1GC" in flags and "-XX:+UseZGC" not in flags
+
+def test_heap_floor_and_pretouch_follow_free_memory():
+    roomy = build_flags("g1", 4096, 8, total_ram_mb=16384, platform="win32")
+    assert roomy[0] == "-Xms4096M" and "-XX:+AlwaysPreTouch" in roomy
+    tight = build_flags("g1", 4096, 8, total_ram_mb=6144, platform="win32")
+    assert tight[0] == "-Xms2048M" and "-XX:+AlwaysPreTouch" not in tight
+    assert roomy[-1] == tight[-1] == "-Xmx4096M"
+
+def test_gc_threads_leave_cores_free():
+    assert "-XX:ParallelGCThreads=6" in build_flags("throughput", 4096, 8)
+    assert "-XX:ParallelGCThreads=1" in build_flags("throughput", 4096, 2)
+    assert "-XX:ConcGCThreads=3" in build_flags("g1", 4096, 16)
+    assert "-XX:+UseTransparentHugePages" in build_flags("g1", 4096, 8, platform="linux")
+    assert "-XX:+UseTransparentHugePages" not in build_flags("g1", 4096, 8, platform="darwin")
+
+def test_parse_java_major():
+    assert parse_java_major('java version "1.8.0_392"') == 8
+    assert parse_java_major('openjdk version "21.0.2" 2024-01-16') == 21
+    assert parse_java_major('openjdk version "23" 2024-09-17') == 23
+    assert parse_java_major("garbage") is None
+
+class FakeRuntimes:
+    def major(self, java):
+        return 17
+
+def test_validate_drops_rejected_flags_and_never_probes_heap_commits(tmp_path, monkeypatch):
+    probes = []
+    def fake_run_java(java, args):
+        probes.append(args)
+        return (1 if "-XX:+UseTransparentHugePages" in args else 0), ""
+    monkeypatch.setattr(jvm_tuning, "run_java", fake_run_java)
+    tuner = JvmTuner(str(tmp_path / "tuning.json"), FakeRuntimes())
+    flags = build_flags("g1", 4096, 8, total_ram_mb=16384, java_major=17, platform="linux")
+
+    accepted = tuner.validate("java", flags)
+    assert accepted == [f for f in flags if f != "-XX:+UseTransparentHugePages"]
+    for args in probes:
+        assert not any(arg.startswith(("-Xms", "-XX:+AlwaysPreTouch")) for arg in args)
+    # Single-flag probes carry the unlock flag and the heap size
+    single = [args for args in probes[1:] if "-XX:G1NewSizePercent=30" in args]
+    assert single == [["-XX:+UnlockExperimentalVMOptions", "-Xmx4096M", "-XX:G1NewSizePercent=30", "-version"]]
+
+    # The result is cached per executable and survives a restart
+    probes.clear()
+    assert JvmTuner(str(tmp_path / "tuning.json"), FakeRuntimes()).validate("java", flags) == accepted
+    assert probes == []
@@ -0,0 +1,71 @@
+from src.launch_cache import LaunchCache, USERNAME_TOKEN, UUID_TOKEN
+import threading
+import json
+import os
+
+SETTINGS = {"max_memory": 4096, "jvm_args": ""}
+COMMAND = ["java", "-cp", "a.jar", "--username", USERNAME_TOKEN, "--uuid", UUID_TOKEN]
+
+def _write_version(mc_dir, version_id, data):
+    folder = os.path.join(mc_dir, "versions", version_id)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, f"{version_id}.json"), "w") as f:
+        json.dump(data, f)
+
+def _instance(tmp_path):
+    mc_dir = str(tmp_path)
+    _write_version(mc_dir, "1.20.1", {"id": "1.20.1", "mainClass": "net.minecraft.client.main.Main"})
+    _write_version(mc_dir, "fabric-loader-0.15.0-1.20.1", {"id": "fabric-loader-0.15.0-1.20.1", "inheritsFrom": "1.20.1"})
+    cache = LaunchCache(mc_dir)
+    key = LaunchCache.key("1.20.1", "Fabric", None)
+    cache.remember(key, "fabric-loader-0.15.0-1.20.1", SETTINGS, None, COMMAND, 1.5)
+    return mc_dir, cache, key
+
+def test_hit_survives_a_restart(tmp_path):
+    mc_dir, cache, key = _instance(tmp_path)
+    assert cache.match(key, SETTINGS, None)["command"] == COMMAND
+    record = LaunchCache(mc_dir).match(key, dict(SETTINGS), None, "fabric-loader-0.15.0-1.20.1")
+    assert record["prepare_seconds"] == 1.5
+
+def test_settings_and_game_dir_invalidate(tmp_path):
+    _, cache, key = _instance(tmp_path)
+    assert cache.match(key, {**SETTINGS, "max_memory": 8192}, None) is None
+    assert cache.match(key, SETTINGS, str(tmp_path / "instances" / "pack")) is None
+    assert cache.match(key, SETTINGS, None, "fabric-loader-0.16.0-1.20.1") is None
+
+def test_version_json_changes_invalidate(tmp_path):
+    mc_dir, cache, key = _instance(tmp_path)
+    _write_version(mc_dir, "fabric-loader-0.15.0-1.20.1",
+                   {"id": "fabric-loader-0.15.0-1.20.1", "inheritsFrom": "1.20.1", "libraries": []})
+    assert cache.match(key, SETTINGS, None) is None
+
+def test_parent_json_changes_invalidate(tmp_path):
+    mc_dir, cache, key = _instance(tmp_path)
+    _write_version(mc_dir, "1.20.1", {"id": "1.20.1", "mainClass": "net.minecraft.client.main.Main", "assets": "8"})
+    assert cache.match(key, SETTINGS, None) is None
+
+def test_missing_version_json_misses(tmp_path):
+    mc_dir, cache, key = _instance(tmp_path)
+    os.remove(os.path.join(mc_dir, "versions", "1.20.1", "1.20.1.json"))
+    assert cache.match(key, SETTINGS, None) is None
+    cache.remember(key, "fabric-loader-0.15.0-1.20.1", SETTINGS, None, COMMAND, 2.0)
+    assert cache.records[key]["prepare_seconds"] == 1.5
+
+def test_personalise_fills_the_tokens():
+    command = LaunchCache.personalise(COMMAND, "Steve")
+    assert command[4] == "Steve"
+    assert UUID_TOKEN not in command and len(command[6]) == 36
+
+def test_concurrent_saves_leave_a_whole_file(tmp_path):
+    mc_dir, cache, _ = _instance(tmp_path)
+    def remember(n):
+        for i in range(20):
+            cache.remember(LaunchCache.key("1.20.1", "Fabric", f"game-{n}-{i}"), "fabric-loader-0.15.0-1.20.1",
+                           SETTINGS, f"game-{n}-{i}", COMMAND, 1.0)
+    threads = [threading.Thread(target=remember, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(LaunchCache(mc_dir).records) == 81
+    assert not [name for name in os.listdir(mc_dir) if name.endswith(".tmp")]
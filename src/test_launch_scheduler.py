@@ -0,0 +1,58 @@
+from src.launch_scheduler import RamScheduler, xmx_mb
+
+def test_xmx_mb():
+    assert xmx_mb(["java", "-Xmx4G", "-jar"]) == 4096
+    assert xmx_mb(["java", "-Xmx512m", "-Xmx2048M"]) == 2048
+    assert xmx_mb(["java", "-Xmx1048576k"]) == 1024
+    assert xmx_mb(["java"], default=3072) == 3072
+
+def test_admits_while_heaps_fit_the_budget():
+    scheduler = RamScheduler(budget_percent=50, total_ram_mb=16384)   # 8192 MB budget
+    assert scheduler.budget_mb == 8192
+    assert scheduler.submit("a", 4096)
+    assert scheduler.submit("b", 4096)
+    assert not scheduler.submit("c", 1024)
+    assert scheduler.used_mb() == 8192
+    assert scheduler.queued() == ["c"]
+
+def test_queue_is_first_in_first_out():
+    scheduler = RamScheduler(budget_percent=50, total_ram_mb=16384)
+    assert scheduler.submit("a", 6144)
+    assert not scheduler.submit("big", 4096)
+    # Would fit, but nobody jumps the queue
+    assert not scheduler.submit("small", 1024)
+    assert scheduler.queued() == ["big", "small"]
+
+    assert scheduler.release("a") == ["big", "small"]
+    assert scheduler.queued() == []
+    assert scheduler.used_mb() == 5120
+
+def test_release_admits_only_what_fits():
+    scheduler = RamScheduler(budget_percent=50, total_ram_mb=16384)
+    scheduler.submit("a", 4096)
+    scheduler.submit("b", 4096)
+    scheduler.submit("c", 6144)
+    scheduler.submit("d", 1024)
+    # Freeing 4096 MB is not enough for c, and d waits behind it
+    assert scheduler.release("a") == []
+    assert scheduler.release("b") == ["c", "d"]
+
+def test_oversized_heap_runs_alone():
+    scheduler = RamScheduler(budget_percent=50, total_ram_mb=8192)
+    assert scheduler.submit("huge", 6000)
+    assert not scheduler.submit("next", 512)
+    assert scheduler.release("huge") == ["next"]
+
+def test_cancelled_waiter_leaves_the_queue():
+    scheduler = RamScheduler(budget_percent=50, total_ram_mb=16384)
+    scheduler.submit("a", 8192)
+    scheduler.submit("b", 2048)
+    scheduler.submit("c", 2048)
+    assert scheduler.release("b") == []
+    assert scheduler.queued() == ["c"]
+
+def test_bigger_budget_admits_waiters():
+    scheduler = RamScheduler(budget_percent=25, total_ram_mb=16384)
+    scheduler.submit("a", 4096)
+    scheduler.submit("b", 4096)
+    assert scheduler.set_budget_percent(50) == ["b"]
@@ -0,0 +1,146 @@
+from src import profile_manager
+from src.profile_manager import ProfileManager, clone_instance
+import threading
+import pytest
+import json
+import os
+
+def _manager(tmp_path):
+    return ProfileManager(str(tmp_path / "app"), str(tmp_path / "minecraft"))
+
+def _journal_lines(manager):
+    with open(manager.journal_file) as f:
+        return f.read().splitlines()
+
+def test_changes_are_replayed_from_the_journal(tmp_path):
+    os.makedirs(tmp_path / "app")
+    manager = _manager(tmp_path)
+    with manager.batch():
+        a = manager.create_profile("Survival", "1.20.1", "Fabric")
+        b = manager.create_profile("Creative", "1.21.4")
+        manager.update_profile(a["id"], color="#ff0000")
+        manager.set_active_profile(b["id"])
+    manager.delete_profile(b["id"])
+    manager.flush()
+    assert not os.path.exists(manager.profiles_file)
+
+    reloaded = _manager(tmp_path)
+    assert [p["name"] for p in reloaded.get_profiles()] == ["Default", "Survival"]
+    assert reloaded.get_profile(a["id"])["color"] == "#ff0000"
+    # Deleting the active profile made the first one active
+    assert reloaded.active_profile_id == reloaded.get_profiles()[0]["id"]
+
+def test_a_batch_is_one_append(tmp_path):
+    os.makedirs(tmp_path / "app")
+    manager = _manager(tmp_path)
+    manager.flush()
+    before = len(_journal_lines(manager))
+    with manager.batch():
+        manager.create_profiles([{"name": f"Pack {i}"} for i in range(3)])
+        assert len(_journal_lines(manager)) == before
+    assert len(_journal_lines(manager)) == before + 3
+
+def test_journal_is_compacted_once_long(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_manager, "COMPACT_AFTER", 5)
+    os.makedirs(tmp_path / "app")
+    manager = _manager(tmp_path)
+    manager.flush()
+    # The default profile and its activation are two entries; the third put reaches five
+    for i in range(3):
+        manager.create_profile(f"Pack {i}")
+        manager.flush()
+    assert not os.path.exists(manager.journal_file)
+    with open(manager.profiles_file) as f:
+        assert len(json.load(f)["profiles"]) == 4
+    manager.create_profile("Pack 3")
+    manager.flush()
+    assert len(_journal_lines(manager)) == 1
+
+    reloaded = _manager(tmp_path)
+    assert len(reloaded.get_profiles()) == 5
+    assert not [name for name in os.listdir(tmp_path / "app") if name.endswith(".tmp")]
+
+def test_torn_last_line_is_dropped_and_compacted(tmp_path):
+    os.makedirs(tmp_path / "app")
+    manager = _manager(tmp_path)
+    kept = manager.create_profile("Kept")
+    manager.flush()
+    with open(manager.journal_file, "a") as f:
+        f.write('{"op": "put", "profile": {"id": "to')
+
+    reloaded = _manager(tmp_path)
+    assert reloaded.get_profile(kept["id"])["name"] == "Kept"
+    assert len(reloaded.get_profiles()) == 2
+    # Compacted right away, so changes made now aren't appended behind the torn line
+    assert not os.path.exists(reloaded.journal_file)
+    later = reloaded.create_profile("Later")
+    reloaded.flush()
+    assert _manager(tmp_path).get_profile(later["id"])["name"] == "Later"
+
+def _write(path, data=b"x"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+def _no_reflink(monkeypatch):
+    # Take the fallbacks the way a filesystem without reflinks would
+    monkeypatch.setattr(profile_manager, "reflink_file", lambda src, dst: False)
+
+def test_clone_links_archives_and_copies_the_rest(tmp_path, monkeypatch):
+    _no_reflink(monkeypatch)
+    src, dst = str(tmp_path / "src"), str(tmp_path / "dst")
+    _write(os.path.join(src, "mods", "sodium.jar"), b"j" * 100)
+    _write(os.path.join(src, "resourcepacks", "faithful.ZIP"), b"z" * 50)
+    _write(os.path.join(src, "config", "sodium.toml"), b"c" * 10)
+    _write(os.path.join(src, "shaderpacks", "bsl.zip.txt"), b"t" * 5)
+    os.makedirs(os.path.join(src, "saves", "empty world"))
+
+    seen = []
+    stats = clone_instance(src, dst, ["mods", "resourcepacks", "config", "shaderpacks", "saves"],
+                           lambda text, percent: seen.append(percent))
+    assert stats == {"files": 4, "shared_bytes": 150, "copied_bytes": 15}
+    assert os.stat(os.path.join(dst, "mods", "sodium.jar")).st_nlink == 2
+    assert os.stat(os.path.join(dst, "resourcepacks", "faithful.ZIP")).st_nlink == 2
+    assert os.stat(os.path.join(dst, "config", "sodium.toml")).st_nlink == 1
+    assert os.stat(os.path.join(dst, "shaderpacks", "bsl.zip.txt")).st_nlink == 1
+    assert os.path.isdir(os.path.join(dst, "saves", "empty world"))
+    assert seen[-1] == 100
+
+    # Editing a copied config leaves the original alone
+    _write(os.path.join(dst, "config", "sodium.toml"), b"changed")
+    with open(os.path.join(src, "config", "sodium.toml"), "rb") as f:
+        assert f.read() == b"c" * 10
+
+def test_clone_stops_when_cancelled(tmp_path, monkeypatch):
+    _no_reflink(monkeypatch)
+    src = str(tmp_path / "src")
+    _write(os.path.join(src, "mods", "a.jar"))
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(InterruptedError):
+        clone_instance(src, str(tmp_path / "dst"), ["mods"], cancel_event=cancel)
+
+def test_duplicate_profile(tmp_path, monkeypatch):
+    _no_reflink(monkeypatch)
+    os.makedirs(tmp_path / "app")
+    manager = _manager(tmp_path)
+    source = manager.create_profile("Pack", "1.20.1", "Fabric")
+    _write(os.path.join(manager.get_mods_dir(source["id"]), "sodium.jar"))
+    _write(os.path.join(manager.get_instance_dir(source["id"]), "logs", "latest.log"))
+
+    copy = manager.duplicate_profile(source["id"])
+    again = manager.duplicate_profile(source["id"])
+    assert (copy["name"], again["name"]) == ("Pack (Copy)", "Pack (Copy 2)")
+    assert copy["loader"] == "Fabric"
+    copy_dir = manager.get_instance_dir(copy["id"])
+    assert os.path.exists(os.path.join(copy_dir, "mods", "sodium.jar"))
+    assert os.listdir(os.path.join(copy_dir, "logs")) == []
+
+    cancel = threading.Event()
+    cancel.set()
+    count = len(manager.get_profiles())
+    with pytest.raises(InterruptedError):
+        manager.duplicate_profile(source["id"], cancel_event=cancel)
+    # The half-made copy is gone again
+    assert len(manager.get_profiles()) == count
+    assert not os.path.exists(os.path.join(manager.minecraft_dir, "versions", "Pack (Copy 3)"))
@@ -0,0 +1,117 @@
+from src.provision import Provisioner
+from src.installer import DownloadCancelled, DownloadError
+from src.version_registry import VersionRegistry
+from types import SimpleNamespace
+import minecraft_launcher_lib
+import threading
+import pytest
+import json
+import os
+
+class FakeEngine:
+    """Writes the version JSON on resolve, like InstallEngine, and 'downloads' by creating files."""
+    manifest = None
+
+    def __init__(self, root, fail_resolve=(), download_error=None):
+        self.minecraft_directory = root
+        self.fail_resolve = fail_resolve
+        self.download_error = download_error
+
+    def version_json_path(self, version_id):
+        return os.path.join(self.minecraft_directory, "versions", version_id, f"{version_id}.json")
+
+    def resolve(self, version_id):
+        path = self.version_json_path(version_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        data = {"id": version_id, "type": "release", "javaVersion": {"component": "java-runtime-gamma"}}
+        with open(path, "w") as f:
+            json.dump(data, f)
+        if version_id in self.fail_resolve:
+            raise DownloadError("asset index failed to download")
+        libraries = os.path.join(self.minecraft_directory, "libraries")
+        plan = [{"path": os.path.join(libraries, "shared.jar"), "size": 10, "sha1": None, "kind": "library"},
+                {"path": os.path.join(libraries, f"{version_id}.jar"), "size": 20, "sha1": None, "kind": "client"}]
+        return data, plan
+
+    def needs_download(self, task):
+        return not os.path.exists(task["path"])
+
+    def link_from_store(self, tasks):
+        return tasks, 0, 0
+
+    def download(self, tasks, callback, status, cancel_event=None):
+        if self.download_error:
+            raise self.download_error
+        for task in tasks:
+            os.makedirs(os.path.dirname(task["path"]), exist_ok=True)
+            open(task["path"], "w").close()
+        return {"files": len(tasks), "bytes": sum(t["size"] for t in tasks), "seconds": 0.1}
+
+    def adopt_into_store(self, tasks):
+        pass
+
+    def extract_natives(self, version_data, plan):
+        pass
+
+def _provisioner(tmp_path, monkeypatch, runtime_error=None, **engine_options):
+    def install_jvm_runtime(component, minecraft_directory):
+        if runtime_error:
+            raise runtime_error
+    monkeypatch.setattr(minecraft_launcher_lib.runtime, "install_jvm_runtime", install_jvm_runtime)
+    root = str(tmp_path)
+    backend = SimpleNamespace(installer=FakeEngine(root, **engine_options), registry=VersionRegistry(root),
+                              resolve_loader=lambda version, loader: f"{loader.lower()}-loader-{version}")
+    return Provisioner(backend), backend.registry
+
+def _errors(report):
+    return {r["version"]: r["error"] for r in report["targets"]}
+
+def test_installs_every_target(tmp_path, monkeypatch):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch)
+    report = provisioner.provision([("1.21.4", "Vanilla"), ("1.20.1", "Fabric")])
+    assert _errors(report) == {"1.21.4": None, "1.20.1": None}
+    assert [r["launch_version"] for r in report["targets"]] == ["1.21.4", "fabric-loader-1.20.1"]
+    # The shared library is fetched once
+    assert report["files"] == 3
+    assert registry.is_installed("1.21.4") and registry.is_installed("1.20.1")
+
+def test_failed_resolve_drops_the_fetched_json(tmp_path, monkeypatch):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch, fail_resolve={"1.20.1"})
+    report = provisioner.provision([("1.21.4", "Vanilla"), ("1.20.1", "Fabric")])
+    errors = _errors(report)
+    assert errors["1.21.4"] is None and "asset index" in errors["1.20.1"]
+    assert registry.is_installed("1.21.4")
+    assert not registry.is_installed("1.20.1")
+
+def test_cancel_after_resolving_drops_the_fetched_json(tmp_path, monkeypatch):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch)
+    cancel = threading.Event()
+    cancel.set()
+    with pytest.raises(DownloadCancelled):
+        provisioner.provision([("1.21.4", "Vanilla")], cancel_event=cancel)
+    assert not registry.is_installed("1.21.4")
+
+@pytest.mark.parametrize("error", [DownloadError("mirror down"), DownloadCancelled()])
+def test_failed_or_cancelled_download_drops_the_fetched_json(tmp_path, monkeypatch, error):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch, download_error=error)
+    if isinstance(error, DownloadCancelled):
+        with pytest.raises(DownloadCancelled):
+            provisioner.provision([("1.21.4", "Vanilla")])
+    else:
+        assert "mirror down" in _errors(provisioner.provision([("1.21.4", "Vanilla")]))["1.21.4"]
+    assert not registry.is_installed("1.21.4")
+
+def test_failed_java_runtime_is_reported(tmp_path, monkeypatch):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch, runtime_error=OSError("no space left"))
+    report = provisioner.provision([("1.21.4", "Fabric")])
+    assert "java-runtime-gamma" in _errors(report)["1.21.4"]
+    assert "launch_version" not in report["targets"][0]
+    assert not registry.is_installed("1.21.4")
+
+def test_versions_installed_before_are_kept(tmp_path, monkeypatch):
+    provisioner, registry = _provisioner(tmp_path, monkeypatch)
+    provisioner.provision([("1.21.4", "Vanilla")])
+    provisioner, registry = _provisioner(tmp_path, monkeypatch, download_error=DownloadError("mirror down"))
+    os.remove(os.path.join(str(tmp_path), "libraries", "shared.jar"))
+    provisioner.provision([("1.21.4", "Vanilla")])
+    assert registry.is_installed("1.21.4")
@@ -0,0 +1,71 @@
+from src.search_cache import SearchCache, search_key, DEFAULT_TTL, MAX_AGE
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+HITS = [{"id": "sodium", "title": "Sodium"}, {"id": "lithium", "title": "Lithium"}]
+
+def _cache(tmp_path, clock):
+    return SearchCache(str(tmp_path / "search.db"), clock=clock)
+
+def test_fresh_then_stale(tmp_path):
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    key = search_key("modrinth", "sodium", version="1.20.1", loader="Fabric")
+    assert cache.get(key) is None
+    assert cache.put(key, HITS)
+    assert cache.get(key) == (HITS, True)
+    clock.now += DEFAULT_TTL + 1
+    # Past the TTL the hits are still served, just marked for revalidation
+    assert cache.get(key) == (HITS, False)
+    cache.close()
+
+def test_put_reports_whether_results_changed(tmp_path):
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    key = search_key("modrinth", "sodium")
+    assert cache.put(key, HITS)
+    clock.now += DEFAULT_TTL + 1
+    assert not cache.put(key, list(HITS))
+    # Storing the same hits again still refreshes the entry
+    assert cache.get(key) == (HITS, True)
+    assert cache.put(key, HITS[:1])
+    cache.close()
+
+def test_empty_results_keep_the_stored_ones(tmp_path):
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    key = search_key("curseforge", "jei")
+    cache.put(key, HITS)
+    assert not cache.put(key, [])
+    assert cache.get(key) == (HITS, True)
+    assert not cache.put(search_key("curseforge", "nothing"), [])
+    assert cache.get(search_key("curseforge", "nothing")) is None
+    cache.close()
+
+def test_facets_are_part_of_the_key(tmp_path):
+    cache = _cache(tmp_path, FakeClock())
+    cache.put(search_key("modrinth", "sodium", version="1.20.1"), HITS)
+    assert cache.get(search_key("modrinth", " sodium ", version="1.20.1")) == (HITS, True)
+    assert cache.get(search_key("modrinth", "sodium", version="1.19.4")) is None
+    assert cache.get(search_key("modrinth", "sodium", version="1.20.1", offset=20)) is None
+    cache.close()
+
+def test_expired_entries_are_pruned_on_open(tmp_path):
+    clock = FakeClock()
+    cache = _cache(tmp_path, clock)
+    old, recent = search_key("modrinth", "old"), search_key("modrinth", "recent")
+    cache.put(old, HITS)
+    clock.now += MAX_AGE / 2
+    cache.put(recent, HITS)
+    cache.close()
+
+    clock.now += MAX_AGE / 2 + 1
+    reopened = _cache(tmp_path, clock)
+    assert reopened.get(old) is None
+    assert reopened.get(recent) == (HITS, False)
+    reopened.close()
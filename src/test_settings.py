@@ -0,0 +1,98 @@
+from src import settings as settings_module
+from src.settings import Settings
+import json
+import os
+import time
+
+def _settings(tmp_path, monkeypatch, save_delay=60):
+    # Keep a stray settings.json in the working directory from being migrated
+    monkeypatch.chdir(tmp_path)
+    return Settings(str(tmp_path / "config" / "settings.json"), save_delay=save_delay)
+
+def _count_writes(monkeypatch):
+    writes = []
+    replace = os.replace
+    def counting_replace(src, dst):
+        writes.append(dst)
+        replace(src, dst)
+    monkeypatch.setattr(settings_module.os, "replace", counting_replace)
+    return writes
+
+def test_defaults_and_coercion(tmp_path, monkeypatch):
+    settings = _settings(tmp_path, monkeypatch)
+    assert settings["max_memory"] == 2048
+    settings.update(max_memory="4096", fullscreen="true", width="wide")
+    assert settings["max_memory"] == 4096
+    assert settings["fullscreen"] is True
+    assert settings["width"] == 854
+
+def test_a_burst_of_changes_is_one_write(tmp_path, monkeypatch):
+    writes = _count_writes(monkeypatch)
+    settings = _settings(tmp_path, monkeypatch)
+    for memory in (3072, 4096, 6144):
+        settings.set("max_memory", memory)
+    settings.set("username", "Steve")
+    assert writes == []
+    assert not os.path.exists(settings.path)
+    settings.flush()
+    settings.flush()
+    assert len(writes) == 1
+    with open(settings.path) as f:
+        assert json.load(f)["max_memory"] == 6144
+
+def test_debounced_save_fires_after_the_delay(tmp_path, monkeypatch):
+    writes = _count_writes(monkeypatch)
+    settings = _settings(tmp_path, monkeypatch, save_delay=0.05)
+    settings.set("username", "Alex")
+    settings.set("username", "Steve")
+    deadline = time.monotonic() + 5
+    while not writes and time.monotonic() < deadline:
+        time.sleep(0.01)
+    time.sleep(0.1)
+    assert len(writes) == 1
+    assert Settings(settings.path)["username"] == "Steve"
+
+def test_unchanged_values_neither_notify_nor_save(tmp_path, monkeypatch):
+    settings = _settings(tmp_path, monkeypatch)
+    seen = []
+    settings.subscribe(lambda key, value: seen.append((key, value)))
+    settings.update(max_memory=2048, username="Steve")
+    assert seen == [("username", "Steve")]
+    settings.flush()
+    seen.clear()
+    settings.set("username", "Steve")
+    assert seen == []
+
+def test_write_is_atomic_and_keeps_unknown_keys(tmp_path, monkeypatch):
+    settings = _settings(tmp_path, monkeypatch)
+    os.makedirs(os.path.dirname(settings.path))
+    with open(settings.path, "w") as f:
+        json.dump({"max_memory": 3072, "theme": "dark"}, f)
+    settings = Settings(settings.path, save_delay=60)
+
+    def broken_dump(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(settings_module.json, "dump", broken_dump)
+    settings.set("max_memory", 8192)
+    settings.flush()
+    monkeypatch.undo()
+    # The old file is untouched by the failed write
+    with open(settings.path) as f:
+        assert json.load(f) == {"max_memory": 3072, "theme": "dark"}
+
+    settings.set("max_memory", 4096)
+    settings.flush()
+    with open(settings.path) as f:
+        stored = json.load(f)
+    assert stored["max_memory"] == 4096 and stored["theme"] == "dark"
+    assert os.listdir(os.path.dirname(settings.path)) == ["settings.json"]
+
+def test_legacy_file_is_migrated(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    with open("settings.json", "w") as f:
+        json.dump({"username": "Steve", "max_memory": 4096}, f)
+    path = str(tmp_path / "config" / "settings.json")
+    settings = Settings(path, save_delay=60)
+    assert settings["username"] == "Steve"
+    with open(path) as f:
+        assert json.load(f)["max_memory"] == 4096
@@ -0,0 +1,60 @@
+from src.thumbnail_cache import ThumbnailCache
+import os
+
+def _urls(n):
+    return [f"https://cdn.modrinth.com/data/{i}/icon.png" for i in range(n)]
+
+def test_round_trip_and_usage(tmp_path):
+    cache = ThumbnailCache(str(tmp_path / "icons"), max_bytes=1000)
+    url = _urls(1)[0]
+    assert cache.get(url) is None
+    cache.put(url, b"x" * 100)
+    assert cache.get(url) == b"x" * 100
+    cache.put(url, b"y" * 40)
+    assert cache.get(url) == b"y" * 40
+    assert cache.usage() == (1, 40)
+    assert not [name for name in os.listdir(tmp_path / "icons") if name.endswith(".tmp")]
+
+def test_evicts_least_recently_used_past_the_budget(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=300)
+    a, b, c, d = _urls(4)
+    for url in (a, b, c):
+        cache.put(url, b"x" * 100)
+    # Reading a makes b the least recently used
+    assert cache.get(a)
+    cache.put(d, b"x" * 100)
+    assert cache.get(b) is None
+    assert all(cache.get(url) for url in (a, c, d))
+    assert cache.usage() == (3, 300)
+
+def test_keeps_a_single_oversized_thumbnail(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=50)
+    a, b = _urls(2)
+    cache.put(a, b"x" * 40)
+    cache.put(b, b"x" * 80)
+    assert cache.get(a) is None
+    assert cache.get(b) == b"x" * 80
+
+def test_order_survives_a_restart(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=300)
+    a, b, c, d = _urls(4)
+    for url in (a, b, c):
+        cache.put(url, b"x" * 100)
+    # Last use is kept in the mtimes; make a the oldest
+    for age, url in ((300, a), (200, b), (100, c)):
+        path = os.path.join(str(tmp_path), ThumbnailCache._name(url))
+        os.utime(path, (os.path.getatime(path), os.path.getmtime(path) - age))
+
+    reopened = ThumbnailCache(str(tmp_path), max_bytes=300)
+    assert reopened.usage() == (3, 300)
+    reopened.put(d, b"x" * 100)
+    assert reopened.get(a) is None
+    assert all(reopened.get(url) for url in (b, c, d))
+
+def test_forgets_files_removed_behind_its_back(tmp_path):
+    cache = ThumbnailCache(str(tmp_path), max_bytes=300)
+    url = _urls(1)[0]
+    cache.put(url, b"x" * 100)
+    os.remove(os.path.join(str(tmp_path), ThumbnailCache._name(url)))
+    assert cache.get(url) is None
+    assert cache.usage() == (0, 0)
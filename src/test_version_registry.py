@@ -0,0 +1,88 @@
+from src.version_registry import VersionRegistry
+import json
+import os
+
+def _write_version(root, version_id, data):
+    path = os.path.join(root, "versions", version_id)
+    os.makedirs(path, exist_ok=True)
+    with open(os.path.join(path, f"{version_id}.json"), "w") as f:
+        json.dump(dict(id=version_id, **data), f)
+
+def test_registry(tmp_path):
+    root = str(tmp_path)
+    _write_version(root, "1.21", {"type": "release"})
+    _write_version(root, "1.21.4", {"type": "release"})
+    _write_version(root, "fabric-loader-0.16.9-1.21.4", {
+        "inheritsFrom": "1.21.4",
+        "libraries": [{"name": "net.fabricmc:fabric-loader:0.16.9"}],
+    })
+    _write_version(root, "fabric-loader-0.16.10-1.21.4", {
+        "inheritsFrom": "1.21.4",
+        "libraries": [{"name": "net.fabricmc:fabric-loader:0.16.10"}],
+    })
+    _write_version(root, "1.7.10-Forge10.13.4.1614-1.7.10", {
+        "inheritsFrom": "1.7.10",
+        "libraries": [{"name": "net.minecraftforge:forge:1.7.10-10.13.4.1614-1.7.10"}],
+    })
+    # Profile instance directory — no version JSON inside
+    os.makedirs(os.path.join(root, "versions", "Default", "mods"))
+
+    registry = VersionRegistry(root)
+    assert registry.is_installed("1.21.4")
+    assert not registry.is_installed("Default")
+    assert registry.loader_builds("fabric", "1.21.4") == [
+        "fabric-loader-0.16.10-1.21.4", "fabric-loader-0.16.9-1.21.4"
+    ]
+    assert registry.latest_build("fabric", "1.21.4") == "fabric-loader-0.16.10-1.21.4"
+    assert registry.latest_build("fabric", "1.21") is None
+    assert registry.get("1.7.10-Forge10.13.4.1614-1.7.10")["loader_version"] == "10.13.4.1614"
+    assert registry.get("fabric-loader-0.16.9-1.21.4")["loader_version"] == "0.16.9"
+
+    # A fresh instance answers from the persisted registry
+    _write_version(root, "1.20.1", {"type": "release"})
+    reloaded = VersionRegistry(root)
+    reloaded.invalidate()
+    assert reloaded.is_installed("1.20.1")
+
+def test_json_changes_inside_existing_folders(tmp_path):
+    root = str(tmp_path)
+    os.makedirs(os.path.join(root, "versions", "1.21"))
+    registry = VersionRegistry(root)
+    assert registry.ids() == []
+
+    # Neither change touches the mtime of versions/ itself
+    _write_version(root, "1.21", {"type": "release"})
+    registry.invalidate("1.21")
+    assert registry.ids() == ["1.21"]
+    os.remove(os.path.join(root, "versions", "1.21", "1.21.json"))
+    registry.invalidate("1.21")
+    assert registry.ids() == []
+
+def test_lookups_do_not_touch_the_folder(tmp_path, monkeypatch):
+    root = str(tmp_path)
+    _write_version(root, "1.21.4", {"type": "release"})
+    registry = VersionRegistry(root)
+    assert registry.ids() == ["1.21.4"]
+
+    def no_disk(*args, **kwargs):
+        raise AssertionError("lookup touched the disk")
+    with monkeypatch.context() as m:
+        m.setattr(os, "scandir", no_disk)
+        m.setattr(os, "stat", no_disk)
+        assert registry.is_installed("1.21.4")
+        assert registry.latest_build("fabric", "1.21.4") is None
+
+    # Only the invalidated version is read again, along with a parent it brought along
+    _write_version(root, "1.21", {"type": "release"})
+    _write_version(root, "1.20.1", {"type": "release"})
+    _write_version(root, "fabric-loader-0.16.10-1.20.1", {
+        "inheritsFrom": "1.20.1",
+        "libraries": [{"name": "net.fabricmc:fabric-loader:0.16.10"}],
+    })
+    registry.invalidate("fabric-loader-0.16.10-1.20.1")
+    assert registry.latest_build("fabric", "1.20.1") == "fabric-loader-0.16.10-1.20.1"
+    assert registry.is_installed("1.20.1")
+    assert not registry.is_installed("1.21")
+    # A full invalidation rescans the folder
+    registry.invalidate()
+    assert registry.is_installed("1.21")
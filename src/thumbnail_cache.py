@@ -0,0 +1,102 @@
+"""
+Size-capped disk cache of mod icon thumbnails.
+
+Icons are stored already scaled to the list size, one small PNG per URL
+(named after a hash of it), under ``qlauncher_icons/``. Reopening the mod
+manager reads them from here instead of downloading and decoding the
+full-size originals again.
+
+When the files outgrow max_bytes the least recently used go first. Use is
+recorded in each file's mtime, so the order survives restarts.
+"""
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 16 * 1024 * 1024
+
+
+class ThumbnailCache:
+    """LRU directory of thumbnails keyed by URL. Safe to use from several threads."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = None     # file name → size, least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _name(url):
+        return hashlib.sha1(url.encode("utf-8")).hexdigest() + ".png"
+
+    def _index(self):
+        """Scan the directory once, on first use, ordering files by when they were last used."""
+        if self._entries is None:
+            found = []
+            try:
+                with os.scandir(self.directory) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".png") and entry.is_file():
+                            stat = entry.stat()
+                            found.append((stat.st_mtime, entry.name, stat.st_size))
+            except FileNotFoundError:
+                pass
+            found.sort()
+            self._entries = OrderedDict((name, size) for _, name, size in found)
+            self._total = sum(self._entries.values())
+        return self._entries
+
+    def get(self, url):
+        """Thumbnail bytes for url, or None."""
+        name = self._name(url)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            entries = self._index()
+            if name not in entries:
+                return None
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                os.utime(path)
+            except OSError:
+                self._total -= entries.pop(name)
+                return None
+            entries.move_to_end(name)
+        return data
+
+    def put(self, url, data):
+        """Store a thumbnail, evicting the least recently used ones past max_bytes."""
+        name = self._name(url)
+        path = os.path.join(self.directory, name)
+        with self._lock:
+            entries = self._index()
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                tmp = f"{path}.{threading.get_ident()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(data)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"[Thumbnails] Error saving {url}: {e}")
+                return
+            self._total += len(data) - entries.pop(name, 0)
+            entries[name] = len(data)
+            self._evict()
+
+    def _evict(self):
+        entries = self._entries
+        while self._total > self.max_bytes and len(entries) > 1:
+            name, size = entries.popitem(last=False)
+            self._total -= size
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                pass
+
+    def usage(self):
+        """(thumbnails, bytes) on disk."""
+        with self._lock:
+            entries = self._index()
+            return len(entries), self._total
@@ -2,20 +2,21 @@
 import sys
 import os
 import random
-import requests
-import json
+import threading
 from PyQt5.QtWidgets import (
-    QApplication, QMainWindow, QLabel, QComboBox, QPushButton,
+    QMainWindow, QLabel, QComboBox, QPushButton,
     QVBoxLayout, QHBoxLayout, QWidget, QLineEdit, QProgressBar,
-    QMessageBox, QGraphicsDropShadowEffect, QFrame, QStackedWidget
+    QMessageBox, QGraphicsDropShadowEffect, QFrame, QStackedWidget, QCheckBox,
+    QDialog, QDialogButtonBox, QListWidget, QListWidgetItem
 )
 from PyQt5.QtGui import (
-    QPixmap, QPalette, QBrush, QImage, QColor, QFont,
+    QPixmap, QPalette, QBrush, QImage, QImageReader, QColor, QFont,
     QPainter, QIcon, QLinearGradient
 )
-from PyQt5.QtCore import Qt, QSize, QThread, pyqtSignal
-from .backend import LauncherBackend
-from .profile_manager import ProfileManager
+from PyQt5.QtCore import Qt, QSize, QThread, QTimer, pyqtSignal
+from .launch_pipeline import LaunchCancelled, STAGE_LABELS
+from .startup_profile import span, mark
+# The backend (minecraft_launcher_lib, requests) and profiles load after the first frame — see _finish_startup
 
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
@@ -35,11 +36,14 @@ C_INPUT_BG = "rgba(255, 255, 255, 0.05)"
 C_INPUT_BD = "rgba(255, 255, 255, 0.10)"
 C_HOVER    = "rgba(255, 255, 255, 0.08)"
 
+PREFETCH_DELAY_MS = 1500  # selection must stay put this long before a background install starts
+
 
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  Version Fetcher Thread
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 class VersionFetcherThread(QThread):
+    """Revalidates the cached version manifest in the background."""
     versions_signal = pyqtSignal(list)
 
     def __init__(self, backend):
@@ -55,29 +59,177 @@ class VersionFetcherThread(QThread):
             self.versions_signal.emit([])
 
 
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Launch Worker Thread
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class LaunchWorkerThread(QThread):
+    """Runs the launch pipeline off the UI thread; cancel() stops it at the next check."""
+    progress_signal = pyqtSignal(str, int)
+    stage_signal = pyqtSignal(str, str, float)   # stage, "started"/"finished", seconds
+    finished_signal = pyqtSignal(list, object)   # launch command, launch timing (or None)
+    error_signal = pyqtSignal(str)
+    cancelled_signal = pyqtSignal()
+
+    def __init__(self, backend, version, modloader, username, game_dir=None, appcds=False, profile_id=None,
+                 title=None, parent=None):
+        super().__init__(parent)
+        self.title = title or f"{version} {modloader}"    # console tab title
+        self.backend = backend
+        self.version = version
+        self.modloader = modloader
+        self.username = username
+        self.game_dir = game_dir
+        self.appcds = appcds
+        self.profile_id = profile_id
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        self.cancel_event.set()
+
+    def run(self):
+        from .installer import DownloadCancelled
+        timing = []
+        try:
+            command = self.backend.launch_game(
+                self.version, self.modloader, self.username,
+                progress_callback=lambda text, value: self.progress_signal.emit(text, int(value) if value else 0),
+                game_dir=self.game_dir,
+                stage_callback=lambda stage, state, seconds: self.stage_signal.emit(stage, state, seconds),
+                cancel_event=self.cancel_event,
+                appcds=self.appcds,
+                timing_callback=timing.append,
+            )
+            if self.cancel_event.is_set():
+                self.cancelled_signal.emit()
+            else:
+                self.finished_signal.emit(command or [], timing[0] if timing else None)
+        except (LaunchCancelled, DownloadCancelled):
+            self.cancelled_signal.emit()
+        except Exception as e:
+            print(f"Launch failed: {e}")
+            self.error_signal.emit(str(e))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Profile Duplicate Thread
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class ProfileDuplicateThread(QThread):
+    """Clones a profile's instance directory off the UI thread."""
+    progress_signal = pyqtSignal(str, int)
+    finished_signal = pyqtSignal(dict)           # the new profile
+    error_signal = pyqtSignal(str)
+
+    def __init__(self, profile_manager, profile_id, exclude, parent=None):
+        super().__init__(parent)
+        self.profile_manager = profile_manager
+        self.profile_id = profile_id
+        self.exclude = exclude
+
+    def run(self):
+        try:
+            profile = self.profile_manager.duplicate_profile(
+                self.profile_id, exclude=self.exclude,
+                progress_callback=lambda text, value: self.progress_signal.emit(text, value),
+            )
+            if profile:
+                self.finished_signal.emit(profile)
+            else:
+                self.error_signal.emit("Profile not found.")
+        except Exception as e:
+            print(f"Duplicate failed: {e}")
+            self.error_signal.emit(str(e))
+
+
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+#  Background Loader Thread
+# ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+class BackgroundLoaderThread(QThread):
+    """Downloads (first run only), decodes and scales the background image off the UI thread."""
+    loaded_signal = pyqtSignal(QImage)
+
+    URL = "https://images.wallpapersden.com/image/download/minecraft-shaders-hd-nature_bGdtaWyUmZqaraWkpJRmbmdlrWZlbWU.jpg"
+
+    def __init__(self, path, size, parent=None):
+        super().__init__(parent)
+        self.path = path
+        self.size = size
+
+    def run(self):
+        if not os.path.exists(self.path):
+            try:
+                from .http_client import get_client
+                r = get_client().get(self.URL, stream=True)
+                if r.status_code == 200:
+                    os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                    with open(self.path, 'wb') as f:
+                        for chunk in r.iter_content(1024):
+                            f.write(chunk)
+            except Exception as e:
+                print(f"Failed to download background: {e}")
+                return
+
+        # Scaled copy for this window size, rebuilt when the source image changes
+        cache_path = os.path.join(os.path.dirname(self.path), ".cache",
+                                  f"background-{self.size.width()}x{self.size.height()}.jpg")
+        with span("background decode (thread)"):
+            image = QImage()
+            try:
+                if os.path.getmtime(cache_path) >= os.path.getmtime(self.path):
+                    image = QImage(cache_path)
+            except OSError:
+                pass
+            if image.isNull():
+                image = self._decode_scaled()
+                if image.isNull():
+                    return
+                try:
+                    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+                    image.save(cache_path, "JPG", 92)
+                except OSError as e:
+                    print(f"Could not cache the scaled background: {e}")
+        self.loaded_signal.emit(image)
+
+    def _decode_scaled(self):
+        """Decode the full image straight to the size that covers the window."""
+        reader = QImageReader(self.path)
+        full = reader.size()
+        if full.isValid():
+            # Let the JPEG decoder downscale while decoding — far cheaper than decoding the full image
+            reader.setScaledSize(full.scaled(self.size, Qt.KeepAspectRatioByExpanding))
+        reader.setQuality(90)
+        return reader.read()
+
+
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 #  Main Window
 # ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 class MainWindow(QMainWindow):
+    startup_finished = pyqtSignal()    # backend, profiles and versions loaded — the window is usable
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("QLauncher")
         self.setFixedSize(1333, 700)
 
         self.minecraft_dir = os.path.join(os.getenv('APPDATA'), '.minecraft')
-        self.backend = LauncherBackend(self.minecraft_dir)
         self.assets_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assets')
         self.app_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-        # Profile Manager
-        self.profile_manager = ProfileManager(self.app_dir)
+        # Backend and Profile Manager are created in _finish_startup, after the first frame
+        self.backend = None
+        self.profile_manager = None
         self.available_versions = []
+        self.launch_worker = None
+        self.launch_queue = []           # prepared one at a time, then run side by side
+        self.launch_manager = None       # console tabs, created with the first game
+        self._first_frame = False
 
         icon_path = os.path.join(self.assets_dir, 'app_icon.ico')
         if os.path.exists(icon_path):
             self.setWindowIcon(QIcon(icon_path))
 
-        self.initUI()
+        with span("MainWindow.initUI"):
+            self.initUI()
 
     def initUI(self):
         # ── Stacked widget: page 0 = main, overlay panels added dynamically ──
@@ -86,6 +238,7 @@ class MainWindow(QMainWindow):
 
         self.main_page = QWidget()
         self.stack.addWidget(self.main_page)
+        self.background_pixmap = None
         self.setup_background()
 
         main_layout = QVBoxLayout(self.main_page)
@@ -141,6 +294,7 @@ class MainWindow(QMainWindow):
 
         # ─── Bottom Control Panel (Glass) ───
         controls_panel = QWidget()
+        self.controls_panel = controls_panel
         controls_panel.setObjectName("ctrls")
         controls_panel.setFixedHeight(110)
         controls_panel.setStyleSheet(f"""
@@ -229,7 +383,6 @@ class MainWindow(QMainWindow):
         self.version_combo.setFixedWidth(155)
         self.version_combo.addItem("Loading...")
         self.version_combo.setStyleSheet(combo_ss)
-        self.populate_versions()
         v_layout.addWidget(self.version_combo)
         controls_layout.addWidget(v_widget, 0, Qt.AlignVCenter)
 
@@ -315,6 +468,15 @@ class MainWindow(QMainWindow):
         edit_btn.clicked.connect(self._edit_profile)
         p_row.addWidget(edit_btn)
 
+        # duplicate button
+        dup_btn = QPushButton("⧉")
+        dup_btn.setFixedSize(36, 36)
+        dup_btn.setCursor(Qt.PointingHandCursor)
+        dup_btn.setToolTip("Duplicate profile")
+        dup_btn.setStyleSheet(edit_btn.styleSheet())
+        dup_btn.clicked.connect(self._duplicate_profile)
+        p_row.addWidget(dup_btn)
+
         # delete button
         del_btn = QPushButton("🗑")
         del_btn.setFixedSize(36, 36)
@@ -336,6 +498,15 @@ class MainWindow(QMainWindow):
         del_btn.clicked.connect(self._delete_profile)
         p_row.addWidget(del_btn)
 
+        # launch several profiles
+        multi_btn = QPushButton("▶▶")
+        multi_btn.setFixedSize(36, 36)
+        multi_btn.setCursor(Qt.PointingHandCursor)
+        multi_btn.setToolTip("Launch several profiles side by side")
+        multi_btn.setStyleSheet(edit_btn.styleSheet())
+        multi_btn.clicked.connect(self._launch_several)
+        p_row.addWidget(multi_btn)
+
         p_layout.addLayout(p_row)
         controls_layout.addWidget(p_widget, 0, Qt.AlignVCenter)
 
@@ -391,6 +562,15 @@ class MainWindow(QMainWindow):
         self.mods_button.clicked.connect(self.open_mod_manager)
         controls_layout.addWidget(self.mods_button, 0, Qt.AlignVCenter)
 
+        # Running instances — shown once a game has been launched
+        self.consoles_button = QPushButton()
+        self.consoles_button.setFixedHeight(44)
+        self.consoles_button.setCursor(Qt.PointingHandCursor)
+        self.consoles_button.setStyleSheet(self.mods_button.styleSheet())
+        self.consoles_button.clicked.connect(self._show_launch_manager)
+        self.consoles_button.setVisible(False)
+        controls_layout.addWidget(self.consoles_button, 0, Qt.AlignVCenter)
+
         # Play
         self.play_button = QPushButton("▶   P L A Y")
         self.play_button.setFixedSize(200, 50)
@@ -440,48 +620,61 @@ class MainWindow(QMainWindow):
         """)
         main_layout.addWidget(self.progress_bar)
 
-        self.load_settings()
+        # ─── Speculative prefetch once the selection settles ───
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(PREFETCH_DELAY_MS)
+        self.prefetch_timer.timeout.connect(self._prefetch_selection)
+        self.version_combo.currentIndexChanged.connect(self.prefetch_timer.start)
+        self.modloader_combo.currentIndexChanged.connect(self.prefetch_timer.start)
+
+        # Usable once the backend is up — see _finish_startup
+        self.controls_panel.setEnabled(False)
+
+    def _finish_startup(self):
+        """Work the first frame doesn't need: backend (and its imports), profiles, versions, settings."""
+        with span("import backend"):
+            from .backend import LauncherBackend
+            from .profile_manager import ProfileManager
+        with span("LauncherBackend()"):
+            self.backend = LauncherBackend(self.minecraft_dir)
+        with span("ProfileManager()"):
+            self.profile_manager = ProfileManager(self.app_dir)
+        # Needs every combo to exist — the cached list is applied synchronously
+        with span("populate_versions"):
+            self.populate_versions()
+        with span("load_settings"):
+            self.load_settings()
+        self.controls_panel.setEnabled(True)
+        self.startup_finished.emit()
 
     # ─── Background ───
     def setup_background(self):
-        import requests
+        """Decode the background image off the UI thread; the window paints plain until it arrives."""
         bg_path = os.path.join(self.assets_dir, 'background.jpeg')
+        self.background_loader = BackgroundLoaderThread(bg_path, self.size(), self)
+        self.background_loader.loaded_signal.connect(self._on_background_loaded)
+        self.background_loader.finished.connect(self.background_loader.deleteLater)
+        self.background_loader.start()
 
-        if not os.path.exists(bg_path):
-             try:
-                 url = "https://images.wallpapersden.com/image/download/minecraft-shaders-hd-nature_bGdtaWyUmZqaraWkpJRmbmdlrWZlbWU.jpg"
-                 r = requests.get(url, stream=True)
-                 if r.status_code == 200:
-                     if not os.path.exists(self.assets_dir):
-                         os.makedirs(self.assets_dir)
-                     with open(bg_path, 'wb') as f:
-                         for chunk in r.iter_content(1024):
-                             f.write(chunk)
-             except Exception as e:
-                 print(f"Failed to download background: {e}")
-
-        if os.path.exists(bg_path):
-            self.background_pixmap = QPixmap(bg_path)
-        else:
-            self.background_pixmap = None
+    def _on_background_loaded(self, image):
+        self.background_pixmap = QPixmap.fromImage(image)
+        mark("background shown")
+        self.update()
 
     def paintEvent(self, event):
+        if not self._first_frame:
+            self._first_frame = True
+            mark("first frame")
+            QTimer.singleShot(0, self._finish_startup)
         painter = QPainter(self)
-        if hasattr(self, 'background_pixmap') and self.background_pixmap:
+        if self.background_pixmap:
             cw = self.width()
             ch = self.height()
-            iw = self.background_pixmap.width()
-            ih = self.background_pixmap.height()
-            if iw == 0 or ih == 0: return
-
-            scale = max(cw / iw, ch / ih)
-            new_w = int(iw * scale)
-            new_h = int(ih * scale)
-            x = (cw - new_w) // 2
-            y = (ch - new_h) // 2
-
-            scaled = self.background_pixmap.scaled(new_w, new_h, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-            painter.drawPixmap(x, y, scaled)
+            # Already scaled to cover the (fixed-size) window by BackgroundLoaderThread
+            x = (cw - self.background_pixmap.width()) // 2
+            y = (ch - self.background_pixmap.height()) // 2
+            painter.drawPixmap(x, y, self.background_pixmap)
 
             # Vignette / darken overlay
             painter.fillRect(0, 0, cw, ch, QColor(0, 0, 0, 80))
@@ -496,19 +689,48 @@ class MainWindow(QMainWindow):
 
     # ─── Versions ───
     def populate_versions(self):
+        # Fill the combo from the on-disk manifest right away, then revalidate
+        cached = self.backend.get_cached_vanilla_versions() or self.backend.get_installed_vanilla_versions()
+        if cached:
+            self.on_versions_loaded(cached)
+
         self.version_loader = VersionFetcherThread(self.backend)
         self.version_loader.versions_signal.connect(self.on_versions_loaded)
         self.version_loader.start()
 
     def on_versions_loaded(self, versions):
-        self.available_versions = versions[:50] if versions else []
+        versions = versions[:50] if versions else []
+        if not versions:
+            if not self.available_versions:
+                self.version_combo.clear()
+                self.version_combo.addItem("No versions found (Network Error?)")
+            return
+        if versions == self.available_versions:
+            return
+
+        first_fill = not self.available_versions
+        current = self.version_combo.currentText()
+        self.available_versions = versions
+        self.version_combo.blockSignals(True)
         self.version_combo.clear()
-        if versions:
-             self.version_combo.addItems(self.available_versions)
-             self._refresh_profiles()
-             self.load_settings()
+        self.version_combo.addItems(self.available_versions)
+        self.version_combo.blockSignals(False)
+
+        if first_fill:
+            self._refresh_profiles()
+            self.load_settings()
         else:
-             self.version_combo.addItem("No versions found (Network Error?)")
+            # Revalidation brought a different list — keep whatever the user had selected
+            idx = self.version_combo.findText(current)
+            if idx >= 0:
+                self.version_combo.setCurrentIndex(idx)
+
+    def _prefetch_selection(self):
+        """Install the settled selection in the background so Play has less to do."""
+        version = self.version_combo.currentText()
+        if self.launch_worker is not None or version not in self.available_versions:
+            return
+        self.backend.prefetcher.request(version, self.modloader_combo.currentText())
 
     # ─── Profiles ───
     def _refresh_profiles(self):
@@ -555,7 +777,8 @@ class MainWindow(QMainWindow):
         from .profile_ui import ProfileEditorPanel
         panel = ProfileEditorPanel(self, versions=self.available_versions)
         def on_saved(data):
-            p = self.profile_manager.create_profile(data["name"], data["version"], data["loader"], data["color"])
+            p = self.profile_manager.create_profile(data["name"], data["version"], data["loader"], data["color"],
+                                                    appcds=data["appcds"])
             self.profile_manager.set_active_profile(p["id"])
             self._refresh_profiles()
         panel.saved.connect(on_saved)
@@ -567,13 +790,53 @@ class MainWindow(QMainWindow):
         profile = self.profile_manager.get_active_profile()
         if not profile:
             return
-        panel = ProfileEditorPanel(self, profile=profile, versions=self.available_versions)
+        instance_dirs = self.profile_manager.instance_dirs()
+        categories = self.profile_manager.INSTANCE_DIRS
+        panel = ProfileEditorPanel(self, profile=profile, versions=self.available_versions,
+                                   usage_job=lambda: self.backend.disk_usage.report(instance_dirs, categories))
         def on_saved(data):
             self.profile_manager.update_profile(profile["id"], **data)
             self._refresh_profiles()
         panel.saved.connect(on_saved)
         self._show_panel(panel)
 
+    def _duplicate_profile(self):
+        """Duplicate the current profile in the background, logs left out unless asked for."""
+        profile = self.profile_manager.get_active_profile()
+        if not profile or self.launch_worker is not None:
+            return
+        box = QMessageBox(QMessageBox.Question, "Duplicate Profile",
+                          f"Duplicate \"{profile['name']}\" with its mods, configs, saves and packs?",
+                          QMessageBox.Yes | QMessageBox.No, self)
+        include_logs = QCheckBox("Include logs")
+        box.setCheckBox(include_logs)
+        if box.exec_() != QMessageBox.Yes:
+            return
+
+        from .profile_manager import DUPLICATE_EXCLUDE
+        exclude = () if include_logs.isChecked() else DUPLICATE_EXCLUDE
+        worker = ProfileDuplicateThread(self.profile_manager, profile["id"], exclude, parent=self)
+        worker.finished.connect(worker.deleteLater)
+        worker.progress_signal.connect(self._on_launch_progress)
+        worker.finished_signal.connect(self._on_duplicate_finished)
+        worker.error_signal.connect(self._on_duplicate_error)
+        self.controls_panel.setEnabled(False)
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setValue(0)
+        worker.start()
+
+    def _on_duplicate_finished(self, profile):
+        self.controls_panel.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.profile_manager.set_active_profile(profile["id"])
+        self._refresh_profiles()
+
+    def _on_duplicate_error(self, message):
+        self.controls_panel.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self._refresh_profiles()
+        QMessageBox.warning(self, "Duplicate Failed", message)
+
     def _delete_profile(self):
         """Delete the current profile after confirmation."""
         profile = self.profile_manager.get_active_profile()
@@ -611,16 +874,25 @@ class MainWindow(QMainWindow):
         loader = self.modloader_combo.currentText()
         profile = self.profile_manager.get_active_profile()
         mods_dir = self.profile_manager.get_mods_dir(profile["id"]) if profile else self.minecraft_dir
-        panel = ModManagerPanel(mods_dir, self, current_version=version, current_loader=loader)
+        panel = ModManagerPanel(mods_dir, self, current_version=version, current_loader=loader,
+                                search_cache=self.backend.search_cache, thumbnail_cache=self.backend.thumbnails)
         self._show_panel(panel)
 
     def open_settings(self):
         from .settings_ui import SettingsPanel
-        panel = SettingsPanel(self)
+        panel = SettingsPanel(self, jvm_tuner=self.backend.jvm_tuner)
         self._show_panel(panel)
 
     # ─── Launch ───
     def launch_game(self):
+        # While a launch is being prepared the Play button doubles as Cancel
+        if self.launch_worker is not None:
+            self.launch_queue.clear()
+            self.launch_worker.cancel()
+            self.play_button.setEnabled(False)
+            self.play_button.setText("CANCELLING...")
+            return
+
         username = self.username_input.text()
         if not username:
             self.username_input.setPlaceholderText("⚠ Enter a username!")
@@ -629,96 +901,231 @@ class MainWindow(QMainWindow):
         version = self.version_combo.currentText()
         modloader = self.modloader_combo.currentText()
 
-        self.play_button.setEnabled(False)
+        self.save_settings()
+        # Save profile version/loader
+        profile = self.profile_manager.get_active_profile()
+        if profile:
+            self.profile_manager.update_profile(profile["id"], version=version, loader=modloader)
+        self._queue_launch(profile, version, modloader, username)
+
+    def _launch_several(self):
+        """Pick profiles to start side by side; each is prepared in turn and gets its own console tab."""
+        username = self.username_input.text()
+        if not username:
+            self.username_input.setPlaceholderText("⚠ Enter a username!")
+            return
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Launch Profiles")
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel("Profiles to launch side by side:"))
+        profile_list = QListWidget()
+        for profile in self.profile_manager.get_profiles():
+            item = QListWidgetItem(f"{profile['name']}  ({profile['version']}, {profile['loader']})")
+            item.setData(Qt.UserRole, profile["id"])
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Unchecked)
+            profile_list.addItem(item)
+        layout.addWidget(profile_list)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+
+        self.save_settings()
+        for i in range(profile_list.count()):
+            item = profile_list.item(i)
+            if item.checkState() == Qt.Checked:
+                profile = self.profile_manager.get_profile(item.data(Qt.UserRole))
+                self._queue_launch(profile, profile["version"], profile["loader"], username)
+
+    def _queue_launch(self, profile, version, modloader, username):
+        self.launch_queue.append({
+            "profile": profile, "version": version, "loader": modloader, "username": username,
+            # Use profile-specific game directory
+            "game_dir": self.profile_manager.get_game_dir(profile["id"]) if profile else None,
+        })
+        self._start_next_launch()
+
+    def _start_next_launch(self):
+        """Prepare the next queued launch unless one is being prepared already."""
+        if self.launch_worker is not None or not self.launch_queue:
+            return
+        job = self.launch_queue.pop(0)
+        profile = job["profile"]
+
         self.mods_button.setEnabled(False)
+        self.play_button.setText("■   C A N C E L")
         self.progress_bar.setVisible(True)
         self.progress_bar.setValue(0)
 
-        try:
-             def update_progress(text, value):
-                 self.progress_bar.setFormat(text)
-                 self.progress_bar.setValue(int(value) if value else 0)
-                 QApplication.processEvents()
-
-             self.save_settings()
-             # Save profile version/loader
-             profile = self.profile_manager.get_active_profile()
-             if profile:
-                 self.profile_manager.update_profile(profile["id"], version=version, loader=modloader)
-
-             # Get the launch command from backend (no longer runs subprocess directly)
-             # Use profile-specific game directory
-             game_dir = None
-             if profile:
-                 game_dir = self.profile_manager.get_game_dir(profile["id"])
-             minecraft_command = self.backend.launch_game(version, modloader, username, progress_callback=update_progress, game_dir=game_dir)
-
-             self.progress_bar.setVisible(False)
-             self.play_button.setEnabled(True)
-             self.mods_button.setEnabled(True)
-
-             # Open embedded console panel
-             if minecraft_command:
-                 from .console_ui import ConsolePanel
-                 console = ConsolePanel(minecraft_command, self)
-                 self._show_panel(console)
-
-        except Exception as e:
-             QMessageBox.critical(self, "Launch Error", str(e))
-             self.progress_bar.setVisible(False)
-             self.play_button.setEnabled(True)
-             self.mods_button.setEnabled(True)
+        appcds = bool(profile and profile.get("appcds"))
+        self.launch_worker = LaunchWorkerThread(self.backend, job["version"], job["loader"], job["username"],
+                                                job["game_dir"], appcds,
+                                                profile_id=profile["id"] if profile else None,
+                                                title=f"{profile['name']} — {job['version']} {job['loader']}" if profile else None,
+                                                parent=self)
+        self.launch_worker.finished.connect(self.launch_worker.deleteLater)
+        self.launch_worker.progress_signal.connect(self._on_launch_progress)
+        self.launch_worker.stage_signal.connect(self._on_launch_stage)
+        self.launch_worker.finished_signal.connect(self._on_launch_ready)
+        self.launch_worker.error_signal.connect(self._on_launch_error)
+        self.launch_worker.cancelled_signal.connect(self._on_launch_cancelled)
+        self.launch_worker.start()
+
+    def _on_launch_progress(self, text, value):
+        self.progress_bar.setFormat(text)
+        self.progress_bar.setValue(value)
+
+    def _on_launch_stage(self, stage, state, seconds):
+        if state == "started":
+            self.progress_bar.setFormat(STAGE_LABELS.get(stage, stage) + "...")
+            self.progress_bar.setValue(0)
+
+    def _reset_launch_ui(self):
+        self.launch_worker = None
+        self.progress_bar.setVisible(False)
+        self.play_button.setText("▶   P L A Y")
+        self.play_button.setEnabled(True)
+        self.mods_button.setEnabled(True)
+
+    def _on_launch_ready(self, minecraft_command, timing):
+        worker = self.launch_worker
+        self._reset_launch_ui()
+        # Open a console tab; the game starts once the RAM budget allows
+        if minecraft_command:
+            def setup(console):
+                if worker.appcds and worker.game_dir:
+                    self._track_appcds(console, worker.game_dir)
+                if timing:
+                    self._track_launch_timing(console, worker.profile_id or "default", timing)
+
+            self._launch_manager().add_launch(minecraft_command, worker.title,
+                                              self.backend.settings["max_memory"], setup)
+            self._show_launch_manager()
+        self._start_next_launch()
+
+    def _launch_manager(self):
+        if self.launch_manager is None:
+            from .launch_manager_ui import LaunchManagerPanel
+            self.launch_manager = LaunchManagerPanel(self.backend.settings["ram_budget_percent"], self)
+            self.launch_manager.closed.connect(lambda: self.stack.setCurrentWidget(self.main_page))
+            self.launch_manager.activity_changed.connect(self._on_launch_activity)
+            self.backend.settings.subscribe(
+                lambda key, value: self.launch_manager.set_budget_percent(value) if key == "ram_budget_percent" else None
+            )
+            self.stack.addWidget(self.launch_manager)
+        return self.launch_manager
+
+    def _show_launch_manager(self):
+        if self.launch_manager is not None:
+            self.stack.setCurrentWidget(self.launch_manager)
+
+    def _on_launch_activity(self, running, waiting):
+        text = f"RUNNING {running}" + (f" +{waiting} WAITING" if waiting else "") if running or waiting else "CONSOLES"
+        self.consoles_button.setText(f"  {text}  ")
+        self.consoles_button.setVisible(True)
+
+    def _track_launch_timing(self, console, profile_key, timing):
+        """Collect the spawn / first output / title screen spans of a launch into the profile's history."""
+        game_spans = {}
+        recorded = []
+
+        def record():
+            if recorded:
+                return
+            recorded.append(True)
+            regression = self.backend.record_launch_timing(profile_key, timing, game_spans)
+            if regression:
+                console.append_system(f"[QLauncher] {regression}")
+
+        def span_recorder(name, finishes=False):
+            def on_span(seconds):
+                game_spans[name] = seconds
+                if finishes:
+                    record()
+            return on_span
+
+        def on_finished(exit_code):
+            # No title screen (crash, or a version that doesn't log the marker) — keep what was measured
+            if game_spans:
+                record()
+
+        console.runner.spawned_signal.connect(span_recorder("spawn"))
+        console.first_output_signal.connect(span_recorder("first_output"))
+        console.startup_signal.connect(span_recorder("game_ready", finishes=True))
+        console.runner.finished_signal.connect(on_finished)
+        console.set_timing_report(lambda: self.backend.launch_history.report(profile_key))
+
+    def _track_appcds(self, console, game_dir):
+        """Report startup time for an AppCDS profile and build its archive after a recording run."""
+        def on_startup(seconds):
+            report = self.backend.appcds_record_startup(game_dir, seconds)
+            if report:
+                console.append_system(f"[QLauncher] Startup: {report}")
+
+        def on_finished(exit_code):
+            threading.Thread(
+                target=self.backend.appcds_session_ended,
+                args=(game_dir, console.command, exit_code), daemon=True,
+            ).start()
+
+        console.startup_signal.connect(on_startup)
+        console.runner.finished_signal.connect(on_finished)
+
+    def _on_launch_error(self, message):
+        self._reset_launch_ui()
+        QMessageBox.critical(self, "Launch Error", message)
+        self._start_next_launch()
+
+    def _on_launch_cancelled(self):
+        print("[Launch] Cancelled")
+        self.launch_queue.clear()
+        self._reset_launch_ui()
 
     # ─── Settings Persistence ───
     def load_settings(self):
-        try:
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    settings = json.load(f)
-
-                username = settings.get("username", "")
-                if username:
-                    self.username_input.setText(username)
-
-                version = settings.get("version", "")
-                if version:
-                    index = self.version_combo.findText(version)
-                    if index >= 0:
-                        self.version_combo.setCurrentIndex(index)
-
-                loader = settings.get("loader", "")
-                if loader:
-                    index = self.modloader_combo.findText(loader)
-                    if index >= 0:
-                        self.modloader_combo.setCurrentIndex(index)
-
-        except Exception as e:
-            print(f"Failed to load settings: {e}")
+        settings = self.backend.settings
+        username = settings["username"]
+        if username:
+            self.username_input.setText(username)
+
+        version = settings["version"]
+        if version:
+            index = self.version_combo.findText(version)
+            if index >= 0:
+                self.version_combo.setCurrentIndex(index)
+
+        loader = settings["loader"]
+        if loader:
+            index = self.modloader_combo.findText(loader)
+            if index >= 0:
+                self.modloader_combo.setCurrentIndex(index)
 
     def save_settings(self):
-        """Save all settings — merges existing settings.json with current UI state."""
-        try:
-            settings = {}
-            if os.path.exists("settings.json"):
-                with open("settings.json", "r") as f:
-                    settings = json.load(f)
-
-            # Main window values
-            settings["username"] = self.username_input.text()
-            settings["version"] = self.version_combo.currentText()
-            settings["loader"] = self.modloader_combo.currentText()
-
-            # Active profile
-            profile = self.profile_manager.get_active_profile()
-            if profile:
-                settings["active_profile"] = profile["id"]
-
-            with open("settings.json", "w") as f:
-                json.dump(settings, f, indent=4)
-        except Exception as e:
-            print(f"Failed to save settings: {e}")
+        """Store the main window's selection in the settings service (written out shortly after)."""
+        profile = self.profile_manager.get_active_profile()
+        self.backend.settings.update(
+            username=self.username_input.text(),
+            version=self.version_combo.currentText(),
+            loader=self.modloader_combo.currentText(),
+            active_profile=profile["id"] if profile else "",
+        )
 
     def closeEvent(self, event):
+        self.launch_queue.clear()
+        if self.launch_worker is not None:
+            self.launch_worker.cancel()
+            self.launch_worker.wait()
+        if self.backend is None:
+            # Closed before startup finished — nothing loaded, nothing to save
+            event.accept()
+            return
+        self.backend.prefetcher.stop()
         self.save_settings()
+        self.backend.settings.flush()
+        if self.profile_manager is not None:
+            self.profile_manager.flush()
         event.accept()
 
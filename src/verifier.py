@@ -0,0 +1,149 @@
+"""
+Integrity verification of installed versions.
+
+Every library, native, client jar and asset object is checked against the
+SHA1 recorded in the version JSON / asset index. Hashing is spread over a
+process pool, and a (path, size, mtime) → SHA1 memo makes re-verifying an
+untouched install almost free. Files that fail are repaired through the
+install engine's download path.
+"""
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+
+POOL_THRESHOLD = 32  # below this many files, hashing inline beats starting a pool
+HASH_CHUNK = 1024 * 1024
+
+
+def hash_file(path):
+    """Return the SHA1 of a file (module level so worker processes can pickle it)."""
+    digest = hashlib.sha1()
+    try:
+        with open(path, "rb") as f:
+            for block in iter(lambda: f.read(HASH_CHUNK), b""):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class HashMemo:
+    """Persistent (path, size, mtime) → SHA1 memo."""
+
+    def __init__(self, memo_file):
+        self.memo_file = memo_file
+        self.entries = {}
+        self._load()
+
+    def _load(self):
+        """Load the memo from disk."""
+        try:
+            if os.path.exists(self.memo_file):
+                with open(self.memo_file, "r") as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            print(f"[Verifier] Error loading hash memo: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Save the memo to disk."""
+        try:
+            tmp = self.memo_file + ".tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.entries, f)
+            os.replace(tmp, self.memo_file)
+        except Exception as e:
+            print(f"[Verifier] Error saving hash memo: {e}")
+
+    def get(self, path, st):
+        entry = self.entries.get(path)
+        if entry and entry[0] == st.st_size and entry[1] == st.st_mtime_ns:
+            return entry[2]
+        return None
+
+    def put(self, path, st, sha1):
+        self.entries[path] = [st.st_size, st.st_mtime_ns, sha1]
+
+
+class Verifier:
+    """Checks a version's files against their expected SHA1s and repairs the failures."""
+
+    def __init__(self, engine, memo, max_workers=None):
+        self.engine = engine
+        self.memo = memo
+        self.max_workers = max_workers
+
+    def _hash_all(self, paths, callback, offset, total):
+        """Hash paths (in a process pool when worthwhile), reporting progress from this thread."""
+        if len(paths) < POOL_THRESHOLD:
+            yield from map(hash_file, paths)
+            return
+        chunksize = max(1, len(paths) // 64)
+        with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+            for i, sha1 in enumerate(pool.map(hash_file, paths, chunksize=chunksize)):
+                if callback and i % 64 == 0:
+                    callback(f"Verifying {offset + i}/{total} files...", (offset + i) * 100 // total)
+                yield sha1
+
+    def verify(self, version_id, repair=False, progress_callback=None):
+        """Verify an installed version. Returns {checked, hashed, memo_hits, failed, repaired, seconds}."""
+        start = time.perf_counter()
+        callback = progress_callback or (lambda text, value: None)
+        callback(f"Resolving {version_id}...", 0)
+        version_data, plan = self.engine.resolve(version_id)
+
+        failed = []
+        to_hash = []
+        memo_hits = 0
+        checked = [t for t in plan if t["sha1"]]
+        for task in checked:
+            try:
+                st = os.stat(task["path"])
+            except FileNotFoundError:
+                failed.append(task)
+                continue
+            if task["size"] and st.st_size != task["size"]:
+                failed.append(task)
+                continue
+            known = self.memo.get(task["path"], st)
+            if known is not None:
+                memo_hits += 1
+                if known != task["sha1"]:
+                    failed.append(task)
+            else:
+                to_hash.append((task, st))
+
+        offset = len(checked) - len(to_hash)
+        hashes = self._hash_all([t["path"] for t, _ in to_hash], progress_callback, offset, len(checked))
+        for (task, st), sha1 in zip(to_hash, hashes):
+            if sha1 is None:
+                failed.append(task)
+                continue
+            self.memo.put(task["path"], st, sha1)
+            if sha1 != task["sha1"]:
+                failed.append(task)
+        self.memo.save()
+
+        repaired = 0
+        if failed:
+            print(f"[Verifier] {version_id}: {len(failed)} file(s) missing or corrupted")
+            for task in failed[:10]:
+                print(f"[Verifier]   {task['path']}")
+            if repair:
+                self.engine.repair(version_data, plan, failed, progress_callback)
+                repaired = len(failed)
+
+        report = {
+            "checked": len(checked),
+            "hashed": len(to_hash),
+            "memo_hits": memo_hits,
+            "failed": [t["path"] for t in failed],
+            "repaired": repaired,
+            "seconds": time.perf_counter() - start,
+        }
+        callback(f"Verified {version_id}: {len(failed)} problem(s)", 100)
+        print(f"[Verifier] {version_id}: checked {report['checked']} files "
+              f"({report['hashed']} hashed, {memo_hits} memoized) in {report['seconds']:.2f}s")
+        return report
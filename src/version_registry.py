@@ -0,0 +1,257 @@
+"""
+Persistent registry of installed versions.
+
+Keeps id, inheritsFrom, loader type, loader version and mtime for every
+version JSON under ``versions/`` so the launch path can answer "is X
+installed" and "which loader builds exist for Y" without rescanning and
+re-parsing the whole folder. Lookups are dictionary reads. The folder is
+scanned once, on the first lookup of a session: it is listed, each
+``<id>/<id>.json`` is stat'ed, and only JSON files whose mtime changed (or
+that appeared) are parsed again. After that the launcher tells the
+registry what it installed or removed through invalidate(), which
+re-reads just those versions.
+"""
+import os
+import re
+import json
+import threading
+
+REGISTRY_FORMAT = 2  # bump when detect_loader changes so stale entries are re-parsed
+
+# group:artifact of the library that identifies each modloader
+LOADER_LIBRARIES = {
+    "net.fabricmc:fabric-loader": "fabric",
+    "org.quiltmc:quilt-loader": "quilt",
+    "net.minecraftforge:forge": "forge",
+    "net.minecraftforge:minecraftforge": "forge",
+    "net.minecraftforge:fmlloader": "forge",
+    "net.minecraftforge:fmlcore": "forge",
+    "net.neoforged:neoforge": "neoforge",
+    "net.neoforged:forge": "neoforge",
+}
+
+# Loader combo entry → registry loader name
+LOADER_NAMES = {
+    "Fabric": "fabric",
+    "Quilt": "quilt",
+    "Forge": "forge",
+}
+
+
+def detect_loader(version_data):
+    """Return (loader, loader_version) for a version JSON — ("vanilla", None) for plain versions."""
+    parent = version_data.get("inheritsFrom")
+    for lib in version_data.get("libraries", []):
+        parts = lib.get("name", "").split(":")
+        if len(parts) < 3:
+            continue
+        loader = LOADER_LIBRARIES.get(f"{parts[0]}:{parts[1]}")
+        if loader:
+            loader_version = parts[2]
+            # Forge coordinates carry the game version: 1.20.1-47.2.0, 1.7.10-10.13.4.1614-1.7.10
+            if parent and loader_version.startswith(parent + "-"):
+                loader_version = loader_version[len(parent) + 1:]
+            if parent and loader_version.endswith("-" + parent):
+                loader_version = loader_version[:-len(parent) - 1]
+            return loader, loader_version
+    if parent:
+        return "unknown", None
+    return "vanilla", None
+
+
+def build_key(loader_version):
+    """Sort key for loader versions: 0.16.10 after 0.16.9, and 0.16.9 after 0.16.9-beta.2."""
+    release, _, suffix = (loader_version or "").partition("-")
+    numbers = lambda text: [int(p) if p.isdigit() else -1 for p in re.split(r"[.+]", text) if p]
+    return numbers(release), 0 if suffix else 1, numbers(suffix)
+
+
+class VersionRegistry:
+    """Indexed, mtime-invalidated view of ``<minecraft_directory>/versions``."""
+
+    def __init__(self, minecraft_directory):
+        self.minecraft_directory = minecraft_directory
+        self.versions_dir = os.path.join(minecraft_directory, "versions")
+        self.registry_file = os.path.join(minecraft_directory, "qlauncher_versions.json")
+        self.entries = {}
+        self._scan_pending = True       # sync with the folder on the first lookup
+        self._dirty = set()             # version ids to re-read on the next lookup
+        self._by_loader = {}
+        self._lock = threading.RLock()  # launches and background prefetches share the registry
+        self._load()
+
+    def _load(self):
+        """Load the registry from disk."""
+        try:
+            if os.path.exists(self.registry_file):
+                with open(self.registry_file, "r") as f:
+                    data = json.load(f)
+                if data.get("format") == REGISTRY_FORMAT:
+                    self.entries = data.get("versions", {})
+        except Exception as e:
+            print(f"[VersionRegistry] Error loading registry: {e}")
+            self.entries = {}
+        self._rebuild_index()
+
+    def _save(self):
+        """Save the registry to disk."""
+        try:
+            data = {"format": REGISTRY_FORMAT, "versions": self.entries}
+            with open(self.registry_file, "w") as f:
+                json.dump(data, f)
+        except Exception as e:
+            print(f"[VersionRegistry] Error saving registry: {e}")
+
+    def _rebuild_index(self):
+        """Group loader builds by (loader, vanilla id), newest build first."""
+        groups = {}
+        for entry in self.entries.values():
+            key = (entry["loader"], entry.get("inheritsFrom"))
+            groups.setdefault(key, []).append(entry)
+        self._by_loader = {
+            key: [e["id"] for e in sorted(group, key=lambda e: (build_key(e["loader_version"]), e["mtime"]),
+                                          reverse=True)]
+            for key, group in groups.items()
+        }
+
+    def _read_entry(self, version_id, json_path, mtime):
+        with open(json_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        loader, loader_version = detect_loader(data)
+        return {
+            "id": version_id,
+            "inheritsFrom": data.get("inheritsFrom"),
+            "type": data.get("type"),
+            "loader": loader,
+            "loader_version": loader_version,
+            "mtime": mtime,
+        }
+
+    def refresh(self, force=False):
+        """Bring the registry up to date with the folder: a listing and one stat per version when
+        nothing changed. force re-parses every version JSON."""
+        with self._lock:
+            self._scan_pending = False
+            self._dirty.clear()
+            self._refresh(force)
+
+    def _sync(self):
+        """Apply pending invalidations before a lookup. Nothing to do (and no disk access) when there are none."""
+        with self._lock:
+            if self._scan_pending:
+                self.refresh()
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                self._refresh_ids(dirty)
+
+    def _refresh(self, force):
+        # The mtime of versions/ alone can't be trusted: it doesn't move when a JSON is
+        # created, rewritten or deleted inside a version folder that already exists
+        try:
+            listing = os.scandir(self.versions_dir)
+        except FileNotFoundError:
+            if self.entries:
+                self.entries = {}
+                self._rebuild_index()
+                self._save()
+            return
+
+        entries = {}
+        changed = False
+        with listing:
+            for d in listing:
+                if not d.is_dir():
+                    continue
+                # Profile instance directories share this folder but have no <name>.json
+                json_path = os.path.join(d.path, f"{d.name}.json")
+                try:
+                    json_mtime = os.stat(json_path).st_mtime_ns
+                except FileNotFoundError:
+                    continue
+                cached = self.entries.get(d.name)
+                if cached and not force and cached["mtime"] == json_mtime:
+                    entries[d.name] = cached
+                    continue
+                try:
+                    entries[d.name] = self._read_entry(d.name, json_path, json_mtime)
+                    changed = True
+                except Exception as e:
+                    print(f"[VersionRegistry] Skipping {d.name}: {e}")
+
+        changed = changed or entries.keys() != self.entries.keys()
+        self.entries = entries
+        if changed:
+            self._rebuild_index()
+            self._save()
+
+    def _refresh_ids(self, version_ids):
+        """Re-read the JSON of each version (and of a parent that isn't known yet), dropping removed ones.
+        They are parsed even if the mtime looks unchanged, in case a file was replaced within the
+        filesystem's timestamp granularity."""
+        queue = list(version_ids)
+        seen = set(queue)
+        changed = False
+        while queue:
+            version_id = queue.pop()
+            json_path = os.path.join(self.versions_dir, version_id, f"{version_id}.json")
+            try:
+                entry = self._read_entry(version_id, json_path, os.stat(json_path).st_mtime_ns)
+            except FileNotFoundError:
+                changed = self.entries.pop(version_id, None) is not None or changed
+                continue
+            except Exception as e:
+                print(f"[VersionRegistry] Skipping {version_id}: {e}")
+                changed = self.entries.pop(version_id, None) is not None or changed
+                continue
+            if self.entries.get(version_id) != entry:
+                self.entries[version_id] = entry
+                changed = True
+            # Installing a loader build or an inheriting version also installs its parent
+            parent = entry["inheritsFrom"]
+            if parent and parent not in self.entries and parent not in seen:
+                seen.add(parent)
+                queue.append(parent)
+        if changed:
+            self._rebuild_index()
+            self._save()
+
+    def invalidate(self, version_id=None):
+        """Re-read version_id on the next lookup — call after installing or removing it. Without
+        version_id (a loader install, whose version id isn't known up front) the whole folder is
+        rescanned, parsing only the JSON files whose mtime changed."""
+        with self._lock:
+            if version_id is None:
+                self._scan_pending = True
+            else:
+                self._dirty.add(version_id)
+
+    def ids(self):
+        """Return the ids of all installed versions."""
+        self._sync()
+        return list(self.entries)
+
+    def ids_for_loader(self, loader):
+        """Return the ids of all installed versions of a loader ("vanilla" for plain versions)."""
+        self._sync()
+        return [e["id"] for e in self.entries.values() if e["loader"] == loader]
+
+    def is_installed(self, version_id):
+        """Return True if a version JSON for version_id is installed."""
+        self._sync()
+        return version_id in self.entries
+
+    def get(self, version_id):
+        """Return the registry entry for a version, or None."""
+        self._sync()
+        return self.entries.get(version_id)
+
+    def loader_builds(self, loader, vanilla_id):
+        """Return the installed version ids of a loader (e.g. "fabric") built on vanilla_id, newest first."""
+        self._sync()
+        return list(self._by_loader.get((loader, vanilla_id), []))
+
+    def latest_build(self, loader, vanilla_id):
+        """Return the newest installed build of a loader for exactly vanilla_id, or None."""
+        self._sync()
+        builds = self._by_loader.get((loader, vanilla_id))
+        return builds[0] if builds else None